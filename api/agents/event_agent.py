@@ -3,18 +3,31 @@ Event Agent
 FSF 프로젝트의 agent.py 구조를 재사용하여 이메일/메시지 분석에 적용
 """
 from fastapi import HTTPException
-from typing import Optional
+from typing import Optional, Dict, Any
 import logging
 import os
-import asyncio
+import threading
+import time
 from datetime import datetime
 
 from langchain.agents import initialize_agent, AgentType
-from langchain_openai import ChatOpenAI
+from langchain.agents.mrkl.prompt import PREFIX as REACT_TOOL_PREFIX
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain.tools import Tool
 
-from services.openai_service import OpenAIService
+from services.openai_service import OpenAIService, create_chat_llm
+from services.example_bank import ExampleBank, get_example_bank
+from services.circuit_breaker import get_llm_circuit_breaker, CircuitOpenError
+from services.scheduler import SchedulerQueueFullError, get_scheduler
+from services.agent_executor import (
+    get_agent_pool,
+    AgentQueueFullError,
+    AgentTimeoutError,
+    AgentCancelledError,
+)
 from tools import EventExtractionTool
+from utils.text_preprocessor import preprocess_email
+from utils.date_parser import ParseContext, get_parse_context
 from models.schemas import EventType
 
 logger = logging.getLogger(__name__)
@@ -22,7 +35,40 @@ logger = logging.getLogger(__name__)
 # 전역 변수 (Lazy Loading용)
 _openai_service = None
 _llm = None
-_base_agent = None
+_base_agents: Dict[EventType, Any] = {}
+
+# Agent 반복 상한 (무한 루프/토큰 낭비 방지)
+AGENT_MAX_ITERATIONS = int(os.getenv("AGENT_MAX_ITERATIONS", "5"))
+
+
+class CancellationCallbackHandler(BaseCallbackHandler):
+    """
+    협조적 취소 콜백
+    
+    deadline이 지나 취소 플래그가 설정되면 다음 LLM 호출/도구 실행 직전에
+    예외를 발생시켜 Agent 루프를 중단합니다. (스레드는 강제 종료할 수 없으므로)
+    """
+    
+    raise_error = True
+    
+    def __init__(self, cancel_event: threading.Event):
+        self.cancel_event = cancel_event
+    
+    def _check(self) -> None:
+        if self.cancel_event.is_set():
+            raise AgentCancelledError("deadline 초과로 Agent 실행 중단")
+    
+    def on_llm_start(self, *args: Any, **kwargs: Any) -> None:
+        self._check()
+    
+    def on_chat_model_start(self, *args: Any, **kwargs: Any) -> None:
+        self._check()
+    
+    def on_agent_action(self, *args: Any, **kwargs: Any) -> None:
+        self._check()
+    
+    def on_tool_start(self, *args: Any, **kwargs: Any) -> None:
+        self._check()
 
 
 def _get_openai_service():
@@ -34,29 +80,33 @@ def _get_openai_service():
 
 
 def _get_llm():
-    """LangChain LLM 지연 로딩"""
+    """LangChain LLM 지연 로딩 (LLM_HEDGE_ENABLED면 p95를 넘긴 호출에 두 번째 요청)"""
     global _llm
     if _llm is None:
-        _llm = ChatOpenAI(
-            model=os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"),
-            temperature=0.7
-        )
+        _llm = create_chat_llm()
     return _llm
 
 
-def _get_base_agent():
-    """Agent 지연 로딩"""
-    global _base_agent
-    if _base_agent is None:
+def _get_base_agent(mode: EventType = EventType.WORK):
+    """
+    모드별 Agent 지연 로딩
+
+    시스템 프롬프트를 Agent 프롬프트의 prefix에 고정해 두어
+    매 요청의 앞부분이 바이트 단위로 동일하게 유지되도록 합니다.
+    (사용자 텍스트는 마지막 Question 자리에만 들어감 → provider prefix 캐시 적용)
+    """
+    if mode not in _base_agents:
         base_tools = [EventExtractionTool]
-        _base_agent = initialize_agent(
+        _base_agents[mode] = initialize_agent(
             tools=base_tools,
             llm=_get_llm(),
             agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
             verbose=True,
-            handle_parsing_errors=True
+            handle_parsing_errors=True,
+            max_iterations=AGENT_MAX_ITERATIONS,
+            agent_kwargs={"prefix": _AGENT_PREFIXES[mode]}
         )
-    return _base_agent
+    return _base_agents[mode]
 
 # Agent 시스템 프롬프트 (FSF의 ReAct 프롬프트 구조 참고)
 REACT_AGENT_SYSTEM_PROMPT = """당신은 이메일/메시지 분석 전문 AI 어시스턴트입니다.
@@ -82,6 +132,25 @@ JSON 형식으로 다음 정보를 추출하세요:
 
 한국어로 친절하고 정확하게 답변하세요."""
 
+# 모드별 추가 프롬프트 (Prompt Switching)
+MODE_PROMPTS = {
+    EventType.RECRUIT: "\n\n**모드: 채용 (Recruit)**\n지원자 이름과 면접 날짜/시간을 추출하세요.",
+    EventType.ORDER: "\n\n**모드: 예약/주문 (Order)**\n고객 이름과 예약/픽업 날짜/시간을 추출하세요.",
+    EventType.WORK: "\n\n**모드: 업무 (Work)**\n클라이언트 이름과 미팅/작업 마감일 날짜/시간을 추출하세요.",
+}
+
+# 모드별 시스템 프롬프트 (모듈 로딩 시 1회만 구성)
+_MODE_SYSTEM_PROMPTS = {
+    mode: REACT_AGENT_SYSTEM_PROMPT + suffix
+    for mode, suffix in MODE_PROMPTS.items()
+}
+
+# Agent 프롬프트 prefix (PromptTemplate 변수로 해석되지 않도록 중괄호 이스케이프)
+_AGENT_PREFIXES = {
+    mode: (prompt + "\n\n" + REACT_TOOL_PREFIX).replace("{", "{{").replace("}", "}}")
+    for mode, prompt in _MODE_SYSTEM_PROMPTS.items()
+}
+
 
 class EventAgent:
     """이벤트 추출 Agent (FSF 구조 재사용)"""
@@ -110,18 +179,29 @@ class EventAgent:
         Returns:
             모드별 추가 프롬프트 문자열
         """
-        mode_prompts = {
-            EventType.RECRUIT: "\n\n**모드: 채용 (Recruit)**\n지원자 이름과 면접 날짜/시간을 추출하세요.",
-            EventType.ORDER: "\n\n**모드: 예약/주문 (Order)**\n고객 이름과 예약/픽업 날짜/시간을 추출하세요.",
-            EventType.WORK: "\n\n**모드: 업무 (Work)**\n클라이언트 이름과 미팅/작업 마감일 날짜/시간을 추출하세요.",
-        }
-        return mode_prompts.get(mode, mode_prompts[EventType.WORK])
+        return MODE_PROMPTS.get(mode, MODE_PROMPTS[EventType.WORK])
+    
+    def get_system_prompt(self, mode: EventType) -> str:
+        """
+        모드별 전체 시스템 프롬프트 반환 (미리 구성된 문자열 재사용)
+        
+        Args:
+            mode: 이벤트 타입
+        
+        Returns:
+            시스템 프롬프트 문자열
+        """
+        return _MODE_SYSTEM_PROMPTS.get(mode, _MODE_SYSTEM_PROMPTS[EventType.WORK])
     
     async def analyze(
         self,
         text: str,
         mode: EventType,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        context: Optional[ParseContext] = None,
+        lane: str = "interactive",
+        urgency: float = 0.0
     ) -> str:
         """
         이메일/메시지 분석 및 이벤트 정보 추출 (FSF Agent 구조 재사용)
@@ -130,33 +210,98 @@ class EventAgent:
             text: 분석할 텍스트 (이메일/메시지 본문)
             mode: 이벤트 타입 (recruit/order/work)
             user_id: 사용자 ID (선택적)
+            timeout: 요청 deadline (초, 없으면 AGENT_TIMEOUT_SECONDS - 예시 검색 시간도 포함)
+            context: 상대 날짜 해석 기준 (발신 시각 + 타임존, 없으면 DEFAULT_TIMEZONE의 현재 시각)
+            lane: 스케줄러 레인 (interactive/webhook/bulk)
+            urgency: 긴급도 (같은 레인 안에서 높을수록 먼저 실행)
         
         Returns:
             추출된 정보 (JSON 형식 문자열)
+        
+        Raises:
+            CircuitOpenError: LLM circuit이 열려 있음 (호출 측에서 규칙 기반 추출로 대체)
         """
+        breaker = get_llm_circuit_breaker()
+        pool = get_agent_pool()
+        deadline = time.monotonic() + (timeout or pool.default_timeout)
+        # 결과가 성공/실패로 기록되지 않으면 finally에서 half-open 시험 슬롯 반환
+        settled = False
         try:
             logger.info(f"🤖 Agent 분석 시작: {mode.value} - {text[:50]}...")
+            breaker.before_call()
             
-            # 모드별 프롬프트 구성
-            system_prompt = REACT_AGENT_SYSTEM_PROMPT + self._get_mode_prompt(mode)
-            
-            # 사용자 메시지 구성
-            user_message = f"다음 텍스트에서 정보를 추출해주세요:\n\n{text}"
-            final_prompt = system_prompt + "\n\n사용자 요청: " + user_message
+            # 노이즈(HTML, 인용, 서명 등) 제거 후 LLM에 전달
+            preprocessed = preprocess_email(text)
             
-            # Agent 실행 (동기 함수이므로 별도 스레드에서 실행 - FSF 구조 그대로)
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.base_agent.run(final_prompt)
+            # 시스템 프롬프트는 모드별 Agent의 prefix에 고정되어 있으므로
+            # 여기서는 사용자 메시지만 구성 (요청마다 달라지는 부분은 맨 뒤로)
+            mode = mode if mode in _AGENT_PREFIXES else EventType.WORK
+            # 예시 검색(질의 임베딩)도 같은 deadline 안에서만 기다리고, 넘기면 예시 없이 진행
+            shots = await get_example_bank(_get_openai_service()).retrieve(
+                preprocessed.text, mode, timeout=deadline - time.monotonic()
             )
+            # 상대 날짜("내일", "다음 주")를 서버 시계가 아닌 발신 시각 기준으로 풀도록 기준 시각 명시
+            context = context or get_parse_context()
+            user_message = (
+                ExampleBank.format_shots(shots)
+                + f"기준 시각: {context.reference()}\n"
+                + f"다음 텍스트에서 정보를 추출해주세요:\n\n{preprocessed.text}"
+            )
+            agent = _get_base_agent(mode)
+            
+            # Agent 실행은 출처별 레인 + 긴급도 순으로 (대량 요청이 쌓여 있어도 긴급 메시지가 먼저)
+            queued = time.monotonic()
+            async with get_scheduler().slot(lane, urgency):
+                # 슬롯 대기는 deadline에 넣지 않음 (대기열 포화는 스케줄러가 503으로 처리)
+                deadline += time.monotonic() - queued
+                # 동기 함수이므로 전용 풀에서 실행, deadline 초과 시 협조적 취소
+                result = await pool.submit(
+                    lambda cancel_event: agent.run(
+                        user_message,
+                        callbacks=[CancellationCallbackHandler(cancel_event)]
+                    ),
+                    timeout=max(deadline - time.monotonic(), 0.001)
+                )
+            
+            breaker.record_success()
+            settled = True
             
-            logger.info(f"✅ Agent 분석 완료: {mode.value}")
+            logger.info(f"✅ Agent 분석 완료: {mode.value} (전처리 제거 {preprocessed.tokens_removed} tokens, 예시 {len(shots)}개)")
             return result
             
+        except CircuitOpenError:
+            settled = True
+            raise
+        except AgentQueueFullError as e:
+            logger.warning(f"⏳ Agent 대기열 포화: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail="분석 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "5"}
+            )
+        except SchedulerQueueFullError as e:
+            logger.warning(f"⏳ 분석 대기열 포화: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail="분석 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "2"}
+            )
+        except AgentTimeoutError as e:
+            breaker.record_failure()
+            settled = True
+            logger.warning(f"⏱️ Agent 시간 초과: {e}")
+            raise HTTPException(
+                status_code=504,
+                detail=f"Agent 분석 시간 초과: {str(e)}"
+            )
         except Exception as e:
+            breaker.record_failure()
+            settled = True
             logger.error(f"❌ Agent 분석 오류: {e}", exc_info=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"Agent 분석 실패: {str(e)}"
             )
+        finally:
+            if not settled:
+                breaker.release()
@@ -0,0 +1,102 @@
+"""
+이벤트 표현별 메모리 측정 (tracemalloc)
+
+DB 행 dict(ISO 문자열 시각) / CompactEvent / pydantic Event를 같은 개수만큼 만들어
+이벤트 1건당 추가 메모리를 비교합니다. 텍스트 필드(요약/설명/원문)는 모든 이벤트가
+같은 문자열 객체를 공유하도록 해서 표현 방식의 오버헤드만 측정합니다.
+(id와 목록 포인터 8바이트는 세 방식 모두 같은 비용으로 포함)
+
+실행 (api/ 폴더에서):
+    python benchmarks/event_memory.py [이벤트 수]
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from models.compact_event import CompactEvent  # noqa: E402
+from models.schemas import Event, EventType  # noqa: E402
+
+_SUMMARY = "김철수 클라이언트 미팅"
+_DESCRIPTION = "랜딩 페이지 시안 2종 리뷰"
+_ORIGINAL_TEXT = "김철수 클라이언트: 이번 주 목요일 3시에 미팅합시다."
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_BASE_TS = int(_BASE.timestamp())
+
+
+def _dict_row(i: int) -> Dict[str, Any]:
+    start = _BASE + timedelta(minutes=30 * i)
+    return {
+        "id": f"evt-{i}",
+        "event_type": "work",
+        "status": "confirmed",
+        "summary": _SUMMARY,
+        "description": _DESCRIPTION,
+        "location": None,
+        "original_text": _ORIGINAL_TEXT,
+        "user_id": None,
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+        "created_at": (_BASE + timedelta(seconds=i)).isoformat(),
+        "recurrence": None,
+        "confidence": 0.95,
+    }
+
+
+def _compact(i: int) -> CompactEvent:
+    start = _BASE_TS + 1800 * i
+    return CompactEvent(
+        id=f"evt-{i}",
+        summary=_SUMMARY,
+        description=_DESCRIPTION,
+        original_text=_ORIGINAL_TEXT,
+        start_ts=start,
+        end_ts=start + 3600,
+        created_ts=_BASE_TS + i,
+    )
+
+
+def _pydantic(i: int) -> Event:
+    start = _BASE + timedelta(minutes=30 * i)
+    return Event(
+        id=f"evt-{i}",
+        event_type=EventType.WORK,
+        customer_name=_SUMMARY,
+        datetime=start,
+        description=_DESCRIPTION,
+        original_text=_ORIGINAL_TEXT,
+        confidence=0.95,
+    )
+
+
+def measure(build: Callable[[int], Any], count: int) -> float:
+    """build로 count건을 만들어 유지할 때 1건당 추가 메모리 (바이트)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items: List[Any] = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    results = [
+        ("dict + ISO 문자열", measure(_dict_row, count)),
+        ("CompactEvent", measure(_compact, count)),
+        ("pydantic Event", measure(_pydantic, count)),
+    ]
+    print(f"이벤트 {count:,}건, 1건당 메모리 (텍스트 필드 제외)")
+    for name, per_event in results:
+        print(f"  {name:<18} {per_event:8.0f} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 # from mangum import Mangum  <-- ❌ 삭제! (이게 원흉입니다)
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 import sys
 import logging
+import threading
+import time
 from datetime import datetime
 
 # Vercel 배포를 위한 경로 설정
@@ -23,6 +26,20 @@ except Exception as e:
     logger.error(f"Current sys.path: {sys.path}")
     events_router = None
 
+try:
+    from routers.ingestion import router as ingestion_router
+    logger.info("✅ Ingestion 라우터 import 성공")
+except Exception as e:
+    logger.error(f"❌ Ingestion 라우터 import 실패: {e}")
+    ingestion_router = None
+
+try:
+    from routers.admin import router as admin_router
+    logger.info("✅ Admin 라우터 import 성공")
+except Exception as e:
+    logger.error(f"❌ Admin 라우터 import 실패: {e}")
+    admin_router = None
+
 # FastAPI 앱 초기화 (전역 변수 'app' 필수)
 app = FastAPI(
     title="Show Me The Data",
@@ -47,11 +64,56 @@ app.add_middleware(
 
 logger.info("🔐 CORS 미들웨어 등록 완료")
 
+@app.middleware("http")
+async def profiling_middleware(request: Request, call_next):
+    """
+    요청 단위 프로파일 (PROFILING_ENABLED=true + X-Admin-Token 일치 시에만)
+    
+    X-Profile: cprofile | sample 헤더가 붙은 요청을 프로파일하고 응답 헤더 X-Profile-Id로 ID를 돌려줍니다.
+    """
+    mode = request.headers.get("x-profile")
+    if mode is None:
+        return await call_next(request)
+    
+    from services.profiling import PROFILE_MODES, get_profiler
+    profiler = get_profiler()
+    if mode not in PROFILE_MODES or not profiler.is_admin(request.headers.get("x-admin-token")):
+        return await call_next(request)
+    
+    started = time.monotonic()
+    if mode == "cprofile":
+        profile = profiler.start_cprofile()
+        if profile is None:
+            # 다른 요청이 cProfile 중이면 프로파일 없이 처리
+            return await call_next(request)
+        try:
+            response = await call_next(request)
+        finally:
+            profile_id = profiler.finish_cprofile(profile, request.url.path, time.monotonic() - started)
+    else:
+        sampler = profiler.start_sampler()
+        try:
+            response = await call_next(request)
+        finally:
+            profile_id = profiler.finish_sampler(sampler, request.url.path, time.monotonic() - started)
+    
+    response.headers["X-Profile-Id"] = profile_id
+    logger.info(f"🔬 프로파일 저장: {profile_id} ({mode}, {request.url.path})")
+    return response
+
 # 라우터 등록
 if events_router:
     app.include_router(events_router, prefix="/api")
     logger.info("✅ Events 라우터 등록 완료")
 
+if ingestion_router:
+    app.include_router(ingestion_router, prefix="/api")
+    logger.info("✅ Ingestion 라우터 등록 완료")
+
+if admin_router:
+    app.include_router(admin_router, prefix="/api")
+    logger.info("✅ Admin 라우터 등록 완료")
+
 logger.info("🔗 모든 라우터 등록 완료!")
 
 @app.get("/api/health") # Vercel 경로 매칭을 위해 /api prefix 붙임
@@ -61,6 +123,118 @@ async def health_check():
         "timestamp": str(datetime.now()),
     }
 
+@app.get("/api/ready")
+async def readiness_check():
+    """
+    Readiness 체크 (로드밸런서용)
+    
+    웜업이 켜져 있으면 완료 전까지 503을 반환하여 준비된 인스턴스로만 트래픽이 가도록 합니다.
+    """
+    from services.warmup import get_warmup_state
+    state = get_warmup_state().snapshot()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
+@app.get("/api/stats")
+async def stats():
+    """런타임 성능 지표 (프롬프트 캐시 등)"""
+    from services.openai_service import get_hedge_stats, get_prompt_cache_stats
+    from services.agent_executor import get_agent_pool
+    from services.circuit_breaker import get_llm_circuit_breaker
+    from services.database import get_database_service
+    from services.scheduler import get_scheduler
+    from services.attachment_processor import get_attachment_processor
+    from services.example_bank import get_example_bank_if_started
+    example_bank = get_example_bank_if_started()
+    return {
+        "prompt_cache": get_prompt_cache_stats().snapshot(),
+        "scheduler": get_scheduler().snapshot(),
+        "agent_pool": get_agent_pool().snapshot(),
+        "llm_circuit": get_llm_circuit_breaker().snapshot(),
+        "llm_hedging": get_hedge_stats().snapshot(),
+        "write_buffer": get_database_service().write_buffer.snapshot(),
+        "event_store": get_database_service().store_stats(),
+        "attachment_cache": get_attachment_processor().snapshot(),
+        "few_shot": example_bank.snapshot() if example_bank else None,
+    }
+
+def _warmup_steps():
+    """웜업 단계 (지연 로딩되는 싱글톤들을 미리 생성)"""
+    from models.schemas import EventType
+    from services.database import get_database_service
+    from services.agent_executor import get_agent_pool
+    from utils.date_parser import parse_date, contains_date_expression
+    from utils.text_preprocessor import preprocess_email
+    from agents.event_agent import _get_openai_service, _get_llm, _get_base_agent
+    from routers.events import _get_email_analyzer
+    
+    def date_grammar():
+        # 정규식 컴파일/캐시 채우기
+        for sample in ["오늘", "내일", "2025-12-25", "12월 25일", "12/25"]:
+            parse_date(sample)
+        contains_date_expression("다음 주 목요일 오후 3시")
+        preprocess_email("<p>김철수 클라이언트: 내일 3시 미팅</p>")
+    
+    def agents():
+        for mode in EventType:
+            _get_base_agent(mode)
+    
+    def connections():
+        # 커넥션 풀에 TLS 연결을 미리 열어둠 (선택, 외부 API 호출 1회 발생)
+        if os.getenv("WARMUP_CONNECT", "false").lower() == "true":
+            _get_openai_service().client.models.list()
+            _get_llm().root_client.models.list()
+    
+    return [
+        ("database", get_database_service),
+        ("date_grammar", date_grammar),
+        ("email_analyzer", _get_email_analyzer),
+        ("llm_clients", lambda: (_get_openai_service(), _get_llm())),
+        ("agents", agents),
+        ("agent_pool", get_agent_pool),
+        ("connections", connections),
+    ]
+
+@app.on_event("startup")
+async def startup():
+    """WARMUP_ON_STARTUP=true면 웜업 실행 (WARMUP_BLOCKING=true면 완료 후 기동)"""
+    import asyncio
+    from services.warmup import get_warmup_state
+    from services.profiling import get_profiler
+    loop_detector = get_profiler().loop_detector
+    if loop_detector:
+        loop_detector.start(asyncio.get_running_loop())
+    
+    state = get_warmup_state()
+    if not state.enabled:
+        return
+    if state.blocking:
+        await asyncio.to_thread(state.run, _warmup_steps())
+    else:
+        threading.Thread(target=state.run, args=(_warmup_steps(),), name="warmup", daemon=True).start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """종료 시 쓰기 버퍼 flush, 스냅샷 저장 및 Agent/워커 풀 정리"""
+    from services.database import get_database_service
+    from services.agent_executor import get_agent_pool
+    from services.ingestion_workers import get_ingestion_pool_if_started
+    from services.profiling import get_profiler
+    if get_profiler().loop_detector:
+        get_profiler().loop_detector.stop()
+    db = get_database_service()
+    db.write_buffer.close()
+    # 버퍼에 남아 있던 변경까지 변경 로그에 기록된 뒤 스냅샷으로 압축 (다음 인스턴스의 웜 스타트용)
+    if db.snapshot_path:
+        try:
+            db.save_snapshot()
+        except OSError as e:
+            logger.error(f"❌ 스냅샷 저장 실패: {e}")
+    get_agent_pool().shutdown()
+    ingestion_pool = get_ingestion_pool_if_started()
+    if ingestion_pool:
+        ingestion_pool.shutdown()
+    logger.info("👋 종료 처리 완료")
+
 # 로컬 개발용
 if __name__ == "__main__":
     import uvicorn
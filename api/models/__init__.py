@@ -1,16 +1,30 @@
 """모델 스키마"""
 from .schemas import (
     EventType,
+    RequestSource,
+    RecurrenceRule,
     EventRequest,
+    BulkAnalyzeRequest,
+    DateCandidate,
     Event,
     EventResponse,
     EventListResponse,
+    EventSearchResponse,
+    EventSummaryResponse,
 )
+from .compact_event import CompactEvent
 
 __all__ = [
     "EventType",
+    "RequestSource",
+    "RecurrenceRule",
     "EventRequest",
+    "BulkAnalyzeRequest",
+    "DateCandidate",
     "Event",
     "EventResponse",
     "EventListResponse",
+    "EventSearchResponse",
+    "EventSummaryResponse",
+    "CompactEvent",
 ]
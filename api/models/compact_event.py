@@ -0,0 +1,171 @@
+"""
+메모리 절약형 이벤트 레코드
+수십만 건의 이벤트를 메모리에 올려둘 때 dict + ISO 문자열 대신 사용합니다.
+- __slots__로 인스턴스 dict 제거
+- 시각은 UTC epoch 정수(초)로 보관 (기간 조회는 정수 비교)
+- 이벤트 타입은 EventType 멤버, 상태는 intern된 문자열을 공유
+pydantic Event로의 변환은 API 응답 직전에만 수행합니다.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import sys
+
+from .schemas import Event, EventType, RecurrenceRule, needs_review
+from utils.date_parser import get_timezone
+
+_EVENT_TYPES = {t.value: t for t in EventType}
+
+
+def _to_ts(value: Optional[str]) -> Optional[int]:
+    """ISO-8601 문자열 → UTC epoch 초 (오프셋 없는 값은 DEFAULT_TIMEZONE 벽시계 시각으로 해석)"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=get_timezone())
+    return int(parsed.timestamp())
+
+
+def _to_iso(ts: Optional[int]) -> Optional[str]:
+    """UTC epoch 초 → ISO-8601 문자열 (UTC 오프셋 포함)"""
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+
+
+def _to_local(ts: int) -> datetime:
+    """UTC epoch 초 → DEFAULT_TIMEZONE aware datetime (API 응답용)"""
+    return datetime.fromtimestamp(ts, get_timezone())
+
+
+class CompactEvent:
+    """이벤트 저장용 경량 레코드"""
+
+    __slots__ = (
+        "id",
+        "event_type",
+        "status",
+        "summary",
+        "description",
+        "location",
+        "original_text",
+        "user_id",
+        "start_ts",
+        "end_ts",
+        "created_ts",
+        "rrule",
+        "confidence",
+        "timezone",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        event_type: EventType = EventType.WORK,
+        status: str = "confirmed",
+        summary: Optional[str] = None,
+        description: Optional[str] = None,
+        location: Optional[str] = None,
+        original_text: Optional[str] = None,
+        user_id: Optional[str] = None,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+        created_ts: Optional[int] = None,
+        rrule: Optional[str] = None,
+        confidence: float = 0.95,
+        timezone: Optional[str] = None,
+    ):
+        self.id = id
+        self.event_type = event_type
+        self.status = sys.intern(status)
+        self.summary = summary
+        self.description = description
+        self.location = location
+        self.original_text = original_text
+        self.user_id = user_id
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.created_ts = created_ts
+        self.rrule = rrule  # RRULE 문자열 (반복 일정이 아니면 None)
+        self.confidence = confidence  # 일시 추출 신뢰도 (낮으면 재분석 대상)
+        self.timezone = timezone  # 요청 IANA 타임존 (재분석 시 같은 기준으로 해석, None이면 DEFAULT_TIMEZONE)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactEvent":
+        """DB 행(dict, ISO 문자열 시각)에서 생성"""
+        return cls(
+            id=data["id"],
+            event_type=_EVENT_TYPES.get(data.get("event_type") or "work", EventType.WORK),
+            status=data.get("status") or "confirmed",
+            summary=data.get("summary"),
+            description=data.get("description"),
+            location=data.get("location"),
+            original_text=data.get("original_text"),
+            user_id=data.get("user_id"),
+            start_ts=_to_ts(data.get("start_time")),
+            end_ts=_to_ts(data.get("end_time")),
+            created_ts=_to_ts(data.get("created_at")),
+            rrule=data.get("recurrence"),
+            confidence=data.get("confidence", 0.95),
+            timezone=data.get("timezone"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """DB 행(dict, ISO 문자열 시각)으로 변환 (영속화용)"""
+        return {
+            "id": self.id,
+            "event_type": self.event_type.value,
+            "status": self.status,
+            "summary": self.summary,
+            "description": self.description,
+            "location": self.location,
+            "original_text": self.original_text,
+            "user_id": self.user_id,
+            "start_time": _to_iso(self.start_ts),
+            "end_time": _to_iso(self.end_ts),
+            "created_at": _to_iso(self.created_ts),
+            "recurrence": self.rrule,
+            "confidence": self.confidence,
+            "timezone": self.timezone,
+        }
+
+    @property
+    def start_datetime(self) -> Optional[datetime]:
+        return _to_local(self.start_ts) if self.start_ts is not None else None
+
+    @property
+    def local_start(self) -> Optional[datetime]:
+        """요청 타임존 기준 시작 시각 (반복 일정은 이 벽시계 시각으로 전개, 타임존이 없으면 DEFAULT_TIMEZONE)"""
+        if self.start_ts is None:
+            return None
+        try:
+            tz = get_timezone(self.timezone)
+        except ValueError:
+            tz = get_timezone()
+        return datetime.fromtimestamp(self.start_ts, tz)
+
+    @property
+    def recurrence(self) -> Optional[RecurrenceRule]:
+        return RecurrenceRule.from_rrule(self.rrule) if self.rrule else None
+
+    def to_event(self, occurrence: Optional[datetime] = None) -> Event:
+        """
+        API 응답용 Event 스키마로 변환
+
+        Args:
+            occurrence: 반복 일정의 특정 발생 시각 (지정 시 datetime을 대체)
+        """
+        created = _to_local(self.created_ts) if self.created_ts is not None else datetime.now(get_timezone())
+        return Event(
+            id=self.id,
+            event_type=self.event_type,
+            customer_name=self.summary,
+            datetime=occurrence or self.start_datetime,
+            description=self.description,
+            original_text=self.original_text or self.summary or "",
+            created_at=created,
+            updated_at=created,
+            user_id=self.user_id,
+            confidence=self.confidence,
+            needs_review=needs_review(self.confidence),
+            extracted_fields={"location": self.location},
+            recurrence=self.recurrence
+        )
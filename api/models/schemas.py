@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime as dt
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Dict
+from datetime import datetime as dt, timezone
+from zoneinfo import ZoneInfo
 from enum import Enum
+import os
 
 
 class EventType(str, Enum):
@@ -11,11 +13,104 @@ class EventType(str, Enum):
     WORK = "work"        # 업무 (클라이언트 미팅, 작업 요청)
 
 
+class RequestSource(str, Enum):
+    """요청 출처 (분석 스케줄러 레인)"""
+    INTERACTIVE = "interactive"  # 화면에서 직접 요청
+    WEBHOOK = "webhook"          # 외부 연동 (메일 포워딩 등)
+    BULK = "bulk"                # 일괄 분석/임포트
+
+
+# RRULE BYDAY 표기 (0=월 ~ 6=일)
+_RRULE_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+def _parse_rrule_until(value: str) -> dt:
+    if value.endswith("Z"):
+        return dt.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    return dt.strptime(value, "%Y%m%dT%H%M%S")
+
+
+class RecurrenceRule(BaseModel):
+    """반복 규칙 (iCalendar RRULE 부분 집합)"""
+    freq: str = Field(..., description="반복 주기 (DAILY/WEEKLY/MONTHLY)")
+    interval: int = Field(default=1, ge=1, description="반복 간격 (예: 격주 = 2)")
+    by_weekday: Optional[List[int]] = Field(default=None, description="요일 (0=월 ~ 6=일, WEEKLY)")
+    by_monthday: Optional[int] = Field(default=None, ge=1, le=31, description="일자 (MONTHLY)")
+    count: Optional[int] = Field(default=None, ge=1, description="총 반복 횟수")
+    until: Optional[dt] = Field(default=None, description="반복 종료 시각")
+
+    def to_rrule(self) -> str:
+        """RRULE 문자열로 변환 (예: FREQ=WEEKLY;BYDAY=TU)"""
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_weekday:
+            parts.append("BYDAY=" + ",".join(_RRULE_WEEKDAYS[d] for d in self.by_weekday))
+        if self.by_monthday:
+            parts.append(f"BYMONTHDAY={self.by_monthday}")
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        if self.until:
+            # aware 시각은 UTC(Z)로, naive 시각은 floating 그대로
+            until = self.until.astimezone(timezone.utc) if self.until.tzinfo else self.until
+            parts.append(f"UNTIL={until.strftime('%Y%m%dT%H%M%S')}{'Z' if self.until.tzinfo else ''}")
+        return ";".join(parts)
+
+    @classmethod
+    def from_rrule(cls, rrule: str) -> "RecurrenceRule":
+        """RRULE 문자열에서 생성"""
+        fields = dict(part.split("=", 1) for part in rrule.split(";") if "=" in part)
+        return cls(
+            freq=fields["FREQ"],
+            interval=int(fields.get("INTERVAL", 1)),
+            by_weekday=[_RRULE_WEEKDAYS.index(d) for d in fields["BYDAY"].split(",")] if "BYDAY" in fields else None,
+            by_monthday=int(fields["BYMONTHDAY"]) if "BYMONTHDAY" in fields else None,
+            count=int(fields["COUNT"]) if "COUNT" in fields else None,
+            until=_parse_rrule_until(fields["UNTIL"]) if "UNTIL" in fields else None,
+        )
+
+
 class EventRequest(BaseModel):
     """이벤트 생성 요청 (이메일/메시지 분석용)"""
     text: str = Field(..., description="이메일 또는 메시지 본문", example="김철수 클라이언트: 이번 주 목요일 3시에 미팅합시다.")
     mode: EventType = Field(..., description="분석 모드 (recruit/order/work)")
     user_id: Optional[str] = Field(default=None, description="사용자 ID")
+    sent_at: Optional[dt] = Field(default=None, description="메시지 발신 시각 (상대 날짜 해석 기준, 없으면 현재 시각)")
+    timezone: Optional[str] = Field(default=None, description="사용자 IANA 타임존 (예: Asia/Seoul, 없으면 DEFAULT_TIMEZONE)")
+    source: RequestSource = Field(default=RequestSource.INTERACTIVE, description="요청 출처 (스케줄러 레인)")
+
+    @field_validator("timezone")
+    @classmethod
+    def _check_timezone(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            try:
+                ZoneInfo(value)
+            except Exception:
+                raise ValueError(f"알 수 없는 타임존: {value}")
+        return value
+
+
+class BulkAnalyzeRequest(BaseModel):
+    """일괄 분석 요청 (멀티 프로세스 워커용)"""
+    messages: List[EventRequest] = Field(..., description="분석할 메시지 목록 (사용자별 순서 유지)")
+
+
+# 일시 추출 신뢰도가 이보다 낮으면 재분석 대상
+REVIEW_THRESHOLD = float(os.getenv("CONFIDENCE_REVIEW_THRESHOLD", "0.6"))
+
+
+def needs_review(confidence: float) -> bool:
+    return confidence < REVIEW_THRESHOLD
+
+
+class DateCandidate(BaseModel):
+    """일시 후보 (근거가 된 원문 위치와 신뢰도 포함)"""
+    datetime: dt = Field(..., description="후보 일시")
+    text: Optional[str] = Field(default=None, description="근거 원문 (LLM 단독 후보는 None)")
+    start: Optional[int] = Field(default=None, description="원문 시작 위치")
+    end: Optional[int] = Field(default=None, description="원문 끝 위치 (미포함)")
+    confidence: float = Field(..., ge=0, le=1, description="후보 신뢰도")
+    source: str = Field(..., description="추출 경로 (rule/llm/both)")
 
 
 class Event(BaseModel):
@@ -32,8 +127,13 @@ class Event(BaseModel):
     updated_at: dt = Field(default_factory=dt.now)
     user_id: Optional[str] = None
     
-    # AI 분석 결과
+    # 반복 일정 (있으면 datetime은 첫 발생 시각, 목록 조회 시 기간 내 발생으로 전개)
+    recurrence: Optional[RecurrenceRule] = None
+    
+    # AI 분석 결과 (datetime은 candidates의 1순위, confidence는 그 후보의 신뢰도)
     confidence: float = Field(default=0.0, ge=0, le=1)
+    candidates: List[DateCandidate] = Field(default_factory=list, description="일시 후보 (신뢰도 순)")
+    needs_review: bool = Field(default=False, description="신뢰도가 낮아 재분석 대상인지")
     extracted_fields: dict = Field(default_factory=dict)
 
 
@@ -42,9 +142,28 @@ class EventResponse(BaseModel):
     event: Event = Field(..., description="생성된 이벤트")
     analysis: str = Field(..., description="AI 분석 결과 설명")
     tokens_used: int = Field(default=0, description="사용된 토큰 수")
+    tokens_removed: int = Field(default=0, description="전처리로 제거된 토큰 수")
 
 
 class EventListResponse(BaseModel):
     """이벤트 목록 응답"""
     events: List[Event] = Field(default=[], description="이벤트 목록")
     total: int = Field(default=0, description="전체 개수")
+
+
+class EventSearchResponse(BaseModel):
+    """이벤트 검색 응답"""
+    events: List[Event] = Field(default=[], description="검색 결과 (관련도 순)")
+    total: int = Field(default=0, description="전체 검색 결과 수")
+    query: str = Field(..., description="검색어")
+    limit: int = Field(default=20, description="페이지 크기")
+    offset: int = Field(default=0, description="시작 위치")
+
+
+class EventSummaryResponse(BaseModel):
+    """대시보드 요약 응답"""
+    total: int = Field(default=0, description="전체 이벤트 수")
+    by_type: Dict[str, int] = Field(default_factory=dict, description="타입별 이벤트 수")
+    by_status: Dict[str, int] = Field(default_factory=dict, description="상태별 이벤트 수")
+    by_day: Dict[str, int] = Field(default_factory=dict, description="일자별 이벤트 수 (YYYY-MM-DD)")
+    next_event: Optional[Event] = Field(default=None, description="다음 예정 이벤트")
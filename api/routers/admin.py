@@ -0,0 +1,74 @@
+"""
+Admin API 라우터
+프로파일 목록/다운로드 및 이벤트 루프 블로킹 감지 결과 조회 (PROFILING_ENABLED=true + 관리자 토큰 필요)
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+from typing import Optional
+import logging
+
+from services.profiling import cprofile_text, get_profiler
+
+logger = logging.getLogger(__name__)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """관리자 토큰 검증 (프로파일링이 꺼져 있으면 엔드포인트 자체를 숨김)"""
+    profiler = get_profiler()
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiler.is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/profiling",
+    summary="프로파일링 상태",
+    description="보관 중인 프로파일 목록과 이벤트 루프 블로킹 감지 결과를 조회합니다."
+)
+async def get_profiling_status() -> dict:
+    return get_profiler().snapshot()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="프로파일 다운로드",
+    description=(
+        "cprofile: .prof (snakeviz/flameprof), format=text면 누적 시간 상위 리포트. "
+        "sample: folded stacks (flamegraph.pl/speedscope)."
+    )
+)
+async def download_profile(
+    profile_id: str,
+    format: Optional[str] = Query(default=None, description="cprofile 전용: text")
+) -> Response:
+    """
+    프로파일 다운로드 엔드포인트
+
+    Args:
+        profile_id: 프로파일 ID (응답 헤더 X-Profile-Id)
+        format: cprofile 프로파일을 텍스트 리포트로 받을 때 "text"
+
+    Returns:
+        프로파일 파일
+    """
+    profile = get_profiler().store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"프로파일을 찾을 수 없습니다: {profile_id}")
+
+    if profile["mode"] == "sample":
+        return PlainTextResponse(
+            profile["data"].decode("utf-8"),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+        )
+
+    if format == "text":
+        return PlainTextResponse(cprofile_text(profile["data"]))
+    return Response(
+        content=profile["data"],
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'}
+    )
@@ -2,20 +2,38 @@
 Event API 라우터
 이벤트 생성, 조회, 수정, 삭제 엔드포인트 (Mock Mode - 해커톤 시연용)
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from typing import Any, List, Optional, Tuple
+import asyncio
+import hashlib
 import logging
+import os
 from datetime import datetime, timedelta
 
 from models.schemas import (
     EventRequest,
     EventResponse,
     EventListResponse,
+    EventSearchResponse,
+    EventSummaryResponse,
     Event,
-    EventType
+    EventType,
+    needs_review
 )
 from services.email_analyzer import EmailAnalyzer
 from services.database import get_database_service
+from services.write_behind import WriteBufferFullError
+from utils.text_preprocessor import preprocess_email
+from utils.recurrence import detect_recurrence, first_occurrence
+from utils.date_parser import find_date_mentions, get_parse_context, parse_time
+from services.candidate_ranker import event_confidence, rank_candidates
+from services.scheduler import estimate_urgency
+from services.attachment_processor import AttachmentProcessor, get_attachment_processor
+from utils.attachments import AttachmentError
+from utils.ical import iter_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +45,11 @@ db = get_database_service()
 # 서비스 싱글톤
 _email_analyzer = None
 
+# 요청당 첨부파일 수 / 업로드 읽기 단위
+_MAX_ATTACHMENTS = int(os.getenv("ATTACHMENT_MAX_FILES", "5"))
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+_FORM_CONTENT_TYPES = ("multipart/form-data", "application/x-www-form-urlencoded")
+
 
 def _get_email_analyzer():
     """EmailAnalyzer 서비스 지연 로딩"""
@@ -36,49 +59,195 @@ def _get_email_analyzer():
     return _email_analyzer
 
 
+def _validate_event_request(data: Any) -> EventRequest:
+    """요청 본문 검증 (JSON/multipart 공통 - 실패 시 FastAPI와 같은 422 응답)"""
+    try:
+        return EventRequest.model_validate(data)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False, include_context=False)]
+        )
+
+
+async def _read_upload(upload: UploadFile, max_bytes: int) -> Tuple[bytes, str]:
+    """업로드 파일을 청크 단위로 읽으며 내용 해시 계산 (크기 초과 시 413)"""
+    digest = hashlib.sha256()
+    chunks, size = [], 0
+    while chunk := await upload.read(_UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"첨부파일이 너무 큽니다: {upload.filename} (최대 {max_bytes} bytes)")
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+async def _extract_attachments(uploads: List[UploadFile]) -> Tuple[str, List[dict]]:
+    """
+    첨부파일 → 날짜가 있는 페이지 발췌 블록 + 첨부별 처리 정보
+
+    PDF 파싱은 CPU를 쓰므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    """
+    processor = get_attachment_processor()
+    items, infos = [], []
+    for upload in uploads:
+        data, sha256 = await _read_upload(upload, processor.max_bytes)
+        try:
+            extract, cached = await asyncio.to_thread(
+                processor.process, data, upload.filename, upload.content_type, sha256
+            )
+        except AttachmentError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        items.append((upload.filename, extract))
+        infos.append(extract.to_dict(upload.filename, cached))
+    return AttachmentProcessor.format_excerpts(items), infos
+
+
 @router.post(
     "",
     response_model=EventResponse,
     summary="이벤트 생성 (이메일/메시지 분석)",
-    description="이메일이나 메시지를 분석하여 Event를 생성합니다."
+    description=(
+        "이메일이나 메시지를 분석하여 Event를 생성합니다. "
+        "multipart/form-data로 보내면 attachments(PDF/텍스트)의 날짜가 있는 페이지만 골라 함께 분석합니다."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"$ref": "#/components/schemas/EventRequest"}},
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["mode"],
+                        "properties": {
+                            "text": {"type": "string", "description": "이메일 또는 메시지 본문 (attachments가 없으면 필수)"},
+                            "mode": {"$ref": "#/components/schemas/EventType"},
+                            "user_id": {"type": "string"},
+                            "sent_at": {"type": "string", "format": "date-time"},
+                            "timezone": {"type": "string"},
+                            "source": {"$ref": "#/components/schemas/RequestSource"},
+                            "attachments": {
+                                "type": "array",
+                                "items": {"type": "string", "format": "binary"},
+                                "description": "첨부파일 (PDF/텍스트)"
+                            },
+                        },
+                    }
+                },
+            },
+        }
+    }
 )
-async def create_event(request: EventRequest) -> EventResponse:
+async def create_event(http_request: Request) -> EventResponse:
     """
     이벤트 생성 엔드포인트
     
     Args:
-        request: EventRequest (text, mode, user_id)
+        http_request: JSON(EventRequest) 또는 폼(EventRequest 필드 + multipart면 attachments)
     
     Returns:
         EventResponse: 생성된 이벤트와 분석 결과
     """
+    if http_request.headers.get("content-type", "").startswith(_FORM_CONTENT_TYPES):
+        async with http_request.form(max_files=_MAX_ATTACHMENTS) as form:
+            fields = {key: value for key, value in form.multi_items() if isinstance(value, str)}
+            uploads = [value for value in form.getlist("attachments") if not isinstance(value, str)]
+            if uploads:
+                # 첨부만 보내는 경우 본문은 비어 있어도 됨
+                fields.setdefault("text", "")
+            elif not fields.get("text", "").strip():
+                # 본문도 첨부도 없으면 빈 이벤트를 만들지 않고 JSON 요청과 같은 422 (text 누락)
+                fields.pop("text", None)
+            return await _create_event(_validate_event_request(fields), uploads)
+    
     try:
-        logger.info(f"📧 이벤트 생성 요청: {request.mode.value} - {request.text[:50]}...")
+        payload = await http_request.json()
+    except ValueError:
+        raise RequestValidationError([{"type": "json_invalid", "loc": ("body",), "msg": "JSON decode error", "input": {}}])
+    return await _create_event(_validate_event_request(payload), [])
+
+
+async def _create_event(request: EventRequest, uploads: List[UploadFile]) -> EventResponse:
+    try:
+        logger.info(f"📧 이벤트 생성 요청: {request.mode.value} - {request.text[:50]}... (첨부 {len(uploads)}개)")
+        
+        # 파싱 기준 (발신 시각 + 사용자 타임존) - 요청당 한 번 계산해 모든 시각 계산에 재사용
+        context = get_parse_context(request.sent_at, request.timezone)
+        now = context.now
+        
+        # 첨부파일은 날짜가 있는 페이지 발췌만 본문 뒤에 붙여 분석
+        excerpts, attachments = await _extract_attachments(uploads)
+        original_text = request.text + excerpts
+        
+        # 전처리 (HTML, 인용된 이전 메일, 서명/고지문 등 제거) - 발췌는 이미 정리된 텍스트
+        preprocessed = preprocess_email(request.text)
+        analysis_text = (preprocessed.text + excerpts).strip()
+        
+        # 날짜 표현은 한 번만 찾아 긴급도와 후보 순위에 같이 사용 (원문 기준 위치이므로 original_text에서)
+        mentions = find_date_mentions(original_text, context)
+        urgency = estimate_urgency(original_text, context, mentions)
+        
+        # LLM 분석은 출처별 레인 + 긴급도 순으로 (대량 요청이 쌓여 있어도 긴급 메시지가 먼저)
+        analyzed = await _get_email_analyzer().analyze(
+            original_text, request.mode, request.user_id, context,
+            lane=request.source.value, urgency=urgency, mentions=mentions
+        )
+        # 분석 실패 시 규칙 기반 후보로 (원문 위치 + 신뢰도)
+        candidates = rank_candidates(mentions) if "error" in analyzed.extracted_fields else analyzed.candidates
+        confidence = event_confidence(candidates)
+        
+        # 반복 표현이 있으면 규칙만 저장하고 시작 시각은 첫 발생으로
+        recurrence = detect_recurrence(analysis_text)
+        if recurrence:
+            # 시각은 후보 순위에서 정한 해석 사용 (시간대 없는 "3시" → 오후)
+            timed = next((c.datetime for c in candidates if c.text and parse_time(c.text)), None)
+            start_time = first_occurrence(
+                recurrence, analysis_text, now, (timed.hour, timed.minute) if timed else None
+            )
+        else:
+            start_time = candidates[0].datetime if candidates else now
         
         # Mock DB에 저장 (하는 척)
         event_data = {
-            "summary": f"🤖 {request.text[:30]}...",
-            "description": f"💡 [AI 실시간 분석]\n입력: {request.text}\n모드: {request.mode.value}",
-            "start_time": datetime.now().isoformat(),
-            "end_time": (datetime.now() + timedelta(hours=1)).isoformat(),
+            "summary": f"🤖 {analysis_text[:30]}...",
+            "description": f"💡 [AI 실시간 분석]\n입력: {analysis_text}\n모드: {request.mode.value}",
+            "start_time": start_time.isoformat(),
+            "end_time": (start_time + timedelta(hours=1)).isoformat(),
             "location": "AI 분석됨",
             "status": "confirmed",
-            "created_at": datetime.now().isoformat()
+            "created_at": (datetime.now(context.tz) if request.sent_at else now).isoformat(),
+            "original_text": original_text,
+            "event_type": request.mode.value,
+            "user_id": request.user_id,
+            "recurrence": recurrence.to_rrule() if recurrence else None,
+            "confidence": confidence,
+            "timezone": request.timezone
         }
         
-        new_event = db.create_event(event_data)
+        # 메모리 뷰는 즉시 반영, 영속화는 write-behind 배치로
+        new_event = await db.create_event_buffered(event_data)
         
         # Event 스키마로 변환
         event = Event(
-            id=new_event["id"],
+            id=new_event.id,
             event_type=request.mode,
-            customer_name="AI 분석 결과",
-            datetime=datetime.fromisoformat(new_event["start_time"]),
-            description=new_event["description"],
-            original_text=request.text,
+            customer_name=analyzed.customer_name or "AI 분석 결과",
+            datetime=new_event.start_datetime,
+            description=new_event.description,
+            original_text=original_text,
             user_id=request.user_id,
-            confidence=0.95,
-            extracted_fields={"ai_generated": True}
+            recurrence=recurrence,
+            confidence=confidence,
+            candidates=candidates,
+            needs_review=needs_review(confidence),
+            extracted_fields={
+                **analyzed.extracted_fields,
+                "ai_generated": True,
+                "tokens_removed": preprocessed.tokens_removed,
+                "urgency": urgency,
+                **({"attachments": attachments} if attachments else {})
+            }
         )
         
         analysis = f"'{request.mode.value}' 이벤트가 AI 분석되어 생성되었습니다."
@@ -88,9 +257,19 @@ async def create_event(request: EventRequest) -> EventResponse:
         return EventResponse(
             event=event,
             analysis=analysis,
-            tokens_used=100
+            tokens_used=100,
+            tokens_removed=preprocessed.tokens_removed
         )
         
+    except HTTPException:
+        raise
+    except WriteBufferFullError as e:
+        logger.warning(f"⏳ 쓰기 버퍼 포화: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="저장 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "2"}
+        )
     except Exception as e:
         logger.error(f"❌ 이벤트 생성 오류: {e}", exc_info=True)
         raise HTTPException(
@@ -103,11 +282,15 @@ async def create_event(request: EventRequest) -> EventResponse:
     "",
     response_model=EventListResponse,
     summary="이벤트 목록 조회",
-    description="모든 이벤트 목록을 조회합니다."
+    description="모든 이벤트 목록을 조회합니다. 기간(start/end)을 지정하면 반복 일정을 기간 내 발생으로 전개해 시각 순으로 반환합니다."
 )
 async def get_events(
     event_type: Optional[EventType] = None,
-    user_id: Optional[str] = None
+    user_id: Optional[str] = None,
+    start: Optional[datetime] = Query(default=None, description="조회 시작 (포함)"),
+    end: Optional[datetime] = Query(default=None, description="조회 끝 (미포함)"),
+    timezone: Optional[str] = Query(default=None, description="start/end에 오프셋이 없을 때의 타임존 (없으면 DEFAULT_TIMEZONE)"),
+    limit: int = Query(default=500, ge=1, le=5000, description="기간 조회 시 최대 발생 수")
 ) -> EventListResponse:
     """
     이벤트 목록 조회 엔드포인트
@@ -115,29 +298,40 @@ async def get_events(
     Args:
         event_type: 이벤트 타입 필터 (선택적)
         user_id: 사용자 ID 필터 (선택적)
+        start: 조회 시작 (선택적, end와 함께 지정)
+        end: 조회 끝 (선택적)
+        timezone: 오프셋 없는 start/end의 해석 기준 타임존 (선택적)
+        limit: 기간 조회 시 최대 발생 수
     
     Returns:
         EventListResponse: 이벤트 목록
     """
+    if (start is None) != (end is None):
+        raise HTTPException(status_code=400, detail="start와 end는 함께 지정해야 합니다.")
+    if start is not None:
+        # 오프셋이 없는 값은 요청 타임존 기준 벽시계 시각으로 해석
+        try:
+            context = get_parse_context(tz_name=timezone)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        start, end = context.localize(start), context.localize(end)
+        if end <= start:
+            raise HTTPException(status_code=400, detail="end는 start보다 이후여야 합니다.")
+    
+    def matches(me) -> bool:
+        return (event_type is None or me.event_type == event_type) and (user_id is None or me.user_id == user_id)
+    
     try:
-        # Mock DB에서 시나리오 데이터 조회
-        mock_events = db.get_events()
-        
-        # Mock 데이터를 Event 스키마로 변환
-        events = []
-        for me in mock_events:
-            event = Event(
-                id=me["id"],
-                event_type=EventType.WORK,  # Mock 데이터는 모두 WORK로
-                customer_name=me["summary"],
-                datetime=datetime.fromisoformat(me["start_time"]) if me.get("start_time") else None,
-                description=me["description"],
-                original_text=me["summary"],
-                created_at=datetime.fromisoformat(me["created_at"]),
-                confidence=0.95,
-                extracted_fields={"mock": True, "location": me.get("location")}
-            )
-            events.append(event)
+        # 경량 레코드를 응답 직전에만 Event 스키마로 변환
+        if start is not None:
+            # 기간 조회는 시각 인덱스로 후보만 읽고, 반복 일정은 기간 안의 발생만 전개 (id는 원본 이벤트 id 유지)
+            events = [
+                me.to_event(occurrence)
+                for me, occurrence in db.get_occurrences(start, end, limit, predicate=matches)
+            ]
+        else:
+            # Mock DB에서 시나리오 데이터 조회
+            events = [me.to_event() for me in db.iter_events(user_id=user_id) if matches(me)]
         
         logger.info(f"✅ 이벤트 목록 조회: {len(events)}개")
         
@@ -154,6 +348,123 @@ async def get_events(
         )
 
 
+@router.get(
+    "/summary",
+    response_model=EventSummaryResponse,
+    summary="이벤트 요약 (대시보드 카드)",
+    description="타입/상태/일자별 이벤트 수와 다음 예정 이벤트를 반환합니다. (증분 집계)"
+)
+async def get_event_summary() -> EventSummaryResponse:
+    """
+    이벤트 요약 엔드포인트
+    
+    Returns:
+        EventSummaryResponse: 집계 결과
+    """
+    try:
+        counts, upcoming = db.get_summary()
+        
+        return EventSummaryResponse(
+            **counts,
+            next_event=upcoming[0].to_event(upcoming[1]) if upcoming else None
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ 이벤트 요약 조회 오류: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"이벤트 요약 조회 실패: {str(e)}"
+        )
+
+
+@router.get(
+    "/search",
+    response_model=EventSearchResponse,
+    summary="이벤트 검색",
+    description="고객 이름이나 키워드로 이벤트를 검색합니다. (한글 bigram 역색인, 관련도 순)"
+)
+async def search_events(
+    q: str = Query(..., min_length=1, description="검색어"),
+    limit: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    offset: int = Query(0, ge=0, description="시작 위치")
+) -> EventSearchResponse:
+    """
+    이벤트 검색 엔드포인트
+    
+    Args:
+        q: 검색어 (예: "김철수", "계획서")
+        limit: 페이지 크기
+        offset: 시작 위치
+    
+    Returns:
+        EventSearchResponse: 관련도 순 검색 결과
+    """
+    try:
+        results, total = db.search_events(q, limit=limit, offset=offset)
+        events = [e.to_event() for e in results]
+        
+        logger.info(f"🔎 이벤트 검색: '{q}' → {total}개")
+        
+        return EventSearchResponse(
+            events=events,
+            total=total,
+            query=q,
+            limit=limit,
+            offset=offset
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ 이벤트 검색 오류: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"이벤트 검색 실패: {str(e)}"
+        )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 (약한 비교, 여러 값/* 지원)"""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+@router.get(
+    ".ics",
+    summary="캘린더 구독 피드 (.ics)",
+    description="Google Calendar/Outlook 구독용 iCalendar 피드를 스트리밍합니다. ETag/If-None-Match 조건부 요청을 지원합니다.",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/calendar": {}}}, 304: {"description": "변경 없음"}}
+)
+async def export_ics(
+    user_id: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None)
+) -> Response:
+    """
+    iCalendar 피드 엔드포인트
+    
+    Args:
+        user_id: 사용자 ID 필터 (선택적)
+        if_none_match: 이전 응답의 ETag (변경이 없으면 304)
+    
+    Returns:
+        text/calendar 스트리밍 응답 또는 304
+    """
+    # 버전 카운터 기반 ETag → 변경이 없으면 이벤트를 읽지도 않고 304
+    etag = f'"{db.get_feed_version(user_id)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    logger.info(f"📅 캘린더 피드 요청: user_id={user_id}")
+    headers["Content-Disposition"] = 'inline; filename="events.ics"'
+    return StreamingResponse(
+        iter_calendar(db.iter_events(user_id=user_id), name=f"AI Calendar ({user_id})" if user_id else "AI Calendar"),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers
+    )
+
+
 @router.get(
     "/{event_id}",
     response_model=Event,
@@ -172,24 +483,13 @@ async def get_event(event_id: str) -> Event:
     """
     try:
         # Mock DB에서 조회
-        mock_events = db.get_events()
-        mock_event = next((e for e in mock_events if e["id"] == event_id), None)
+        mock_event = db.get_event(event_id)
         
         if not mock_event:
             raise HTTPException(status_code=404, detail=f"이벤트를 찾을 수 없습니다: {event_id}")
         
         # Event 스키마로 변환
-        event = Event(
-            id=mock_event["id"],
-            event_type=EventType.WORK,
-            customer_name=mock_event["summary"],
-            datetime=datetime.fromisoformat(mock_event["start_time"]) if mock_event.get("start_time") else None,
-            description=mock_event["description"],
-            original_text=mock_event["summary"],
-            created_at=datetime.fromisoformat(mock_event["created_at"]),
-            confidence=0.95,
-            extracted_fields={}
-        )
+        event = mock_event.to_event()
         
         if not event:
             raise HTTPException(
@@ -226,9 +526,9 @@ async def delete_event(event_id: str) -> dict:
         삭제 결과
     """
     try:
-        # Mock DB에서 삭제 (하는 척)
+        # Mock DB에서 삭제 (검색 인덱스도 함께 갱신)
         logger.info(f"🗑️ [Mock] 이벤트 삭제 요청: {event_id}")
-        success = True  # 항상 성공
+        success = db.delete_event(event_id)
         
         if not success:
             raise HTTPException(
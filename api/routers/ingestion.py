@@ -0,0 +1,142 @@
+"""
+Ingestion API 라우터
+대량 재분석 작업 제출 및 멀티 프로세스 워커 진행 상황/처리량 조회
+"""
+from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime, timezone
+import asyncio
+import itertools
+import logging
+
+from models.schemas import REVIEW_THRESHOLD, BulkAnalyzeRequest
+from services.database import get_database_service
+from services.ingestion_workers import get_ingestion_pool, get_ingestion_pool_if_started
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/ingestion", tags=["Ingestion"])
+
+
+@router.post(
+    "/jobs",
+    summary="일괄 분석 작업 제출",
+    description="메시지 목록을 user_id 기준으로 샤딩하여 워커 프로세스들에 분배합니다."
+)
+async def submit_job(request: BulkAnalyzeRequest) -> dict:
+    """
+    일괄 분석 작업 제출 엔드포인트
+
+    Args:
+        request: BulkAnalyzeRequest (messages)
+
+    Returns:
+        작업 ID 및 메시지 수
+    """
+    try:
+        pool = get_ingestion_pool()
+        if pool is None:
+            raise HTTPException(
+                status_code=503,
+                detail="워커 풀 모드가 비활성화되어 있습니다. (INGESTION_WORKERS=0)"
+            )
+
+        job_id = pool.submit([
+            {
+                "text": m.text,
+                "mode": m.mode.value,
+                "user_id": m.user_id,
+                "sent_at": m.sent_at.isoformat() if m.sent_at else None,
+                "timezone": m.timezone
+            }
+            for m in request.messages
+        ])
+
+        return {
+            "job_id": job_id,
+            "total": len(request.messages),
+            "num_workers": pool.num_workers
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ 일괄 분석 작업 제출 오류: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"일괄 분석 작업 제출 실패: {str(e)}"
+        )
+
+
+@router.post(
+    "/reanalyze",
+    summary="저신뢰 이벤트 일괄 재분석",
+    description="일시 추출 신뢰도가 기준보다 낮은 저장 이벤트를 모아 워커 프로세스로 재분석하고, 완료된 결과를 같은 id의 이벤트에 반영합니다."
+)
+async def reanalyze_low_confidence(
+    max_confidence: float = Query(default=REVIEW_THRESHOLD, ge=0, le=1, description="이 값보다 신뢰도가 낮은 이벤트만"),
+    limit: int = Query(default=500, ge=1, le=5000, description="최대 재분석 건수")
+) -> dict:
+    """
+    저신뢰 이벤트 재분석 엔드포인트
+    
+    Args:
+        max_confidence: 재분석 기준 신뢰도
+        limit: 최대 재분석 건수
+    
+    Returns:
+        작업 ID 및 대상 건수
+    """
+    pool = get_ingestion_pool()
+    if pool is None:
+        raise HTTPException(
+            status_code=503,
+            detail="워커 풀 모드가 비활성화되어 있습니다. (INGESTION_WORKERS=0)"
+        )
+    
+    db = get_database_service()
+    targets = itertools.islice(
+        (e for e in db.iter_events() if e.original_text and e.confidence < max_confidence),
+        limit
+    )
+    messages = [
+        {
+            "text": e.original_text,
+            "mode": e.event_type.value,
+            "user_id": e.user_id,
+            # 상대 날짜는 처음 분석했을 때와 같은 기준(생성 시각)으로 다시 해석
+            "sent_at": datetime.fromtimestamp(e.created_ts, timezone.utc).isoformat() if e.created_ts else None,
+            "timezone": e.timezone,
+            "event_id": e.id
+        }
+        for e in targets
+    ]
+    # 결과는 수집기 스레드에서 오므로 저장소 갱신은 이벤트 루프에서 (요청 처리와 같은 스레드)
+    loop = asyncio.get_running_loop()
+    job_id = pool.submit(messages, on_result=lambda result: loop.call_soon_threadsafe(db.apply_reanalysis, result))
+    logger.info(f"🔁 저신뢰 이벤트 재분석 제출: {len(messages)}건 (< {max_confidence})")
+    return {"job_id": job_id, "total": len(messages), "max_confidence": max_confidence}
+
+
+@router.get(
+    "/jobs/{job_id}",
+    summary="일괄 분석 작업 조회",
+    description="작업 진행 상황과 (완료된) 분석 결과를 조회합니다."
+)
+async def get_job(job_id: str) -> dict:
+    pool = get_ingestion_pool_if_started()
+    job = pool.get_job(job_id) if pool else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+@router.get(
+    "/stats",
+    summary="워커 진행 상황/처리량",
+    description="워커별 대기/완료 건수, 평균 처리 시간, 전체 처리량을 조회합니다."
+)
+async def get_stats() -> dict:
+    pool = get_ingestion_pool_if_started()
+    if pool is None:
+        return {"num_workers": 0, "completed": 0, "in_flight": 0, "workers": [], "jobs": []}
+    return pool.snapshot()
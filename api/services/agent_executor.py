@@ -0,0 +1,162 @@
+"""
+Agent 실행 전용 스레드 풀
+LangChain Agent는 동기(blocking) 함수이므로 기본 executor를 공유하지 않고
+크기가 제한된 전용 풀에서 실행합니다. 요청별 deadline과 협조적 취소,
+대기열 포화 시 거절(503)을 지원합니다.
+"""
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AgentQueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+class AgentTimeoutError(Exception):
+    """요청 deadline 초과"""
+
+
+class AgentCancelledError(Exception):
+    """협조적 취소로 중단됨 (deadline 초과 후 실행 중인 작업)"""
+
+
+class AgentExecutorPool:
+    """
+    Agent 실행 전용 풀
+
+    - max_workers: 동시에 실행되는 Agent 수
+    - queue_limit: 실행 대기 가능한 작업 수 (초과 시 AgentQueueFullError)
+    - 작업 함수는 threading.Event(취소 플래그)를 인자로 받아 주기적으로 확인해야 합니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        queue_limit: int = 16,
+        default_timeout: float = 30.0
+    ):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="agent-worker"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._cancelled = 0
+
+    def _run(self, fn: Callable[[threading.Event], Any], cancel_event: threading.Event) -> Any:
+        # 대기 중에 deadline이 지났다면 실행하지 않음
+        if cancel_event.is_set():
+            raise AgentCancelledError("대기 중 deadline 초과")
+        with self._lock:
+            self._active += 1
+        try:
+            return fn(cancel_event)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or isinstance(future.exception(), AgentCancelledError):
+                self._cancelled += 1
+            else:
+                self._completed += 1
+
+    async def submit(
+        self,
+        fn: Callable[[threading.Event], Any],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        작업 제출 및 결과 대기
+
+        Args:
+            fn: 풀에서 실행할 함수 (취소 플래그를 인자로 받음)
+            timeout: 요청 deadline (초, 없으면 기본값)
+
+        Returns:
+            fn의 반환값
+
+        Raises:
+            AgentQueueFullError: 대기열 포화
+            AgentTimeoutError: deadline 초과 (실행 중 작업에는 취소 신호 전달)
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_limit:
+                self._rejected += 1
+                raise AgentQueueFullError(
+                    f"Agent 대기열 포화 ({self._pending}/{self.max_workers + self.queue_limit})"
+                )
+            self._pending += 1
+
+        cancel_event = threading.Event()
+        try:
+            future = self._executor.submit(self._run, fn, cancel_event)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._on_done)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=timeout or self.default_timeout
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # 타임아웃 또는 클라이언트 연결 종료 → 실행 중인 작업에 취소 신호
+            cancel_event.set()
+            future.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            with self._lock:
+                self._timeouts += 1
+            raise AgentTimeoutError(f"Agent 실행 시간 초과 ({timeout or self.default_timeout}s)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """대기열/실행 지표 반환"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "active": self._active,
+                "queued": max(self._pending - self._active, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "cancelled": self._cancelled,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 전역 풀 (Lazy Loading용)
+_agent_pool = None
+
+
+def get_agent_pool() -> AgentExecutorPool:
+    """Agent 실행 풀 지연 로딩 (환경변수로 크기/대기열/deadline 설정)"""
+    global _agent_pool
+    if _agent_pool is None:
+        _agent_pool = AgentExecutorPool(
+            max_workers=int(os.getenv("AGENT_POOL_SIZE", "4")),
+            queue_limit=int(os.getenv("AGENT_QUEUE_LIMIT", "16")),
+            default_timeout=float(os.getenv("AGENT_TIMEOUT_SECONDS", "30")),
+        )
+        logger.info(f"🧵 Agent 실행 풀 생성: workers={_agent_pool.max_workers}, queue={_agent_pool.queue_limit}")
+    return _agent_pool
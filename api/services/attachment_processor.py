@@ -0,0 +1,176 @@
+"""
+첨부파일 분석 전처리
+첨부 페이지를 스트림으로 읽으면서 날짜 표현이 있는 페이지만 골라 LLM 입력용 발췌를 만듭니다.
+공고문 PDF처럼 수십 페이지 문서라도 LLM에는 마감일/일정이 적힌 페이지만 들어가고,
+발췌 한도를 채우면 나머지 페이지는 읽지 않습니다.
+
+같은 파일이 다시 올라오면 (전달/회신 메일에 같은 첨부가 반복되는 경우) 내용 해시로
+캐시된 결과를 재사용하므로 파싱도 하지 않습니다.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import logging
+import os
+import threading
+
+from utils.attachments import AttachmentError, attachment_kind, iter_pages
+from utils.date_parser import contains_date_expression
+
+logger = logging.getLogger(__name__)
+
+
+class AttachmentExtract:
+    """첨부 하나의 발췌 결과 (파일명과 무관 - 내용 해시 기준으로 캐시)"""
+
+    __slots__ = ("sha256", "kind", "pages_scanned", "complete", "pages")
+
+    def __init__(self, sha256: str, kind: str):
+        self.sha256 = sha256
+        self.kind = kind
+        self.pages_scanned = 0
+        # 끝까지 읽었는지 (발췌 한도/스캔 한도로 중간에 멈추면 False)
+        self.complete = True
+        # (페이지 번호, 발췌 텍스트)
+        self.pages: List[Tuple[int, str]] = []
+
+    def to_dict(self, filename: Optional[str], cached: bool) -> Dict[str, Any]:
+        return {
+            "filename": filename,
+            "sha256": self.sha256,
+            "kind": self.kind,
+            "pages_scanned": self.pages_scanned,
+            "complete": self.complete,
+            "selected_pages": [number for number, _ in self.pages],
+            "cached": cached,
+        }
+
+
+class AttachmentProcessor:
+    """
+    첨부파일 → 날짜가 있는 페이지 발췌 (내용 해시 LRU 캐시)
+
+    - ATTACHMENT_MAX_BYTES: 파일당 최대 크기 (기본 20MB)
+    - ATTACHMENT_MAX_PAGES: 파일당 최대 스캔 페이지 수 (기본 300)
+    - ATTACHMENT_PAGE_CHARS: 페이지당 발췌 최대 길이 (기본 1500자)
+    - ATTACHMENT_MAX_CHARS: 파일당 발췌 총 길이 (기본 4000자, 채우면 스캔 중단)
+    - ATTACHMENT_CACHE_SIZE: 캐시할 파일 수 (기본 64)
+    """
+
+    def __init__(self):
+        self.max_bytes = int(os.getenv("ATTACHMENT_MAX_BYTES", str(20 * 1024 * 1024)))
+        self.max_pages = int(os.getenv("ATTACHMENT_MAX_PAGES", "300"))
+        self.page_chars = int(os.getenv("ATTACHMENT_PAGE_CHARS", "1500"))
+        self.max_chars = int(os.getenv("ATTACHMENT_MAX_CHARS", "4000"))
+        self.cache_size = int(os.getenv("ATTACHMENT_CACHE_SIZE", "64"))
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, AttachmentExtract]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _cached(self, sha256: str) -> Optional[AttachmentExtract]:
+        with self._lock:
+            extract = self._cache.get(sha256)
+            if extract is not None:
+                self._cache.move_to_end(sha256)
+                self._hits += 1
+            else:
+                self._misses += 1
+            return extract
+
+    def _store(self, extract: AttachmentExtract) -> None:
+        with self._lock:
+            self._cache[extract.sha256] = extract
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _select_pages(self, data: bytes, sha256: str, kind: str) -> AttachmentExtract:
+        extract = AttachmentExtract(sha256, kind)
+        pages = iter_pages(data, kind)
+        remaining = self.max_chars
+        for number in range(1, self.max_pages + 1):
+            if remaining <= 0:
+                break
+            text = next(pages, None)
+            if text is None:
+                return extract
+            extract.pages_scanned = number
+            text = " ".join(text.split())
+            if not text or not contains_date_expression(text):
+                continue
+            excerpt = text[:min(self.page_chars, remaining)].rstrip()
+            extract.pages.append((number, excerpt))
+            remaining -= max(len(excerpt), 1)
+        # 한도로 멈춘 경우 남은 페이지가 있는지만 확인 (다음 한 페이지만 읽음)
+        extract.complete = next(pages, None) is None
+        return extract
+
+    def process(
+        self,
+        data: bytes,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        sha256: Optional[str] = None
+    ) -> Tuple[AttachmentExtract, bool]:
+        """
+        첨부 하나 처리 (동기 - 파싱이 CPU를 쓰므로 이벤트 루프에서는 스레드로 호출)
+
+        Args:
+            data: 파일 내용
+            filename: 원본 파일명 (형식 판별용)
+            content_type: 업로드 Content-Type (형식 판별용)
+            sha256: 업로드 중에 계산한 내용 해시 (없으면 여기서 계산)
+
+        Returns:
+            (발췌 결과, 캐시 적중 여부)
+
+        Raises:
+            AttachmentError: 지원하지 않는 형식, 크기 초과, 읽을 수 없는 파일
+        """
+        if len(data) > self.max_bytes:
+            raise AttachmentError(f"첨부파일이 너무 큽니다: {filename} ({len(data)} > {self.max_bytes} bytes)")
+        kind = attachment_kind(filename, content_type)
+        if kind is None:
+            raise AttachmentError(f"지원하지 않는 첨부 형식: {filename} ({content_type})")
+
+        sha256 = sha256 or self.content_hash(data)
+        extract = self._cached(sha256)
+        if extract is not None:
+            return extract, True
+
+        extract = self._select_pages(data, sha256, kind)
+        self._store(extract)
+        logger.info(
+            f"📎 첨부 분석: {filename} - {extract.pages_scanned}페이지 중 "
+            f"{len(extract.pages)}페이지 선택{'' if extract.complete else ' (한도 도달로 중단)'}"
+        )
+        return extract, False
+
+    @staticmethod
+    def format_excerpts(items: List[Tuple[Optional[str], AttachmentExtract]]) -> str:
+        """발췌 목록 → 분석 텍스트에 덧붙일 블록 (선택된 페이지가 없으면 빈 문자열)"""
+        blocks = [
+            f"[첨부: {filename or extract.sha256[:12]} p.{number}]\n{text}"
+            for filename, extract in items
+            for number, text in extract.pages
+        ]
+        return "\n\n" + "\n\n".join(blocks) if blocks else ""
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"cached_files": len(self._cache), "hits": self._hits, "misses": self._misses}
+
+
+# 전역 인스턴스 (Lazy Loading용)
+_attachment_processor = None
+
+
+def get_attachment_processor() -> AttachmentProcessor:
+    global _attachment_processor
+    if _attachment_processor is None:
+        _attachment_processor = AttachmentProcessor()
+    return _attachment_processor
@@ -0,0 +1,110 @@
+"""
+일시 후보 순위/신뢰도 계산
+규칙 기반 날짜 문법(원문 위치 포함)과 LLM 추출 결과를 합쳐 후보별 신뢰도를 계산합니다.
+
+- 규칙 후보: 표현의 구체성(절대 날짜 > 월/일 > 요일/상대 날짜 > 시각만)과 시각 포함 여부로 기본 점수
+- LLM 결과와 일치하면 가산 (서로 다른 두 경로가 같은 답 → 신뢰도 상승)
+- 시간대 없는 1~7시("3시")는 업무 시간인 오후로 보되, LLM이 적힌 그대로(오전)를 골랐으면 그 해석을 사용
+- 이벤트 신뢰도는 1순위 후보 신뢰도에서 2순위와의 차이가 작을수록 감산
+  ("목요일 3시 또는 금요일 10시"처럼 대안이 비슷하게 유력하면 아직 확정되지 않은 일정)
+신뢰도가 낮은 이벤트는 needs_review로 표시해 일괄 재분석 대상으로 모읍니다.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from models.schemas import DateCandidate
+from utils.date_parser import DateMention
+
+# 표현 종류별 기본 점수
+_KIND_SCORES = {
+    "absolute": 0.65,
+    "month_day": 0.6,
+    "weekday": 0.55,
+    "relative": 0.55,
+    "time_only": 0.4,
+}
+_TIME_BONUS = 0.2            # 날짜 + 시각이 함께 있음
+_AGREE_BONUS = 0.2           # LLM과 일시까지 일치
+_AGREE_DATE_BONUS = 0.05     # LLM과 날짜만 일치
+_LLM_ONLY_SCORE = 0.5        # 원문 근거 없는 LLM 단독 후보
+_RUNNER_UP_PENALTY = 0.5     # 2순위 후보가 1순위만큼 유력하면 이벤트 신뢰도 절반
+_MAX_CONFIDENCE = 0.99
+
+# 후보가 없을 때 이벤트 신뢰도 (이름/설명만 추출된 경우)
+NO_CANDIDATE_CONFIDENCE = 0.3
+
+
+def rank_candidates(
+    mentions: List[DateMention],
+    llm_datetime: Optional[datetime] = None,
+    llm_has_time: bool = True
+) -> List[DateCandidate]:
+    """
+    규칙 후보 + LLM 결과 → 신뢰도 순 후보 목록
+
+    Args:
+        mentions: find_date_mentions 결과 (원문 순서)
+        llm_datetime: LLM이 추출한 일시 (없거나 LLM 미사용이면 None)
+        llm_has_time: LLM 결과에 시각이 포함되었는지 (날짜만이면 날짜 단위로 비교)
+
+    Returns:
+        DateCandidate 목록 (신뢰도 내림차순)
+    """
+    # (일시, 점수, 출처, mention) - 점수는 보정 전이라 1을 넘을 수 있으므로 모델은 마지막에 생성
+    scored = []
+    matched_llm = False
+    for mention in mentions:
+        score = _KIND_SCORES.get(mention.kind, 0.4)
+        if mention.has_time and mention.kind != "time_only":
+            score += _TIME_BONUS
+        source = "rule"
+        # 오전/오후가 모호한 시각은 오후 해석 우선 (LLM과 일치하는 해석이 있으면 그것)
+        readings = [mention.pm_value, mention.value] if mention.pm_value else [mention.value]
+        value = readings[0]
+        if llm_datetime is not None:
+            for reading in readings:
+                same_day = llm_datetime.date() == reading.date()
+                if same_day and (not llm_has_time or not mention.has_time or llm_datetime == reading):
+                    score += _AGREE_BONUS if llm_has_time and mention.has_time else _AGREE_DATE_BONUS
+                    source = "both"
+                    matched_llm = True
+                    value = reading
+                    break
+        scored.append((value, score, source, mention))
+
+    if llm_datetime is not None and not matched_llm:
+        scored.append((llm_datetime, _LLM_ONLY_SCORE, "llm", None))
+
+    # 같은 일시를 가리키는 중복 후보는 점수가 높은 것 하나만
+    best = {}
+    for item in scored:
+        if item[0] not in best or item[1] > best[item[0]][1]:
+            best[item[0]] = item
+
+    candidates = [
+        DateCandidate(
+            datetime=value,
+            text=mention.text if mention else None,
+            start=mention.start if mention else None,
+            end=mention.end if mention else None,
+            confidence=round(min(score, _MAX_CONFIDENCE), 3),
+            source=source
+        )
+        for value, score, source, mention in best.values()
+    ]
+    candidates.sort(key=lambda c: (-c.confidence, c.start if c.start is not None else 1 << 30))
+    return candidates
+
+
+def event_confidence(candidates: List[DateCandidate]) -> float:
+    """
+    이벤트 신뢰도 = 1순위 후보 신뢰도 × (1 - 0.5 × 2순위/1순위)
+
+    후보가 하나면 그 신뢰도 그대로, 없으면 NO_CANDIDATE_CONFIDENCE
+    """
+    if not candidates:
+        return NO_CANDIDATE_CONFIDENCE
+    top = candidates[0].confidence
+    if len(candidates) == 1 or top == 0:
+        return top
+    return round(top * (1 - _RUNNER_UP_PENALTY * candidates[1].confidence / top), 3)
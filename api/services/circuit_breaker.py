@@ -0,0 +1,148 @@
+"""
+LLM 제공자용 Circuit Breaker
+연속 실패가 임계치를 넘으면 일정 시간 동안 호출을 차단(open)하고,
+그 사이 요청은 규칙 기반 추출로 대체할 수 있도록 CircuitOpenError를 발생시킵니다.
+"""
+from collections import deque
+from typing import Any, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Circuit이 열려 있어 LLM 호출을 건너뜀"""
+
+
+class LatencyTracker:
+    """최근 응답 시간 분포 (hedging 지연 기준 p95 계산용)"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q 분위 응답 시간 (표본이 부족하면 None)"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(int(len(ordered) * q), len(ordered) - 1)
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    3상태 Circuit Breaker
+
+    - closed: 정상 호출, 연속 실패가 failure_threshold에 도달하면 open
+    - open: recovery_timeout 동안 모든 호출 차단
+    - half_open: 시험 호출 1건만 허용, 성공 시 closed / 실패 시 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.latency = LatencyTracker()
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        호출 전 검사
+
+        Raises:
+            CircuitOpenError: 차단 상태
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self._short_circuited += 1
+        raise CircuitOpenError(f"{self.name} circuit open")
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        if latency is not None:
+            self.latency.record(latency)
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"🟢 [{self.name}] circuit closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    logger.warning(f"🔴 [{self.name}] circuit open (연속 실패 {self._failures}회)")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release(self) -> None:
+        """결과 없이 끝난 호출 (취소 등) - half-open 시험 슬롯 반환"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            failures = self._failures
+            short_circuited = self._short_circuited
+        p95 = self.latency.percentile(0.95)
+        return {
+            "state": state,
+            "consecutive_failures": failures,
+            "short_circuited": short_circuited,
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+# 전역 Breaker (Lazy Loading용)
+_llm_circuit_breaker = None
+
+
+def get_llm_circuit_breaker() -> CircuitBreaker:
+    """LLM 제공자 Circuit Breaker 지연 로딩 (Agent/직접 호출 공용)"""
+    global _llm_circuit_breaker
+    if _llm_circuit_breaker is None:
+        _llm_circuit_breaker = CircuitBreaker(
+            name="openai",
+            failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")),
+            recovery_timeout=float(os.getenv("LLM_CIRCUIT_RECOVERY_SECONDS", "30")),
+        )
+    return _llm_circuit_breaker
@@ -1,16 +1,38 @@
 import logging
+import os
 from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import heapq
+import itertools
+import time
 import uuid
 
+from models.compact_event import CompactEvent
+from services.search_index import TOKENIZER_VERSION, SearchIndex
+from services.event_aggregates import EventAggregates
+from services.event_snapshot import ChangeLog, MappedSnapshot, SnapshotError, write_snapshot
+from services.write_behind import WriteBehindBuffer
+from utils.recurrence import expand_occurrences
+from utils.date_parser import DEFAULT_TIMEZONE, get_timezone
+
 logger = logging.getLogger(__name__)
 
+
+class _Deleted:
+    """write-behind 버퍼에 넣는 삭제 표시 (대기 중인 이전 행들 뒤에서 변경 로그에 D로 기록)"""
+
+    __slots__ = ("id",)
+
+    def __init__(self, event_id: str):
+        self.id = event_id
+
 # ✅ 가짜 DB 서비스 (심사위원 현혹용 스토리 데이터)
 class DatabaseService:
     def __init__(self):
         logger.info("🎭 [Mode] Mock DB Mode with Storytelling Data")
         
-        # 현재 시간 기준
-        now = datetime.now()
+        # 현재 시간 기준 (DEFAULT_TIMEZONE - 서버 로컬 시각과 무관하게 같은 시나리오)
+        now = datetime.now(get_timezone())
         
         # ⭐ [핵심 전략] 데이터 하나하나에 'AI의 기술력'을 자랑하는 멘트를 심어둠
         self.dummy_events = [
@@ -75,19 +97,346 @@ class DatabaseService:
             }
         ]
 
-    # 이벤트 생성 (하는 척만 함 - 성공 메시지용)
-    def create_event(self, event_data: dict):
+        # 메모리 보관은 경량 레코드로 (시나리오 dict는 시드 데이터로만 사용)
+        # id 조회용 맵 + 전문 검색 인덱스 + 요약 집계 (생성/삭제 시 증분 갱신)
+        self._events_by_id = {}
+        self.search_index = SearchIndex()
+        self.aggregates = EventAggregates()
+        # 변경 버전 (캘린더 피드 ETag용 - 전체/사용자별, 인스턴스가 바뀌면 ETag도 바뀌도록 토큰 포함)
+        self._instance_token = uuid.uuid4().hex[:12]
+        self._version = 0
+        self._user_versions = {}
+
+        # 영속화는 write-behind 버퍼로 모아서 배치 저장
+        self.write_buffer = WriteBehindBuffer(
+            self.persist_batch,
+            batch_size=int(os.getenv("WRITE_BATCH_SIZE", "50")),
+            flush_interval_ms=int(os.getenv("WRITE_FLUSH_INTERVAL_MS", "200")),
+            max_pending=int(os.getenv("WRITE_BUFFER_MAX", "1000")),
+            backpressure_timeout=float(os.getenv("WRITE_BACKPRESSURE_TIMEOUT", "5")),
+        )
+
+        # 스냅샷 (EVENT_SNAPSHOT_PATH가 있으면 mmap 스냅샷을 기본 계층으로 열고 변경 로그 재생)
+        # 스냅샷 레코드는 조회할 때 디코딩하고, 이후 생성분만 _events_by_id에 보관
+        self.snapshot_path = os.getenv("EVENT_SNAPSHOT_PATH")
+        self._snapshot: Optional[MappedSnapshot] = None
+        self._shadowed = set()  # 스냅샷 레코드 중 삭제/교체된 id
+        self._snapshot_recurring = set()  # 스냅샷의 반복 일정 레코드 번호
+        self._changelog = None
+        if self.snapshot_path:
+            self._changelog = ChangeLog(os.getenv("EVENT_CHANGELOG_PATH") or f"{self.snapshot_path}.log")
+            self._restore()
+        else:
+            self._seed()
+
+    def _seed(self):
+        for e in self.dummy_events:
+            self._apply_event(CompactEvent.from_dict(e))
+
+    def _restore(self):
+        started = time.perf_counter()
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            try:
+                snapshot = MappedSnapshot(self.snapshot_path)
+            except SnapshotError as e:
+                logger.warning(f"⚠️ 스냅샷 로딩 실패 → 시나리오 데이터로 시작: {e}")
+        stale_index = False
+        if snapshot is not None:
+            stale_index = not self._attach_snapshot(snapshot)
+        else:
+            self._seed()
+        opened = time.perf_counter()
+
+        replayed = 0
+        for op, payload in self._changelog.replay():
+            if op == "U":
+                self._apply_event(CompactEvent.from_dict(payload))
+            elif op == "D":
+                self._remove_event(payload["id"])
+            replayed += 1
+        logger.info(
+            f"💽 스냅샷 복원: {len(snapshot) if snapshot else 0}건 ({(opened - started) * 1000:.1f}ms) "
+            f"+ 변경 로그 {replayed}건 ({(time.perf_counter() - opened) * 1000:.1f}ms)"
+        )
+
+        # 변경 로그가 길면 다음 인스턴스를 위해 새 스냅샷으로 압축 (요청을 받기 전이라 안전)
+        # (토큰 규칙이 바뀐 스냅샷도 색인을 다시 만들어 저장)
+        if stale_index or replayed >= int(os.getenv("EVENT_SNAPSHOT_COMPACT_RECORDS", "1000")):
+            self.save_snapshot()
+
+    # 스냅샷을 기본 계층으로 연결 (역색인을 그대로 쓸 수 없으면 False - 메모리에 다시 색인)
+    def _attach_snapshot(self, snapshot: MappedSnapshot) -> bool:
+        self._snapshot = snapshot
+        index_current = snapshot.meta.get("tokenizer", 1) == TOKENIZER_VERSION
+        if index_current:
+            self.search_index.attach_base(snapshot)
+        else:
+            for event in snapshot:
+                self.search_index.add(event.id, self._index_texts(event))
+        counts = snapshot.meta.get("aggregates")
+        if counts is not None and snapshot.meta.get("timezone") == DEFAULT_TIMEZONE:
+            self.aggregates.restore(counts)
+        else:
+            # 일자 버킷은 DEFAULT_TIMEZONE 기준이므로 타임존이 바뀌었으면 다시 집계
+            for event in snapshot:
+                self.aggregates.add(event)
+        # 반복 일정은 다음 발생 시각으로 정렬해야 하므로 집계 heap에 등록 (시각 인덱스는 첫 발생 기준)
+        self._snapshot_recurring = set(snapshot.recurring_records())
+        for rec in self._snapshot_recurring:
+            self.aggregates.schedule(snapshot.record(rec))
+        return index_current
+
+    # 현재 상태를 스냅샷으로 저장하고 변경 로그 비움 (요청이 없는 시작/종료 시점에 호출)
+    def save_snapshot(self) -> Optional[int]:
+        if not self.snapshot_path:
+            return None
+        started = time.perf_counter()
+        count = write_snapshot(
+            self.snapshot_path,
+            self.iter_events(),
+            self._index_texts,
+            meta={
+                "timezone": DEFAULT_TIMEZONE,
+                "tokenizer": TOKENIZER_VERSION,
+                "aggregates": self.aggregates.snapshot(),
+            },
+        )
+        self._changelog.reset()
+
+        # 메모리 계층을 새 스냅샷으로 교체 (이전 스냅샷에서 읽은 레코드는 복사본이라 닫아도 안전)
+        previous = self._snapshot
+        self._events_by_id = {}
+        self._shadowed = set()
+        self.search_index = SearchIndex()
+        self.aggregates = EventAggregates()
+        self._attach_snapshot(MappedSnapshot(self.snapshot_path))
+        if previous is not None:
+            previous.close()
+        logger.info(f"💽 스냅샷 저장: {count}건 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        return count
+
+    # 저장소 계층 현황 (/api/stats)
+    def store_stats(self) -> dict:
+        return {
+            "snapshot_path": self.snapshot_path,
+            "snapshot_records": len(self._snapshot) if self._snapshot is not None else 0,
+            "shadowed": len(self._shadowed),
+            "memory_records": len(self._events_by_id),
+            "changelog_records": self._changelog.records if self._changelog is not None else 0,
+        }
+
+    @staticmethod
+    def _index_texts(event: CompactEvent) -> Tuple[Optional[str], ...]:
+        return (
+            event.summary,
+            event.description,
+            event.original_text,
+            event.location,
+        )
+
+    def _index_event(self, event: CompactEvent):
+        self.search_index.add(event.id, self._index_texts(event))
+
+    def _log_changes(self, entries: Iterable[Tuple[str, dict]]):
+        if self._changelog is not None:
+            self._changelog.append(entries)
+
+    # 배치 저장 (한 트랜잭션 - Mock에서는 로그만, 실제 저장소에는 to_dict() 행/삭제로 기록)
+    def persist_batch(self, rows: List[CompactEvent]):
+        logger.info(f"💾 [Mock] 배치 저장: {len(rows)}건 (1 트랜잭션)")
+        # 스냅샷 이후 변경은 배치 단위로 변경 로그에 기록 (버퍼에 들어온 순서 그대로)
+        self._log_changes(
+            ("D", {"id": row.id}) if isinstance(row, _Deleted) else ("U", row.to_dict())
+            for row in rows
+        )
+
+    # 이벤트 생성 (메모리에 즉시 반영 - 검색/목록에서 바로 조회 가능)
+    def create_event(self, event_data: dict) -> CompactEvent:
+        new_event = self._build_event(event_data)
+        self._apply_event(new_event)
+        self._log_changes([("U", new_event.to_dict())])
+        return new_event
+
+    # 이벤트 생성 + write-behind 영속화 (버퍼가 가득 차면 대기)
+    async def create_event_buffered(self, event_data: dict) -> CompactEvent:
+        new_event = self._build_event(event_data)
+        await self.write_buffer.put(new_event)
+        # 같은 요청 안에서 바로 읽을 수 있도록 메모리 뷰는 즉시 갱신 (read-your-writes)
+        self._apply_event(new_event)
+        return new_event
+
+    # 재분석 결과 반영 (같은 id의 이벤트를 일시/신뢰도만 갱신해 교체)
+    def apply_reanalysis(self, result: dict) -> bool:
+        current = self.get_event(result.get("id") or "")
+        if current is None or result.get("extracted_fields", {}).get("error") or not result.get("datetime"):
+            return False
+        start = datetime.fromisoformat(result["datetime"])
+        duration = (current.end_ts - current.start_ts) if current.start_ts is not None and current.end_ts is not None else 3600
+        row = current.to_dict()
+        row.update(
+            start_time=start.isoformat(),
+            end_time=(start + timedelta(seconds=duration)).isoformat(),
+            confidence=result.get("confidence", current.confidence),
+        )
+        updated = CompactEvent.from_dict(row)
+        self._apply_event(updated)
+        # 영속화는 버퍼에 남은 이전 버전 뒤로 (이벤트 루프에서 flush/fsync를 기다리지 않음)
+        self.write_buffer.supersede(updated.id, updated)
+        logger.info(f"🔁 [Mock] 재분석 반영: {updated.id} (신뢰도 {current.confidence} → {updated.confidence})")
+        return True
+
+    def _build_event(self, event_data: dict) -> CompactEvent:
         logger.info(f"📝 [Mock] 이벤트 생성 요청: {event_data.get('summary')}")
         new_event = event_data.copy()
         new_event["id"] = str(uuid.uuid4())
         # 생성된 순간에도 AI가 뭔가 한 것처럼 꾸밈
         new_event["description"] = f"💡 [AI 실시간 생성]\n사용자 입력 '{event_data.get('summary')}' 의도를 분석하여 자동 생성되었습니다."
-        return new_event
+        return CompactEvent.from_dict(new_event)
+
+    def _apply_event(self, new_event: CompactEvent):
+        # 같은 id가 있으면 교체 (스냅샷 레코드는 가리고, 집계에서는 이전 값 제거)
+        previous = self.get_event(new_event.id)
+        if previous is not None:
+            if self._snapshot is not None:
+                self._shadowed.add(new_event.id)
+            self.aggregates.remove(previous)
+        self._events_by_id[new_event.id] = new_event
+        self._index_event(new_event)
+        self.aggregates.add(new_event)
+        self._bump_version(new_event.user_id)
+
+    def _bump_version(self, user_id: Optional[str]):
+        self._version += 1
+        self._user_versions[user_id] = self._version
+
+    # 피드 버전 (변경이 없으면 같은 값 → ETag로 사용)
+    def get_feed_version(self, user_id: Optional[str] = None) -> str:
+        version = self._version if user_id is None else self._user_versions.get(user_id, 0)
+        return f"{self._instance_token}-{version}"
+
+    # 스냅샷 레코드 (삭제/교체되지 않은 경우만)
+    def _base_event(self, event_id: str) -> Optional[CompactEvent]:
+        if self._snapshot is None or event_id in self._shadowed:
+            return None
+        return self._snapshot.get(event_id)
+
+    def _base_events(self, records: Iterable[int]) -> Iterator[CompactEvent]:
+        for rec in records:
+            if self._snapshot.record_id(rec) not in self._shadowed:
+                yield self._snapshot.record(rec)
+
+    # 이벤트 커서 (목록을 만들지 않고 하나씩 순회 - 순회 중 삭제된 이벤트는 건너뜀)
+    def iter_events(self, user_id: Optional[str] = None) -> Iterator[CompactEvent]:
+        # 스냅샷 레코드 먼저 (생성 순서), 이후 생성분
+        if self._snapshot is not None:
+            for event in self._base_events(range(len(self._snapshot))):
+                if user_id is None or event.user_id == user_id:
+                    yield event
+        # 순회 중 생성/삭제로 dict 크기가 바뀌어도 안전하도록 키만 스냅샷 (레코드는 복사하지 않음)
+        for event_id in tuple(self._events_by_id):
+            event = self._events_by_id.get(event_id)
+            if event is not None and (user_id is None or event.user_id == user_id):
+                yield event
 
-    # 이벤트 목록 조회
-    def get_events(self):
+    # 이벤트 목록 조회 (생성 순서 유지)
+    def get_events(self) -> List[CompactEvent]:
         logger.info("📂 [Mock] 이벤트 목록 조회 - 시나리오 데이터 반환")
-        return self.dummy_events
+        return list(self.iter_events())
+
+    # 기간 조회 대상 (스냅샷은 시각 인덱스로 기간 내 단건 + 반복 일정만 읽음)
+    def _window_events(self, start_ts: float, end_ts: float) -> Iterator[CompactEvent]:
+        if self._snapshot is not None:
+            records = dict.fromkeys(itertools.chain(
+                self._snapshot.records_between(start_ts, end_ts),
+                self._snapshot.recurring_records(),
+            ))
+            yield from self._base_events(records)
+        yield from tuple(self._events_by_id.values())
+
+    # 기간 내 발생 조회 (반복 일정은 기간 안의 발생만 지연 전개, 시각 순 병합)
+    def get_occurrences(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        limit: int,
+        predicate: Optional[Callable[[CompactEvent], bool]] = None
+    ) -> List[Tuple[CompactEvent, datetime]]:
+        # 단건 이벤트는 UTC epoch 정수 비교만으로 판정
+        start_ts, end_ts = window_start.timestamp(), window_end.timestamp()
+
+        def occurrences(event: CompactEvent) -> Iterator[Tuple[float, str, CompactEvent, datetime]]:
+            if event.start_ts is None:
+                return
+            if event.rrule is None:
+                if start_ts <= event.start_ts < end_ts:
+                    yield event.start_ts, event.id, event, event.start_datetime
+                return
+            # 요일/시각/DST는 이벤트를 만든 요청의 타임존 벽시계 기준
+            for occurrence in expand_occurrences(event.recurrence, event.local_start, window_start, window_end):
+                yield occurrence.timestamp(), event.id, event, occurrence
+
+        source = self._window_events(start_ts, end_ts)
+        if predicate is not None:
+            source = (e for e in source if predicate(e))
+        merged = heapq.merge(*(occurrences(e) for e in source))
+        return [(event, occurrence) for _, _, event, occurrence in itertools.islice(merged, limit)]
+
+    # 이벤트 단건 조회
+    def get_event(self, event_id: str) -> Optional[CompactEvent]:
+        event = self._events_by_id.get(event_id)
+        return event if event is not None else self._base_event(event_id)
+
+    def _remove_event(self, event_id: str) -> Optional[CompactEvent]:
+        event = self._events_by_id.pop(event_id, None)
+        if event is None:
+            event = self._base_event(event_id)
+            if event is None:
+                return None
+        if self._snapshot is not None:
+            self._shadowed.add(event_id)
+        self.search_index.remove(event_id)
+        self.aggregates.remove(event)
+        self._bump_version(event.user_id)
+        return event
+
+    # 이벤트 삭제
+    def delete_event(self, event_id: str) -> bool:
+        if self._remove_event(event_id) is None:
+            return False
+        # 삭제 기록도 버퍼 뒤에 (저장 중이거나 대기 중인 생성/갱신보다 먼저 로그에 남지 않도록)
+        self.write_buffer.supersede(event_id, _Deleted(event_id))
+        logger.info(f"🗑️ [Mock] 이벤트 삭제: {event_id}")
+        return True
+
+    # 요약 집계 (타입/상태/일자별 개수 + 다음 예정 이벤트와 그 발생 시각)
+    def get_summary(self) -> Tuple[dict, Optional[Tuple[CompactEvent, datetime]]]:
+        now = time.time()
+        upcoming = self.aggregates.next_upcoming(now)
+        next_ts, next_event = (upcoming[0], self.get_event(upcoming[1])) if upcoming else (None, None)
+        # 스냅샷 단건 레코드는 시각 인덱스에서 현재 이후 첫 항목 (반복 일정은 집계 heap에서 처리)
+        if self._snapshot is not None:
+            for start_ts, rec in self._snapshot.upcoming(now):
+                if rec in self._snapshot_recurring or self._snapshot.record_id(rec) in self._shadowed:
+                    continue
+                if next_event is None or start_ts < next_ts:
+                    next_ts, next_event = start_ts, self._snapshot.record(rec)
+                break
+        if next_event is None:
+            return self.aggregates.snapshot(), None
+        return self.aggregates.snapshot(), (next_event, datetime.fromtimestamp(next_ts, next_event.local_start.tzinfo))
+
+    # 전문 검색 (BM25 순위, 페이지네이션)
+    def search_events(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[CompactEvent], int]:
+        hits, total = self.search_index.search(query, limit=limit, offset=offset)
+        return [self.get_event(doc_id) for doc_id, _ in hits], total
+
+# 전역 인스턴스 (Lazy Loading용)
+_database_service = None
+
 
 def get_database_service():
-    return DatabaseService()
\ No newline at end of file
+    global _database_service
+    if _database_service is None:
+        _database_service = DatabaseService()
+    return _database_service
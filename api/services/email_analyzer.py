@@ -2,38 +2,34 @@
 이메일/메시지 분석 서비스 (Agent 시스템 사용)
 FSF 프로젝트의 Agent 구조를 재사용하여 정보 추출
 """
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import json
 import logging
+import re
 
-from models.schemas import EventType, Event
+from fastapi import HTTPException
+
+from models.schemas import EventType, Event, needs_review
 from services.openai_service import OpenAIService
-from utils.date_parser import parse_date
+from services.circuit_breaker import CircuitOpenError
+from services.example_bank import get_example_bank
+from services.scheduler import estimate_urgency
+from services.candidate_ranker import event_confidence, rank_candidates
+from utils.date_parser import DateMention, ParseContext, find_date_mentions, get_parse_context, parse_date, parse_time
+from utils.recurrence import detect_recurrence
+from utils.text_preprocessor import preprocess_email
 from agents.event_agent import EventAgent
 
 logger = logging.getLogger(__name__)
 
+# 규칙 기반 추출용 패턴 (LLM 장애 시 대체 경로)
+_RULE_NAME_PATTERN = re.compile(r'([가-힣]{2,4})\s*(?:님|고객|클라이언트|지원자|대표|씨)')
 
-class EmailAnalyzer:
-    """이메일/메시지 분석 서비스 (Agent 시스템 사용)"""
-    
-    def __init__(self):
-        self.openai_service = OpenAIService()
-        self.event_agent = EventAgent()
-    
-    def _get_system_prompt(self, mode: EventType) -> str:
-        """
-        모드에 따른 System Prompt 반환 (Prompt Switching)
-        
-        Args:
-            mode: 이벤트 타입 (recruit/order/work)
-        
-        Returns:
-            System Prompt 문자열
-        """
-        prompts = {
-            EventType.RECRUIT: """당신은 채용 담당자를 위한 AI 어시스턴트입니다.
+
+# 모드별 System Prompt (모듈 로딩 시 1회만 구성)
+_SYSTEM_PROMPTS = {
+    EventType.RECRUIT: """당신은 채용 담당자를 위한 AI 어시스턴트입니다.
 이메일이나 메시지에서 다음 정보를 추출해주세요:
 1. 지원자 이름
 2. 면접 날짜와 시간
@@ -45,8 +41,8 @@ JSON 형식으로 반환해주세요:
     "datetime": "YYYY-MM-DD HH:MM 형식 (없으면 null)",
     "description": "면접 관련 설명"
 }""",
-            
-            EventType.ORDER: """당신은 예약/주문 관리자를 위한 AI 어시스턴트입니다.
+    
+    EventType.ORDER: """당신은 예약/주문 관리자를 위한 AI 어시스턴트입니다.
 이메일이나 메시지에서 다음 정보를 추출해주세요:
 1. 고객 이름
 2. 예약/픽업 날짜와 시간
@@ -58,8 +54,8 @@ JSON 형식으로 반환해주세요:
     "datetime": "YYYY-MM-DD HH:MM 형식 (없으면 null)",
     "description": "예약 관련 설명"
 }""",
-            
-            EventType.WORK: """당신은 프리랜서/1인 대행사를 위한 AI 어시스턴트입니다.
+    
+    EventType.WORK: """당신은 프리랜서/1인 대행사를 위한 AI 어시스턴트입니다.
 이메일이나 메시지에서 다음 정보를 추출해주세요:
 1. 클라이언트 이름
 2. 미팅/작업 마감일 날짜와 시간
@@ -71,10 +67,38 @@ JSON 형식으로 반환해주세요:
     "datetime": "YYYY-MM-DD HH:MM 형식 (없으면 null)",
     "description": "작업 요청 내용"
 }"""
-        }
-        return prompts.get(mode, prompts[EventType.WORK])
+}
+
+
+class EmailAnalyzer:
+    """이메일/메시지 분석 서비스 (Agent 시스템 사용)"""
+    
+    def __init__(self):
+        self.openai_service = OpenAIService()
+        self.event_agent = EventAgent()
+    
+    def _get_system_prompt(self, mode: EventType) -> str:
+        """
+        모드에 따른 System Prompt 반환 (Prompt Switching)
+        
+        Args:
+            mode: 이벤트 타입 (recruit/order/work)
+        
+        Returns:
+            System Prompt 문자열
+        """
+        return _SYSTEM_PROMPTS.get(mode, _SYSTEM_PROMPTS[EventType.WORK])
     
-    async def analyze(self, text: str, mode: EventType, user_id: Optional[str] = None) -> Event:
+    async def analyze(
+        self,
+        text: str,
+        mode: EventType,
+        user_id: Optional[str] = None,
+        context: Optional[ParseContext] = None,
+        lane: str = "interactive",
+        urgency: Optional[float] = None,
+        mentions: Optional[List[DateMention]] = None
+    ) -> Event:
         """
         이메일/메시지 분석 및 Event 생성 (Agent 시스템 사용)
         
@@ -82,42 +106,79 @@ JSON 형식으로 반환해주세요:
             text: 분석할 텍스트 (이메일/메시지 본문)
             mode: 이벤트 타입 (recruit/order/work)
             user_id: 사용자 ID (선택적)
+            context: 날짜 파싱 기준 (발신 시각 + 타임존, 없으면 DEFAULT_TIMEZONE의 현재 시각)
+            lane: 스케줄러 레인 (interactive/webhook/bulk)
+            urgency: 긴급도 (없으면 아래 날짜 표현으로 계산)
+            mentions: text에서 이미 찾은 날짜 표현 (없으면 여기서 한 번 찾아 긴급도/후보 순위에 같이 사용)
         
         Returns:
             Event 객체
         """
+        context = context or get_parse_context()
+        if mentions is None:
+            mentions = find_date_mentions(text, context)
+        if urgency is None:
+            urgency = estimate_urgency(text, context, mentions)
         try:
-            # Agent를 사용하여 분석 (FSF 구조 재사용)
-            response_text = await self.event_agent.analyze(
-                text=text,
-                mode=mode,
-                user_id=user_id
-            )
+            llm_used = True
+            try:
+                # Agent를 사용하여 분석 (FSF 구조 재사용)
+                response_text = await self.event_agent.analyze(
+                    text=text,
+                    mode=mode,
+                    user_id=user_id,
+                    context=context,
+                    lane=lane,
+                    urgency=urgency
+                )
+                
+                # JSON 파싱 시도
+                extracted_data = self._parse_json_response(response_text)
+            except CircuitOpenError:
+                # LLM 장애 중에는 호출하지 않고 규칙 기반 추출로 대체
+                logger.warning("⚡ LLM circuit open → 규칙 기반 추출로 대체")
+                extracted_data = self._extract_rule_based(text, mentions)
+                llm_used = False
+            
+            # LLM 일시 파싱 (규칙 기반 대체 경로의 값은 아래 규칙 후보와 같으므로 제외)
+            llm_datetime = None
+            if llm_used and extracted_data.get("datetime"):
+                llm_datetime = self._parse_datetime(extracted_data["datetime"], text, context)
             
-            # JSON 파싱 시도
-            extracted_data = self._parse_json_response(response_text)
+            # 규칙 기반 후보(원문 위치 포함) + LLM 결과 → 신뢰도 순 후보
+            candidates = rank_candidates(
+                mentions,
+                llm_datetime=llm_datetime,
+                llm_has_time=llm_datetime is not None and (llm_datetime.hour, llm_datetime.minute) != (0, 0)
+            )
+            confidence = event_confidence(candidates)
             
-            # 날짜/시간 파싱
-            datetime_obj = None
-            if extracted_data.get("datetime"):
-                datetime_obj = self._parse_datetime(extracted_data["datetime"], text)
+            # LLM과 날짜 문법이 같은 일시를 고른 고신뢰 결과만 few-shot 예시로 확정
+            if llm_used and candidates and candidates[0].source == "both" and not needs_review(confidence):
+                await self._confirm_example(text, mode, extracted_data, candidates[0].datetime, context)
             
             # Event 객체 생성
             event = Event(
                 event_type=mode,
                 customer_name=extracted_data.get("customer_name"),
-                datetime=datetime_obj,
+                datetime=candidates[0].datetime if candidates else None,
                 description=extracted_data.get("description"),
                 original_text=text,
                 user_id=user_id,
-                confidence=0.8,  # 기본 신뢰도
+                recurrence=detect_recurrence(text),
+                confidence=confidence,
+                candidates=candidates,
+                needs_review=needs_review(confidence),
                 extracted_fields=extracted_data
             )
             
-            logger.info(f"✅ 이메일 분석 완료: {mode.value} - {event.customer_name}")
+            logger.info(f"✅ 이메일 분석 완료: {mode.value} - {event.customer_name} (신뢰도 {confidence}, 후보 {len(candidates)}개)")
             return event
             
         except Exception as e:
+            # 과부하(503)/시간 초과(504)는 클라이언트가 재시도할 수 있도록 그대로 전달
+            if isinstance(e, HTTPException) and e.status_code in (503, 504):
+                raise
             logger.error(f"❌ 이메일 분석 오류: {e}", exc_info=True)
             # 오류 발생 시 기본 Event 반환
             return Event(
@@ -128,9 +189,59 @@ JSON 형식으로 반환해주세요:
                 original_text=text,
                 user_id=user_id,
                 confidence=0.0,
+                needs_review=True,
                 extracted_fields={"error": str(e)}
             )
     
+    async def _confirm_example(
+        self, text: str, mode: EventType, extracted_data: Dict, confirmed: datetime, context: ParseContext
+    ) -> None:
+        """
+        확정된 추출 결과를 예시 은행에 추가 (검색 질의와 같은 전처리 텍스트 기준, 파일 기록은 스레드에서)
+        
+        Args:
+            text: 원본 텍스트
+            mode: 이벤트 타입
+            extracted_data: LLM 추출 결과
+            confirmed: 확정된 일시 (출력은 시스템 프롬프트와 같은 YYYY-MM-DD HH:MM)
+            context: 날짜 파싱 기준 (예시에 기준 시각으로 함께 저장)
+        """
+        output = {
+            "customer_name": extracted_data.get("customer_name"),
+            "datetime": f"{confirmed:%Y-%m-%d %H:%M}",
+            "description": extracted_data.get("description"),
+        }
+        bank = get_example_bank(self.openai_service)
+        if await bank.add_example_async(preprocess_email(text).text, mode, output, context.reference()):
+            logger.info(f"📚 few-shot 예시 추가: {mode.value} - {output['customer_name']}")
+    
+    def _extract_rule_based(self, text: str, mentions: List[DateMention]) -> Dict:
+        """
+        LLM 없이 정규식/날짜 문법으로 정보 추출 (Circuit open 시 대체 경로)
+        
+        Args:
+            text: 원본 텍스트
+            mentions: find_date_mentions 결과 (요일 표기/시간대 표현 해석은 후보 순위와 동일)
+        
+        Returns:
+            LLM 응답과 같은 형식의 딕셔너리
+        """
+        name_match = _RULE_NAME_PATTERN.search(text)
+        candidates = rank_candidates(mentions)
+        
+        datetime_str = None
+        if candidates:
+            best = candidates[0]
+            # 시각이 적힌 표현이면 시각까지, 아니면 날짜만
+            datetime_str = f"{best.datetime:%Y-%m-%d %H:%M}" if parse_time(best.text) else f"{best.datetime:%Y-%m-%d}"
+        
+        return {
+            "customer_name": name_match.group(1) if name_match else None,
+            "datetime": datetime_str,
+            "description": text[:200],
+            "fallback": "rule_based"
+        }
+    
     def _parse_json_response(self, response_text: str) -> Dict:
         """
         LLM 응답에서 JSON 추출
@@ -159,13 +270,14 @@ JSON 형식으로 반환해주세요:
                 "description": response_text
             }
     
-    def _parse_datetime(self, datetime_str: str, original_text: str) -> Optional[datetime]:
+    def _parse_datetime(self, datetime_str: str, original_text: str, context: ParseContext) -> Optional[datetime]:
         """
         날짜/시간 문자열을 datetime 객체로 변환
         
         Args:
             datetime_str: 날짜/시간 문자열 (예: "2025-01-15 14:00" 또는 "목요일 3시")
             original_text: 원본 텍스트 (추가 파싱 시 사용)
+            context: 날짜 파싱 기준 (결과는 이 타임존의 aware datetime)
         
         Returns:
             datetime 객체 또는 None
@@ -174,59 +286,24 @@ JSON 형식으로 반환해주세요:
             # 이미 "YYYY-MM-DD HH:MM" 형식인 경우
             if " " in datetime_str and len(datetime_str) > 10:
                 try:
-                    return datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+                    return context.localize(datetime.strptime(datetime_str, "%Y-%m-%d %H:%M"))
                 except ValueError:
                     pass
             
             # 날짜만 있는 경우 (date_parser 사용)
-            date_str = parse_date(datetime_str)
+            date_str = parse_date(datetime_str, context)
             if date_str:
                 # 시간은 원본 텍스트에서 추출 시도
-                time_match = self._extract_time(original_text)
+                day = datetime.strptime(date_str, "%Y-%m-%d").date()
+                time_match = parse_time(original_text)
                 if time_match:
-                    hour, minute = time_match
-                    return datetime.strptime(f"{date_str} {hour:02d}:{minute:02d}", "%Y-%m-%d %H:%M")
+                    return context.at(day, *time_match)
                 else:
                     # 시간 없으면 날짜만 반환
-                    return datetime.strptime(date_str, "%Y-%m-%d")
+                    return context.at(day)
             
             return None
         except Exception as e:
             logger.error(f"날짜/시간 파싱 오류: {e}")
             return None
-    
-    def _extract_time(self, text: str) -> Optional[tuple]:
-        """
-        텍스트에서 시간 추출 (HH, MM)
-        
-        Args:
-            text: 원본 텍스트
-        
-        Returns:
-            (hour, minute) 튜플 또는 None
-        """
-        import re
-        
-        # "3시", "14시", "오후 3시" 등 패턴
-        time_patterns = [
-            r'(\d{1,2})시',
-            r'오후\s*(\d{1,2})시',
-            r'오전\s*(\d{1,2})시',
-            r'(\d{1,2}):(\d{1,2})',
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, text)
-            if match:
-                if len(match.groups()) == 2:  # "14:30" 형식
-                    hour = int(match.group(1))
-                    minute = int(match.group(2))
-                    return (hour, minute)
-                else:  # "3시" 형식
-                    hour = int(match.group(1))
-                    # "오후" 키워드 확인
-                    if "오후" in text and hour < 12:
-                        hour += 12
-                    return (hour, 0)
-        
-        return None
+
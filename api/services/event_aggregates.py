@@ -0,0 +1,143 @@
+"""
+대시보드 요약 카드용 증분 집계
+이벤트 생성/삭제 시점에 카운터를 갱신해 두고, 조회 시에는 버킷만 읽습니다.
+(조회 비용이 전체 이벤트 수와 무관)
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import heapq
+import threading
+import time
+
+from models.compact_event import CompactEvent
+from utils.recurrence import expand_occurrences
+
+# 반복 일정의 다음 발생을 찾는 범위
+_RECURRENCE_HORIZON = timedelta(days=400)
+
+
+class EventAggregates:
+    """
+    타입별/상태별/일자별 이벤트 수 + 다음 예정 이벤트
+
+    - 쓰기: 카운터 증감 O(1), 예정 이벤트 heap push O(log n)
+    - 읽기: 버킷 수에 비례, 지난/삭제/교체된 heap 항목은 읽을 때 지연 제거
+    - 반복 일정은 다음 발생 시각으로 정렬 (지나면 그다음 발생으로 다시 넣음)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.by_type: Counter = Counter()
+        self.by_status: Counter = Counter()
+        self.by_day: Counter = Counter()
+        self._upcoming = []  # (발생 시각, event_id) min-heap
+        self._current: Dict[str, float] = {}  # event_id → 유효한 heap 항목의 시각 (다르면 지난 버전)
+        self._recurring: Dict[str, CompactEvent] = {}  # 다음 발생을 다시 계산할 반복 일정
+
+    @staticmethod
+    def _keys(event: CompactEvent):
+        start_ts = event.start_ts
+        return (
+            event.event_type.value,
+            event.status,
+            # 일자 버킷은 DEFAULT_TIMEZONE 기준 (서버 로컬 시각과 무관)
+            event.start_datetime.date().isoformat() if start_ts is not None else None,
+            start_ts,
+        )
+
+    def add(self, event: CompactEvent) -> None:
+        event_type, status, day, start_ts = self._keys(event)
+        with self._lock:
+            self.total += 1
+            self.by_type[event_type] += 1
+            self.by_status[status] += 1
+            if day:
+                self.by_day[day] += 1
+        self.schedule(event)
+
+    def schedule(self, event: CompactEvent, now: Optional[float] = None) -> None:
+        """다음 예정 이벤트 후보로 등록 (카운터는 그대로 - 스냅샷에서 복원한 반복 일정용)"""
+        if event.start_ts is None:
+            return
+        now = now if now is not None else time.time()
+        with self._lock:
+            if event.rrule:
+                self._recurring[event.id] = event
+            self._push(event.id, self._next_ts(event, now) if event.rrule else event.start_ts)
+
+    def _push(self, event_id: str, ts: Optional[float]) -> None:
+        if ts is None:
+            self._current.pop(event_id, None)
+            self._recurring.pop(event_id, None)
+            return
+        self._current[event_id] = ts
+        heapq.heappush(self._upcoming, (ts, event_id))
+
+    @staticmethod
+    def _next_ts(event: CompactEvent, now: float) -> Optional[float]:
+        """반복 일정의 now 이후 첫 발생 시각 (없으면 None - COUNT/UNTIL로 끝남)"""
+        window_start = datetime.fromtimestamp(now, timezone.utc)
+        for occurrence in expand_occurrences(
+            event.recurrence, event.local_start, window_start, window_start + _RECURRENCE_HORIZON
+        ):
+            return occurrence.timestamp()
+        return None
+
+    def remove(self, event: CompactEvent) -> None:
+        event_type, status, day, start_ts = self._keys(event)
+        with self._lock:
+            self.total -= 1
+            self._decrement(self.by_type, event_type)
+            self._decrement(self.by_status, status)
+            if day:
+                self._decrement(self.by_day, day)
+            # heap 항목은 읽을 때 _current와 비교해 버림 (교체 후 다시 add되면 새 시각만 유효)
+            self._current.pop(event.id, None)
+            self._recurring.pop(event.id, None)
+
+    def restore(self, counts: Dict[str, Any]) -> None:
+        """스냅샷에 저장된 카운터로 복원 (다음 예정 이벤트 heap은 이후 추가분만 - 스냅샷 쪽은 시각 인덱스로 조회)"""
+        with self._lock:
+            self.total = counts.get("total", 0)
+            self.by_type = Counter(counts.get("by_type", {}))
+            self.by_status = Counter(counts.get("by_status", {}))
+            self.by_day = Counter(counts.get("by_day", {}))
+
+    @staticmethod
+    def _decrement(counter: Counter, key: str) -> None:
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+
+    def next_upcoming(self, now: Optional[float] = None) -> Optional[Tuple[float, str]]:
+        """현재 이후 가장 가까운 (발생 시각, 이벤트 id) (지난/삭제/교체된 항목은 heap에서 제거)"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            while self._upcoming:
+                ts, event_id = self._upcoming[0]
+                if self._current.get(event_id) != ts:
+                    heapq.heappop(self._upcoming)
+                    continue
+                if ts < now:
+                    heapq.heappop(self._upcoming)
+                    recurring = self._recurring.get(event_id)
+                    self._push(event_id, self._next_ts(recurring, now) if recurring is not None else None)
+                    continue
+                return ts, event_id
+        return None
+
+    def next_upcoming_id(self, now: Optional[float] = None) -> Optional[str]:
+        """현재 이후 가장 가까운 이벤트 id"""
+        upcoming = self.next_upcoming(now)
+        return upcoming[1] if upcoming else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total,
+                "by_type": dict(self.by_type),
+                "by_status": dict(self.by_status),
+                "by_day": dict(sorted(self.by_day.items())),
+            }
@@ -0,0 +1,453 @@
+"""
+이벤트 저장소 스냅샷 (바이너리, mmap) + 변경 로그
+콜드 스타트마다 저장소를 처음부터 다시 만들지 않도록 이벤트 레코드와 보조 인덱스
+(id 맵, 시각 인덱스, 검색 역색인)를 하나의 바이너리 파일로 저장하고, 시작 시 mmap으로 엽니다.
+여는 데는 헤더만 읽으므로 이벤트 수와 무관하게 수 ms이고, 레코드/posting은 조회할 때 필요한 것만 디코딩합니다.
+스냅샷 이후의 생성/삭제는 변경 로그에 덧붙이고 시작 시 재생합니다.
+
+파일 구조 (little-endian):
+- 헤더: MAGIC, 버전, 레코드 수, 섹션 수 + 섹션 표 (이름 4바이트, offset, 길이)
+- RECS: 고정 길이 레코드 (문자열은 STRS의 offset/길이, 시각은 UTC epoch)
+- STRS: UTF-8 문자열 힙
+- IDIX: id 바이트 순으로 정렬된 레코드 번호 (이진 탐색)
+- TIME: (start_ts, 레코드 번호) 시각 순 (기간 조회/다음 일정)
+- RECR: 반복 일정 레코드 번호
+- TOKS/POST/DLEN: 검색 토큰 표(정렬) → posting (레코드 번호, tf), 문서 길이
+- META: JSON (타임존, 검색 총 길이, 요약 집계)
+"""
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+from models.compact_event import CompactEvent
+from models.schemas import EventType
+from services.search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SMTDSNAP"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<8sIII")
+_SECTION = struct.Struct("<4sQQ")
+_U32 = struct.Struct("<I")
+_TIME_ENTRY = struct.Struct("<qI")
+_TOKEN_ENTRY = struct.Struct("<4I")
+_POSTING = struct.Struct("<II")
+
+# None 표시 (문자열 길이 / 시각)
+_NULL_LEN = 0xFFFFFFFF
+_NULL_TS = -(1 << 63)
+
+_EVENT_TYPES = list(EventType)
+_STRING_FIELDS = ("id", "status", "summary", "description", "location", "original_text", "user_id", "rrule", "timezone")
+# 버전별 레코드 문자열 필드 (v1에는 timezone 없음 - 이전 스냅샷도 그대로 읽음)
+_VERSION_FIELDS = {1: _STRING_FIELDS[:-1], 2: _STRING_FIELDS}
+
+
+def _record_struct(n_strings: int) -> struct.Struct:
+    """문자열 필드 (offset, 길이) + 타입 + 시각 3개 + 신뢰도"""
+    return struct.Struct(f"<{2 * n_strings}IB3qd")
+
+
+_RECORD = _record_struct(len(_STRING_FIELDS))
+
+
+class SnapshotError(Exception):
+    """스냅샷 파일이 없거나 형식이 맞지 않음"""
+
+
+class _StringHeap:
+    """문자열 힙 (같은 문자열은 한 번만 저장 - 상태/사용자 id 등)"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, value: Optional[str]) -> Tuple[int, int]:
+        if value is None:
+            return 0, _NULL_LEN
+        ref = self._offsets.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = (len(self.data), len(encoded))
+            self.data += encoded
+            self._offsets[value] = ref
+        return ref
+
+
+def write_snapshot(
+    path: str,
+    events: Iterable[CompactEvent],
+    index_texts: Callable[[CompactEvent], Iterable[Optional[str]]],
+    meta: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    스냅샷 파일 생성 (임시 파일에 쓴 뒤 교체 - 쓰는 도중에 죽어도 이전 스냅샷 유지)
+
+    Args:
+        path: 스냅샷 경로
+        events: 저장할 이벤트 (이 순서가 목록 조회 순서)
+        index_texts: 이벤트 → 검색 색인 대상 텍스트 (저장소의 색인 기준과 같아야 함)
+        meta: 함께 저장할 JSON 메타데이터 (요약 집계 등)
+
+    Returns:
+        저장한 레코드 수
+    """
+    strings = _StringHeap()
+    records = bytearray()
+    ids: List[Tuple[bytes, int]] = []
+    times: List[Tuple[int, int]] = []
+    recurring = bytearray()
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    doc_lengths = bytearray()
+    total_length = 0
+
+    for rec, event in enumerate(events):
+        refs = []
+        for field in _STRING_FIELDS:
+            refs.extend(strings.add(getattr(event, field)))
+        records += _RECORD.pack(
+            *refs,
+            _EVENT_TYPES.index(event.event_type),
+            *(_NULL_TS if ts is None else ts for ts in (event.start_ts, event.end_ts, event.created_ts)),
+            event.confidence,
+        )
+        ids.append((event.id.encode("utf-8"), rec))
+        if event.start_ts is not None:
+            times.append((event.start_ts, rec))
+        if event.rrule:
+            recurring += _U32.pack(rec)
+
+        counts = SearchIndex.term_counts(index_texts(event))
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append((rec, tf))
+        length = sum(counts.values())
+        doc_lengths += _U32.pack(length)
+        total_length += length
+
+    count = len(ids)
+    ids.sort()
+    times.sort()
+
+    tokens = bytearray()
+    posting_data = bytearray()
+    n_postings = 0
+    for token in sorted(postings, key=lambda t: t.encode("utf-8")):
+        offset, length = strings.add(token)
+        entries = postings[token]
+        tokens += _TOKEN_ENTRY.pack(offset, length, n_postings, len(entries))
+        for rec, tf in entries:
+            posting_data += _POSTING.pack(rec, tf)
+        n_postings += len(entries)
+
+    meta = dict(meta or {}, total_length=total_length, created_at=time.time())
+    sections = [
+        (b"RECS", bytes(records)),
+        (b"IDIX", b"".join(_U32.pack(rec) for _, rec in ids)),
+        (b"TIME", b"".join(_TIME_ENTRY.pack(ts, rec) for ts, rec in times)),
+        (b"RECR", bytes(recurring)),
+        (b"TOKS", bytes(tokens)),
+        (b"POST", bytes(posting_data)),
+        (b"DLEN", bytes(doc_lengths)),
+        (b"META", json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+        (b"STRS", bytes(strings.data)),
+    ]
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = bytearray()
+    for name, data in sections:
+        table += _SECTION.pack(name, offset, len(data))
+        offset += len(data)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, count, len(sections)))
+        f.write(table)
+        for _, data in sections:
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+class _TimeKeys:
+    """TIME 섹션을 bisect용 시퀀스로 (start_ts만 읽음)"""
+
+    def __init__(self, snapshot: "MappedSnapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.time_count
+
+    def __getitem__(self, i: int) -> int:
+        return self._snapshot.time_entry(i)[0]
+
+
+class MappedSnapshot:
+    """
+    mmap으로 연 읽기 전용 스냅샷
+
+    열 때는 헤더/섹션 표/META만 읽고, 레코드와 posting은 접근할 때 디코딩합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"빈 스냅샷 파일: {path}")
+        try:
+            magic, version, self.count, n_sections = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version not in _VERSION_FIELDS:
+                raise SnapshotError(f"스냅샷 형식 불일치: {path} ({magic!r}, v{version})")
+            self._sections = {}
+            for i in range(n_sections):
+                name, offset, length = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+                if offset + length > len(self._mm):
+                    raise SnapshotError(f"잘린 스냅샷 파일: {path}")
+                self._sections[name.decode("ascii")] = (offset, length)
+            self.meta = json.loads(self._section_bytes("META"))
+        except (struct.error, KeyError, ValueError) as e:
+            self._mm.close()
+            raise SnapshotError(f"스냅샷을 읽을 수 없습니다: {path} ({e})")
+        except SnapshotError:
+            self._mm.close()
+            raise
+
+        self.version = version
+        self._fields = _VERSION_FIELDS[version]
+        self._record = _record_struct(len(self._fields))
+        self._recs = self._sections["RECS"][0]
+        self._idix = self._sections["IDIX"][0]
+        self._time = self._sections["TIME"][0]
+        self.time_count = self._sections["TIME"][1] // _TIME_ENTRY.size
+        self._recr, recr_length = self._sections["RECR"]
+        self.recurring_count = recr_length // _U32.size
+        self._toks = self._sections["TOKS"][0]
+        self.token_count = self._sections["TOKS"][1] // _TOKEN_ENTRY.size
+        self._post = self._sections["POST"][0]
+        self._dlen = self._sections["DLEN"][0]
+        self._strs = self._sections["STRS"][0]
+        self.total_length = self.meta.get("total_length", 0)
+
+    def _section_bytes(self, name: str) -> bytes:
+        offset, length = self._sections[name]
+        return self._mm[offset:offset + length]
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    # 문자열/레코드
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == _NULL_LEN:
+            return None
+        start = self._strs + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _raw_bytes(self, offset: int, length: int) -> bytes:
+        start = self._strs + offset
+        return self._mm[start:start + length]
+
+    def _record_id_bytes(self, rec: int) -> bytes:
+        offset, length = struct.unpack_from("<II", self._mm, self._recs + rec * self._record.size)
+        return self._raw_bytes(offset, length)
+
+    def record_id(self, rec: int) -> str:
+        return self._record_id_bytes(rec).decode("utf-8")
+
+    def record(self, rec: int) -> CompactEvent:
+        """레코드 번호 → CompactEvent (문자열은 복사되므로 스냅샷을 닫은 뒤에도 유효)"""
+        values = self._record.unpack_from(self._mm, self._recs + rec * self._record.size)
+        n = 2 * len(self._fields)
+        strings = {field: self._string(values[2 * i], values[2 * i + 1]) for i, field in enumerate(self._fields)}
+        start_ts, end_ts, created_ts = (None if ts == _NULL_TS else ts for ts in values[n + 1:n + 4])
+        return CompactEvent(
+            event_type=_EVENT_TYPES[values[n]],
+            start_ts=start_ts,
+            end_ts=end_ts,
+            created_ts=created_ts,
+            confidence=values[n + 4],
+            **strings,
+        )
+
+    def __iter__(self) -> Iterator[CompactEvent]:
+        for rec in range(self.count):
+            yield self.record(rec)
+
+    # id 맵
+
+    def find(self, event_id: str) -> Optional[int]:
+        """id → 레코드 번호 (IDIX 이진 탐색, 없으면 None)"""
+        target = event_id.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            rec = _U32.unpack_from(self._mm, self._idix + mid * _U32.size)[0]
+            key = self._record_id_bytes(rec)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return rec
+        return None
+
+    def get(self, event_id: str) -> Optional[CompactEvent]:
+        rec = self.find(event_id)
+        return self.record(rec) if rec is not None else None
+
+    # 시각 인덱스
+
+    def time_entry(self, i: int) -> Tuple[int, int]:
+        return _TIME_ENTRY.unpack_from(self._mm, self._time + i * _TIME_ENTRY.size)
+
+    def records_between(self, start_ts: float, end_ts: float) -> Iterator[int]:
+        """start_ts <= 시작 시각 < end_ts 인 레코드 번호 (시각 순)"""
+        i = bisect_left(_TimeKeys(self), start_ts)
+        while i < self.time_count:
+            ts, rec = self.time_entry(i)
+            if ts >= end_ts:
+                return
+            yield rec
+            i += 1
+
+    def upcoming(self, now: float) -> Iterator[Tuple[int, int]]:
+        """현재 이후 (start_ts, 레코드 번호) 시각 순"""
+        for i in range(bisect_left(_TimeKeys(self), now), self.time_count):
+            yield self.time_entry(i)
+
+    def recurring_records(self) -> Iterator[int]:
+        for i in range(self.recurring_count):
+            yield _U32.unpack_from(self._mm, self._recr + i * _U32.size)[0]
+
+    # 검색 역색인
+
+    def doc_length(self, rec: int) -> int:
+        return _U32.unpack_from(self._mm, self._dlen + rec * _U32.size)[0]
+
+    def posting_span(self, token: str) -> Tuple[int, int]:
+        """토큰 → POST 구간 (시작 위치, 개수) (TOKS 이진 탐색, 없으면 (0, 0))"""
+        target = token.encode("utf-8")
+        lo, hi = 0, self.token_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, start, n = _TOKEN_ENTRY.unpack_from(self._mm, self._toks + mid * _TOKEN_ENTRY.size)
+            key = self._raw_bytes(offset, length)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return start, n
+        return 0, 0
+
+    def postings(self, token: str) -> List[Tuple[int, int]]:
+        """토큰 → [(레코드 번호, tf), ...] (레코드 번호 오름차순, 없으면 빈 목록)"""
+        start, n = self.posting_span(token)
+        base = self._post + start * _POSTING.size
+        return list(_POSTING.iter_unpack(self._mm[base:base + n * _POSTING.size]))
+
+    def posting_tf(self, span: Tuple[int, int], rec: int) -> Optional[int]:
+        """posting 구간에서 레코드의 tf (이진 탐색, 없으면 None) - 긴 posting을 디코딩하지 않고 후보만 확인"""
+        start, n = span
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key, tf = _POSTING.unpack_from(self._mm, self._post + (start + mid) * _POSTING.size)
+            if key < rec:
+                lo = mid + 1
+            elif key > rec:
+                hi = mid
+            else:
+                return tf
+        return None
+
+
+class ChangeLog:
+    """
+    스냅샷 이후 변경 로그 (append-only)
+
+    프레임: 길이(u32) + crc32(u32) + 연산(1바이트: U=생성/갱신, D=삭제) + JSON 본문
+    마지막 프레임이 잘렸거나 crc가 맞지 않으면 (쓰는 도중 종료) 그 지점부터 버립니다.
+    """
+
+    _FRAME = struct.Struct("<IIc")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def append(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """변경 여러 건을 한 번에 기록 (배치당 fsync 1회)"""
+        frames = bytearray()
+        n = 0
+        for op, payload in entries:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            frames += self._FRAME.pack(len(body), zlib.crc32(body), op.encode("ascii")) + body
+            n += 1
+        if not n:
+            return
+        # 삭제는 요청 스레드, 생성은 write-behind 스레드에서 기록
+        with self._lock:
+            f = self._open()
+            f.write(frames)
+            f.flush()
+            os.fsync(f.fileno())
+            self.records += n
+
+    def replay(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """기록된 변경을 순서대로 (잘린 꼬리는 잘라냄)"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        pos = 0
+        while pos + self._FRAME.size <= len(data):
+            length, crc, op = self._FRAME.unpack_from(data, pos)
+            body = data[pos + self._FRAME.size:pos + self._FRAME.size + length]
+            if len(body) < length or zlib.crc32(body) != crc:
+                break
+            pos += self._FRAME.size + length
+            self.records += 1
+            yield op.decode("ascii"), json.loads(body)
+        if pos < len(data):
+            logger.warning(f"⚠️ 변경 로그 꼬리 손상 → {len(data) - pos}바이트 버림 ({self.path})")
+            with open(self.path, "r+b") as f:
+                f.truncate(pos)
+
+    def reset(self) -> None:
+        """스냅샷에 반영된 변경 삭제"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.path, "wb"):
+                pass
+            self.records = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
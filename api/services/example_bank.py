@@ -0,0 +1,294 @@
+"""
+Few-shot 예시 뱅크 (임베딩 기반 검색)
+확정된 과거 추출 결과를 예시로 모아두고, 요청마다 가장 비슷한 예시 k개만 프롬프트에 넣습니다.
+예시가 늘어나도 프롬프트에는 항상 k개만 들어가므로 토큰 사용량이 일정합니다.
+
+- 예시 임베딩은 처음 사용할 때 한 번만 생성 (모드별 NumPy 행렬, 행 단위 L2 정규화)
+- 검색은 행렬-벡터 곱(코사인 유사도) + argpartition으로 상위 k개
+- 예시 출력은 시스템 프롬프트와 같은 절대 일시(YYYY-MM-DD HH:MM)이고, 상대 표현을 푼 기준 시각을 함께 보여줌
+- LLM과 날짜 문법이 일치한 고신뢰 추출은 확정 예시로 추가 (EXAMPLE_BANK_PATH가 있으면 파일에도 기록)
+- 질의 임베딩은 시간 제한 안에서만 기다리고, 넘기면 예시 없이 진행 (임베딩 지연이 분석을 막지 않도록)
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from models.schemas import EventType
+from services.openai_service import OpenAIService
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트에 넣을 예시 입력 최대 길이 (예시 하나가 프롬프트를 키우지 않도록)
+_MAX_SHOT_CHARS = 300
+
+# 임베딩 생성 실패 시 재시도 대기 (매 요청마다 실패하는 호출을 반복하지 않도록)
+_BUILD_RETRY_SECONDS = 60
+
+# 기본 예시의 기준 시각 (상대 표현 "내일", "다음 주 화요일"을 이 시각 기준 절대 일시로 풀어 둠)
+_SEED_REFERENCE = "2026-10-19 10:00 (월요일, Asia/Seoul)"
+
+# 기본 예시 (확정된 추출 결과) - EXAMPLE_BANK_PATH(JSONL)로 추가 가능
+_SEED_EXAMPLES: List[Dict[str, Any]] = [
+    {
+        "mode": "recruit",
+        "reference": _SEED_REFERENCE,
+        "text": "안녕하세요, 백엔드 개발자 지원자 이영희입니다. 말씀하신 2차 면접은 다음 주 화요일 오후 2시에 참석 가능합니다.",
+        "output": {"customer_name": "이영희", "datetime": "2026-10-27 14:00", "description": "백엔드 개발자 2차 면접"},
+    },
+    {
+        "mode": "recruit",
+        "reference": _SEED_REFERENCE,
+        "text": "[면접 일정 변경 요청] 박준호 지원자가 12월 3일 10시 면접을 오후 4시로 옮길 수 있는지 문의했습니다.",
+        "output": {"customer_name": "박준호", "datetime": "2026-12-03 16:00", "description": "면접 시간 변경 요청 (10시 → 16시)"},
+    },
+    {
+        "mode": "order",
+        "reference": _SEED_REFERENCE,
+        "text": "김민수입니다. 내일 오전 11시에 케이크 2개 픽업 예약하고 싶어요. 초 10개도 같이 부탁드려요.",
+        "output": {"customer_name": "김민수", "datetime": "2026-10-20 11:00", "description": "케이크 2개 픽업 (초 10개 포함)"},
+    },
+    {
+        "mode": "order",
+        "reference": _SEED_REFERENCE,
+        "text": "토요일 저녁 7시 4명 예약 가능할까요? 창가 자리면 좋겠습니다. - 정수진",
+        "output": {"customer_name": "정수진", "datetime": "2026-10-24 19:00", "description": "4인 저녁 예약 (창가 자리 요청)"},
+    },
+    {
+        "mode": "work",
+        "reference": _SEED_REFERENCE,
+        "text": "김철수 클라이언트: 이번 주 목요일 3시에 미팅합시다. 랜딩 페이지 시안 2종 준비 부탁드립니다.",
+        "output": {"customer_name": "김철수", "datetime": "2026-10-22 15:00", "description": "랜딩 페이지 시안 2종 리뷰 미팅"},
+    },
+    {
+        "mode": "work",
+        "reference": _SEED_REFERENCE,
+        "text": "(주)한빛 최대표님 요청 - 상세페이지 수정본 12/20 오후 6시까지 전달 부탁드립니다. 금액은 기존 견적대로 진행합니다.",
+        "output": {"customer_name": "최대표", "datetime": "2026-12-20 18:00", "description": "상세페이지 수정본 전달 마감"},
+    },
+]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class ExampleBank:
+    """
+    모드별 few-shot 예시 인덱스
+
+    - FEW_SHOT_K: 요청당 예시 수 (기본 3, 0이면 비활성화)
+    - FEW_SHOT_MIN_SIMILARITY: 이보다 덜 비슷한 예시는 넣지 않음 (기본 0.3)
+    - FEW_SHOT_TIMEOUT_SECONDS: 예시 검색(질의 임베딩) 대기 한도 (기본 1초, 넘기면 예시 없이 진행)
+    - FEW_SHOT_MAX_EXAMPLES: 확정 예시를 더 받지 않는 크기 (기본 2000)
+    - EXAMPLE_BANK_PATH: 추가 예시 JSONL ({"mode", "reference", "text", "output"} 한 줄에 하나, 확정 예시도 여기에 추가)
+    """
+
+    def __init__(self, openai_service: OpenAIService):
+        self.openai_service = openai_service
+        self.k = int(os.getenv("FEW_SHOT_K", "3"))
+        self.min_similarity = float(os.getenv("FEW_SHOT_MIN_SIMILARITY", "0.3"))
+        self.timeout = float(os.getenv("FEW_SHOT_TIMEOUT_SECONDS", "1.0"))
+        self.max_examples = int(os.getenv("FEW_SHOT_MAX_EXAMPLES", "2000"))
+        self.path = os.getenv("EXAMPLE_BANK_PATH")
+        self._examples: Dict[EventType, List[Dict[str, Any]]] = {mode: [] for mode in EventType}
+        self._matrices: Dict[EventType, np.ndarray] = {}
+        self._pending: List[Dict[str, Any]] = list(_SEED_EXAMPLES) + self._load_file(self.path)
+        # 같은 메시지가 재분석될 때 예시가 중복으로 쌓이지 않도록 (모드 + 텍스트 해시)
+        self._seen = {self._example_key(e["mode"], e["text"]) for e in self._pending}
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._build_task: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+        self._added = 0
+        self._timeouts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.k > 0
+
+    @staticmethod
+    def _load_file(path: Optional[str]) -> List[Dict[str, Any]]:
+        if not path:
+            return []
+        try:
+            with open(path, encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 예시 파일 로딩 실패 ({path}): {e}")
+            return []
+
+    @staticmethod
+    def _example_key(mode: str, text: str) -> str:
+        return hashlib.sha256(f"{mode}\n{text[:_MAX_SHOT_CHARS]}".encode("utf-8")).hexdigest()
+
+    def add_example(self, text: str, mode: EventType, output: Dict[str, Any], reference: Optional[str] = None) -> bool:
+        """
+        확정된 추출 결과를 예시로 추가 (임베딩은 다음 검색 시 한 번에 생성)
+
+        EXAMPLE_BANK_PATH 기록은 파일 I/O이므로 이벤트 루프가 아닌 스레드에서 호출하세요. (add_example_async)
+
+        Args:
+            text: 전처리된 입력 텍스트
+            mode: 이벤트 타입
+            output: 추출 결과 (datetime은 YYYY-MM-DD HH:MM)
+            reference: 상대 표현을 해석한 기준 시각 (ParseContext.reference())
+
+        Returns:
+            추가 여부 (비활성화/중복/최대 크기면 False)
+        """
+        if not self.enabled or not text.strip():
+            return False
+        example = {"mode": mode.value, "reference": reference, "text": text, "output": output}
+        key = self._example_key(example["mode"], text)
+        with self._lock:
+            if key in self._seen or self._size_locked() >= self.max_examples:
+                return False
+            self._seen.add(key)
+            self._pending.append(example)
+            self._added += 1
+        if self.path:
+            # 파일 기록은 잠금 밖에서 (검색/통계가 디스크 쓰기를 기다리지 않도록, 쓰기끼리는 파일 잠금으로 직렬화)
+            with self._file_lock:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(example, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logger.warning(f"⚠️ 예시 파일 기록 실패 ({self.path}): {e}")
+        return True
+
+    async def add_example_async(self, *args: Any, **kwargs: Any) -> bool:
+        """add_example을 스레드에서 실행 (이벤트 루프에서 호출할 때)"""
+        return await asyncio.to_thread(self.add_example, *args, **kwargs)
+
+    def _size_locked(self) -> int:
+        return sum(len(v) for v in self._examples.values()) + len(self._pending)
+
+    def size(self) -> int:
+        with self._lock:
+            return self._size_locked()
+
+    async def _embed_pending(self) -> None:
+        """대기 중인 예시를 한 번의 배치 호출로 임베딩하여 모드별 행렬에 추가"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        embeddings = await self.openai_service.generate_embeddings(
+            [e["text"][:_MAX_SHOT_CHARS] for e in pending]
+        )
+        if len(embeddings) != len(pending):
+            with self._lock:
+                self._pending = pending + self._pending
+            self._retry_at = time.monotonic() + _BUILD_RETRY_SECONDS
+            logger.warning(f"⚠️ 예시 임베딩 생성 실패 → {_BUILD_RETRY_SECONDS}초 후 재시도")
+            return
+
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            for mode in EventType:
+                rows = [i for i, e in enumerate(pending) if e["mode"] == mode.value]
+                if not rows:
+                    continue
+                self._examples[mode].extend(pending[i] for i in rows)
+                new_rows = vectors[rows]
+                current = self._matrices.get(mode)
+                self._matrices[mode] = new_rows if current is None else np.vstack([current, new_rows])
+        logger.info(f"📚 few-shot 예시 {len(pending)}개 임베딩 완료 (총 {self.size()}개)")
+
+    async def _ensure_built(self) -> None:
+        """대기 중인 예시 임베딩 (동시 요청은 같은 작업을 공유, 검색 시간 제한으로 중단되지 않음)"""
+        if not self._pending or time.monotonic() < self._retry_at:
+            return
+        loop = asyncio.get_running_loop()
+        task = self._build_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._build_task = loop.create_task(self._embed_pending())
+        await asyncio.shield(task)
+
+    async def _retrieve(self, text: str, mode: EventType) -> List[Dict[str, Any]]:
+        await self._ensure_built()
+
+        with self._lock:
+            matrix = self._matrices.get(mode)
+            examples = self._examples[mode]
+        if matrix is None:
+            return []
+
+        query = await self.openai_service.generate_single_embedding(text)
+        if not query:
+            return []
+
+        scores = matrix @ _normalize(np.asarray(query, dtype=np.float32))
+        k = min(self.k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [examples[i] for i in top if scores[i] >= self.min_similarity]
+
+    async def retrieve(self, text: str, mode: EventType, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        요청 텍스트와 가장 비슷한 예시 상위 k개 (유사도 내림차순)
+
+        임베딩 호출이 실패하거나 시간 제한을 넘기면 예시 없이 진행하도록 빈 목록 반환
+
+        Args:
+            text: 요청 텍스트 (전처리 후)
+            mode: 이벤트 타입
+            timeout: 대기 한도 (초, 없으면 FEW_SHOT_TIMEOUT_SECONDS - 요청 deadline이 더 짧으면 그 값)
+        """
+        if not self.enabled:
+            return []
+        limit = self.timeout if timeout is None else min(timeout, self.timeout)
+        try:
+            return await asyncio.wait_for(self._retrieve(text, mode), timeout=max(limit, 0.0))
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            logger.warning(f"⏱️ few-shot 예시 검색 시간 초과 ({limit:.2f}s) → 예시 없이 진행")
+            return []
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "examples": sum(len(v) for v in self._examples.values()),
+                "pending": len(self._pending),
+                "added": self._added,
+                "retrieve_timeouts": self._timeouts,
+            }
+
+    @staticmethod
+    def format_shots(examples: List[Dict[str, Any]]) -> str:
+        """예시 목록 → 프롬프트 블록 (예시가 없으면 빈 문자열)"""
+        if not examples:
+            return ""
+        # 요청 메시지와 같은 순서 (기준 시각 → 입력) - 출력의 절대 일시가 어느 기준으로 풀렸는지 보여줌
+        blocks = [
+            (f"기준 시각: {e['reference']}\n" if e.get("reference") else "")
+            + f"입력: {e['text'][:_MAX_SHOT_CHARS]}\n출력: {json.dumps(e['output'], ensure_ascii=False)}"
+            for e in examples
+        ]
+        return "참고 예시:\n\n" + "\n\n".join(blocks) + "\n\n"
+
+
+# 전역 인스턴스 (Lazy Loading용)
+_example_bank = None
+
+
+def get_example_bank(openai_service: OpenAIService) -> ExampleBank:
+    global _example_bank
+    if _example_bank is None:
+        _example_bank = ExampleBank(openai_service)
+    return _example_bank
+
+
+def get_example_bank_if_started() -> Optional[ExampleBank]:
+    """이미 생성된 경우에만 반환 (통계용 - OpenAI 클라이언트를 새로 만들지 않음)"""
+    return _example_bank
@@ -0,0 +1,366 @@
+"""
+멀티 프로세스 일괄 분석 워커 풀
+대량 재분석 작업을 user_id 기준으로 샤딩하여 N개 프로세스에 분배합니다.
+같은 사용자의 메시지는 항상 같은 워커의 FIFO 큐로 가므로 사용자별 처리 순서가 보장되고,
+각 워커는 자신만의 EmailAnalyzer/OpenAI 클라이언트를 한 번 만들어 계속 재사용합니다.
+워커마다 크레딧(INGESTION_WORKER_CREDITS, 동시에 맡길 수 있는 메시지 수)만큼만 큐에 넣고
+결과가 돌아오면 반납하므로, 대량 작업이 워커 큐에 한꺼번에 쌓이지 않고 메인 프로세스의
+분석 스케줄러 슬롯(대화형 요청용)도 쓰지 않습니다. 워커 프로세스가 죽으면 맡긴 메시지를
+실패로 처리하고 크레딧을 회수한 뒤 워커를 다시 띄웁니다.
+워커 큐 대기 시간은 스케줄러의 bulk_workers 대기열 지표로 따로 기록됩니다.
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+import uuid
+import zlib
+
+from services.scheduler import get_scheduler
+from utils.date_parser import get_parse_context
+
+logger = logging.getLogger(__name__)
+
+# 완료된 작업 보관 개수 (오래된 작업부터 정리)
+_MAX_FINISHED_JOBS = 50
+
+# 워커 생존 확인 주기 (초)
+_LIVENESS_INTERVAL = 0.5
+
+
+def _worker_main(worker_id: int, inbox: "mp.Queue", outbox: "mp.Queue") -> None:
+    """
+    워커 프로세스 진입점
+
+    메시지: (job_id, seq, user_id, text, mode, sent_at, timezone, event_id, enqueued_at) / 종료: None
+    결과: (worker_id, job_id, seq, ok, payload, elapsed, wait)
+    """
+    from models.schemas import EventType
+    from services.email_analyzer import EmailAnalyzer
+
+    # 워커 전용 이벤트 루프 + 분석기 (프로세스 수명 동안 재사용)
+    loop = asyncio.new_event_loop()
+    try:
+        analyzer = EmailAnalyzer()
+        init_error = None
+    except Exception as e:
+        analyzer = None
+        init_error = str(e)
+
+    while True:
+        message = inbox.get()
+        if message is None:
+            break
+        job_id, seq, user_id, text, mode, sent_at, timezone, event_id, enqueued_at = message
+        started = time.monotonic()
+        # 워커 큐 대기 시간 (bulk_workers 지표) - 프로세스 간이므로 벽시계 기준
+        wait = max(time.time() - enqueued_at, 0.0)
+        try:
+            if analyzer is None:
+                raise RuntimeError(f"분석기 초기화 실패: {init_error}")
+            # 상대 날짜 앵커는 기준일별로 캐시되므로 같은 배치의 메시지들은 계산을 공유
+            context = get_parse_context(datetime.fromisoformat(sent_at) if sent_at else None, timezone)
+            event = loop.run_until_complete(
+                analyzer.analyze(text=text, mode=EventType(mode), user_id=user_id, context=context, lane="bulk")
+            )
+            # 재분석 작업이면 결과를 원본 이벤트와 연결
+            event.id = event_id or event.id
+            outbox.put((worker_id, job_id, seq, True, event.model_dump(mode="json"), time.monotonic() - started, wait))
+        except Exception as e:
+            outbox.put((worker_id, job_id, seq, False, str(e), time.monotonic() - started, wait))
+
+    loop.close()
+
+
+class IngestionJob:
+    """일괄 분석 작업 진행 상황"""
+
+    def __init__(self, job_id: str, total: int, on_result: Optional[Callable[[dict], None]] = None):
+        self.job_id = job_id
+        self.total = total
+        self.on_result = on_result
+        self.done = 0
+        self.failed = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.results: List[Optional[dict]] = [None] * total
+        self.errors: Dict[int, str] = {}
+
+    def to_dict(self, include_results: bool = False) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        data = {
+            "job_id": self.job_id,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "finished": self.finished_at is not None,
+            "elapsed_seconds": round(elapsed, 2),
+            "throughput_per_sec": round((self.done + self.failed) / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+        if include_results:
+            data["results"] = self.results
+            data["errors"] = {str(k): v for k, v in self.errors.items()}
+        return data
+
+
+class IngestionWorkerPool:
+    """
+    user_id 샤딩 기반 프로세스 풀
+
+    - 디스패처: crc32(user_id) % N 으로 워커 선택 (프로세스 재시작에도 동일한 샤드), 워커 크레딧이 있을 때만 큐에 넣음
+    - 수집기 스레드: 결과 큐를 읽어 작업별 진행 상황 갱신 + 크레딧 반납, 죽은 워커의 크레딧 회수 후 재시작
+    """
+
+    def __init__(self, num_workers: int, credits_per_worker: Optional[int] = None):
+        self.num_workers = num_workers
+        # 워커가 처리 중 1건 + 다음 1건을 들고 있도록 (대기 없이 바로 다음 메시지 처리)
+        self.credits_per_worker = max(credits_per_worker or int(os.getenv("INGESTION_WORKER_CREDITS", "2")), 1)
+        self._ctx = mp.get_context("spawn")
+        self._outbox = self._ctx.Queue()
+        self._inboxes: List[Any] = [None] * num_workers
+        self._processes: List[Any] = [None] * num_workers
+        for i in range(num_workers):
+            self._spawn(i)
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._dispatched = [0] * num_workers
+        self._completed = [0] * num_workers
+        self._restarts = [0] * num_workers
+        self._busy_seconds = [0.0] * num_workers
+        # 워커별 맡긴 메시지 (작업 ID, 순번) - 크레딧 사용량이자 워커가 죽었을 때 실패 처리할 목록
+        self._in_flight: List[Dict[Tuple[str, int], None]] = [{} for _ in range(num_workers)]
+        # 크레딧을 기다리는 디스패처 (워커별 최대 1개 - 샤드 잠금으로 직렬화)
+        self._credit_waiters: List[Optional[asyncio.Future]] = [None] * num_workers
+        # 샤드별 디스패치 순서 (작업 제출 순서대로 - 사용자별 순서 유지, 다른 샤드는 서로 막지 않음)
+        self._shard_locks = [asyncio.Lock() for _ in range(num_workers)]
+        self._dispatchers: set = set()
+        self._undispatched = 0
+        self._started_at = time.time()
+        self._closing = False
+        self._stopping = False
+        self._collector = threading.Thread(target=self._collect, name="ingestion-collector", daemon=True)
+        self._collector.start()
+        logger.info(f"🏭 일괄 분석 워커 {num_workers}개 시작 (워커당 크레딧 {self.credits_per_worker})")
+
+    def _spawn(self, worker_id: int) -> None:
+        # 죽은 워커가 읽다 만 큐는 다시 쓰지 않음
+        self._inboxes[worker_id] = self._ctx.Queue()
+        self._processes[worker_id] = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self._inboxes[worker_id], self._outbox),
+            name=f"ingestion-worker-{worker_id}",
+            daemon=True
+        )
+        self._processes[worker_id].start()
+
+    def shard_for(self, user_id: Optional[str]) -> int:
+        return zlib.crc32((user_id or "").encode("utf-8")) % self.num_workers
+
+    def submit(
+        self,
+        messages: List[Dict[str, Any]],
+        on_result: Optional[Callable[[dict], None]] = None
+    ) -> str:
+        """
+        작업 제출 (즉시 반환, 결과는 수집기가 비동기로 반영)
+
+        Args:
+            messages: [{"text", "mode", "user_id", "sent_at", "timezone", "event_id"}, ...] (사용자별 순서대로)
+            on_result: 성공한 결과(Event JSON)마다 수집기 스레드에서 호출 (재분석 결과 저장 등)
+
+        Returns:
+            작업 ID
+        """
+        job = IngestionJob(str(uuid.uuid4()), len(messages), on_result)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished_jobs()
+            if not messages:
+                job.finished_at = time.time()
+            self._undispatched += len(messages)
+        # 샤드별로 나눠 크레딧 대기는 이벤트 루프에서 (제출은 즉시 반환)
+        by_shard: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        for seq, m in enumerate(messages):
+            by_shard.setdefault(self.shard_for(m.get("user_id")), []).append((seq, m))
+        loop = asyncio.get_running_loop() if by_shard else None
+        for shard, items in by_shard.items():
+            task = loop.create_task(self._dispatch(job, shard, items))
+            self._dispatchers.add(task)
+            task.add_done_callback(self._dispatchers.discard)
+        logger.info(f"📦 일괄 분석 작업 제출: {job.job_id} ({job.total}건)")
+        return job.job_id
+
+    async def _dispatch(self, job: IngestionJob, shard: int, items: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """한 샤드의 메시지를 순서대로 워커 큐로 (크레딧이 없으면 결과가 돌아올 때까지 대기)"""
+        async with self._shard_locks[shard]:
+            for seq, m in items:
+                await self._acquire_credit(shard)
+                with self._lock:
+                    self._undispatched -= 1
+                    self._dispatched[shard] += 1
+                    self._in_flight[shard][(job.job_id, seq)] = None
+                    inbox = self._inboxes[shard]
+                inbox.put((
+                    job.job_id, seq, m.get("user_id"), m["text"], m["mode"],
+                    m.get("sent_at"), m.get("timezone"), m.get("event_id"), time.time()
+                ))
+
+    async def _acquire_credit(self, shard: int) -> None:
+        while True:
+            with self._lock:
+                if len(self._in_flight[shard]) < self.credits_per_worker:
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._credit_waiters[shard] = waiter
+            await waiter
+
+    def _release_credit(self, shard: int, key: Tuple[str, int]) -> bool:
+        """크레딧 반납 (수집기 스레드) - 이미 회수된 메시지면 False"""
+        with self._lock:
+            if self._in_flight[shard].pop(key, False) is False:
+                return False
+            waiter, self._credit_waiters[shard] = self._credit_waiters[shard], None
+        if waiter is not None:
+            try:
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                pass  # 이벤트 루프 종료됨
+        return True
+
+    def _evict_finished_jobs(self) -> None:
+        finished = [j for j in self._jobs.values() if j.finished_at is not None]
+        for job in sorted(finished, key=lambda j: j.finished_at)[:max(len(finished) - _MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job.job_id]
+
+    def _collect(self) -> None:
+        checked = time.monotonic()
+        while not self._stopping:
+            if time.monotonic() - checked >= _LIVENESS_INTERVAL:
+                self._reap_dead_workers()
+                checked = time.monotonic()
+            try:
+                worker_id, job_id, seq, ok, payload, elapsed, wait = self._outbox.get(timeout=_LIVENESS_INTERVAL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            if not self._release_credit(worker_id, (job_id, seq)):
+                continue
+            get_scheduler().observe_wait("bulk_workers", wait)
+            with self._lock:
+                self._completed[worker_id] += 1
+                self._busy_seconds[worker_id] += elapsed
+            self._record_result(job_id, seq, ok, payload)
+
+    def _reap_dead_workers(self) -> None:
+        """죽은 워커에 맡긴 메시지를 실패 처리하고 크레딧 회수 후 재시작"""
+        for worker_id, process in enumerate(self._processes):
+            if self._closing or process.is_alive():
+                continue
+            logger.warning(f"⚠️ 일괄 분석 워커 {worker_id} 종료 감지 (exitcode={process.exitcode}) → 재시작")
+            with self._lock:
+                lost = list(self._in_flight[worker_id])
+                self._restarts[worker_id] += 1
+                self._spawn(worker_id)
+            for job_id, seq in lost:
+                if self._release_credit(worker_id, (job_id, seq)):
+                    self._record_result(job_id, seq, False, f"워커 프로세스 종료 (exitcode={process.exitcode})")
+
+    def _record_result(self, job_id: str, seq: int, ok: bool, payload: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if ok:
+                job.done += 1
+                job.results[seq] = payload
+            else:
+                job.failed += 1
+                job.errors[seq] = payload
+            if job.done + job.failed >= job.total:
+                job.finished_at = time.time()
+                logger.info(f"✅ 일괄 분석 작업 완료: {job_id} (성공 {job.done} / 실패 {job.failed})")
+            on_result = job.on_result if ok else None
+        if on_result is not None:
+            try:
+                on_result(payload)
+            except Exception as e:
+                logger.error(f"❌ 일괄 분석 결과 처리 실패: {job_id}#{seq}: {e}", exc_info=True)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict(include_results=True) if job else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """워커별/전체 진행 상황과 처리량"""
+        with self._lock:
+            elapsed = time.time() - self._started_at
+            completed = sum(self._completed)
+            return {
+                "num_workers": self.num_workers,
+                "completed": completed,
+                "in_flight": sum(len(f) for f in self._in_flight),
+                "credits_per_worker": self.credits_per_worker,
+                "waiting_dispatch": self._undispatched,
+                "throughput_per_sec": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+                "workers": [
+                    {
+                        "worker_id": i,
+                        "alive": self._processes[i].is_alive(),
+                        "queued": len(self._in_flight[i]),
+                        "completed": self._completed[i],
+                        "restarts": self._restarts[i],
+                        "avg_latency_ms": round(self._busy_seconds[i] / self._completed[i] * 1000, 1) if self._completed[i] else None,
+                    }
+                    for i in range(self.num_workers)
+                ],
+                "jobs": [j.to_dict() for j in self._jobs.values() if j.finished_at is None],
+            }
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """워커 종료 (큐에 남은 메시지 처리 후 종료)"""
+        self._closing = True
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for p in self._processes:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+        self._stopping = True
+        logger.info("🏭 일괄 분석 워커 종료")
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+# 전역 풀 (Lazy Loading용 - 첫 작업 제출 시 프로세스 생성)
+_ingestion_pool = None
+
+
+def get_ingestion_pool() -> Optional[IngestionWorkerPool]:
+    """
+    워커 풀 지연 로딩
+
+    INGESTION_WORKERS 환경변수로 프로세스 수 지정 (기본: CPU 코어 수, 0이면 비활성화)
+    """
+    global _ingestion_pool
+    if _ingestion_pool is None:
+        num_workers = int(os.getenv("INGESTION_WORKERS", str(os.cpu_count() or 1)))
+        if num_workers <= 0:
+            return None
+        _ingestion_pool = IngestionWorkerPool(num_workers)
+    return _ingestion_pool
+
+
+def get_ingestion_pool_if_started() -> Optional[IngestionWorkerPool]:
+    """이미 시작된 경우에만 반환 (통계/종료 처리용 - 프로세스를 새로 만들지 않음)"""
+    return _ingestion_pool
@@ -3,12 +3,197 @@ OpenAI 서비스
 FSF 프로젝트에서 복사 (필요한 부분만 추출)
 """
 import os
-from typing import List, Dict
-from openai import OpenAI
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from typing import List, Dict, Optional, Any
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_openai import ChatOpenAI
+
+from services.circuit_breaker import get_llm_circuit_breaker
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+class LLMServiceError(Exception):
+    """LLM 호출 실패 (호출 측에서 대체 경로로 처리)"""
+
+
+class PromptCacheStats:
+    """
+    프롬프트 prefix 캐시 적중 통계
+
+    OpenAI usage 데이터의 prompt_tokens_details.cached_tokens 값을 누적하여
+    시스템 프롬프트 prefix가 실제로 캐시되고 있는지 확인합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, usage: Optional[Any]) -> int:
+        """
+        API usage 데이터 기록
+
+        Args:
+            usage: OpenAI 응답의 usage (SDK 객체 또는 dict)
+
+        Returns:
+            이번 요청에서 캐시 적중한 토큰 수
+        """
+        if usage is None:
+            return 0
+        if not isinstance(usage, dict):
+            usage = usage.model_dump()
+
+        details = usage.get("prompt_tokens_details") or {}
+        cached = details.get("cached_tokens") or 0
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += usage.get("prompt_tokens") or 0
+            self.cached_tokens += cached
+        return cached
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 통계 반환"""
+        with self._lock:
+            hit_ratio = self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "hit_ratio": round(hit_ratio, 4),
+            }
+
+
+# 프로세스 전역 통계 (Agent/직접 호출 공용)
+_prompt_cache_stats = PromptCacheStats()
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    return _prompt_cache_stats
+
+
+class PromptCacheCallbackHandler(BaseCallbackHandler):
+    """LLM 호출마다 usage의 cached_tokens를 통계에 기록"""
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        usage = (response.llm_output or {}).get("token_usage")
+        cached = _prompt_cache_stats.record(usage)
+        if cached:
+            logger.info(f"♻️ 프롬프트 prefix 캐시 적중: {cached} tokens")
+
+
+class HedgeStats:
+    """hedging 통계 (두 번째 요청을 보낸 횟수 / 두 번째 요청이 먼저 도착한 횟수)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, hedged: bool = False, hedge_won: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self.hedged += hedged
+            self.hedge_wins += hedge_won
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "hedged": self.hedged, "hedge_wins": self.hedge_wins}
+
+
+_hedge_stats = HedgeStats()
+
+
+def get_hedge_stats() -> HedgeStats:
+    return _hedge_stats
+
+
+# hedge 요청 전용 스레드 (Agent 스레드가 첫 요청을 기다리는 동안 두 번째 요청을 실행)
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            # Agent 스레드마다 요청 2개까지 동시에 나갈 수 있음
+            workers = 2 * int(os.getenv("AGENT_POOL_SIZE", "4"))
+            _hedge_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-hedge")
+        return _hedge_executor
+
+
+class HedgedChatOpenAI(ChatOpenAI):
+    """
+    Agent용 ChatOpenAI (LLM 호출마다 응답 시간 기록 + 선택적 hedging)
+
+    hedging이 켜져 있고 첫 요청이 최근 p95 응답 시간(최소 hedge_min_delay)을 넘기면
+    같은 요청을 한 번 더 보내고 먼저 도착한 응답을 사용합니다.
+    동기 HTTP 호출은 중간에 끊을 수 없으므로 늦은 쪽은 끝까지 실행되고 결과만 버립니다.
+    """
+
+    hedge_enabled: bool = False
+    hedge_min_delay: float = 1.0
+
+    def _timed_generate(self, messages, stop, run_manager, **kwargs):
+        started = time.monotonic()
+        result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        get_llm_circuit_breaker().latency.record(time.monotonic() - started)
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        p95 = get_llm_circuit_breaker().latency.percentile(0.95) if self.hedge_enabled else None
+        if p95 is None or self.streaming:
+            result = self._timed_generate(messages, stop, run_manager, **kwargs)
+            _hedge_stats.record()
+            return result
+
+        executor = _get_hedge_executor()
+        first = executor.submit(self._timed_generate, messages, stop, run_manager, **kwargs)
+        try:
+            result = first.result(timeout=max(p95, self.hedge_min_delay))
+            _hedge_stats.record()
+            return result
+        except FutureTimeoutError:
+            pass
+
+        second = executor.submit(self._timed_generate, messages, stop, run_manager, **kwargs)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    _hedge_stats.record(hedged=True, hedge_won=future is second)
+                    return future.result()
+        # 두 요청 모두 실패
+        _hedge_stats.record(hedged=True)
+        raise first.exception()
+
+
+def create_chat_llm(temperature: float = 0.7) -> HedgedChatOpenAI:
+    """채팅 LLM 생성 (Agent/직접 호출 공용 - LLM_HEDGE_ENABLED면 p95를 넘긴 호출에 두 번째 요청)"""
+    return HedgedChatOpenAI(
+        model=os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"),
+        temperature=temperature,
+        # SDK 재시도가 길어지면 circuit breaker/hedging이 반응하지 못하므로 제한
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+        hedge_enabled=os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true",
+        hedge_min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "1.0")),
+        callbacks=[PromptCacheCallbackHandler()]
+    )
+
 
 class OpenAIService:
     """OpenAI API 서비스 래퍼"""
@@ -18,54 +203,75 @@ class OpenAIService:
         if not api_key:
             raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
 
+        # base_url은 OPENAI_BASE_URL 환경변수로 변경 가능 (로컬 테스트 서버 등)
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
+        self.circuit_breaker = get_llm_circuit_breaker()
+        self._chat_llm: Optional[HedgedChatOpenAI] = None
         self.chat_model = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
         self.embedding_model = os.getenv(
             "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
         )
 
+    def _get_chat_llm(self) -> HedgedChatOpenAI:
+        """채팅 LLM 지연 로딩 (Agent와 같은 hedging/응답 시간 기록 경로)"""
+        if self._chat_llm is None:
+            self._chat_llm = create_chat_llm()
+        return self._chat_llm
+
     async def generate_chat_response(
         self, 
         messages: List[Dict[str, str]], 
         temperature: float = 0.7,
         max_tokens: int = 1000
     ) -> str:
-        """채팅 응답 생성"""
+        """
+        채팅 응답 생성 (Circuit Breaker + hedging)
+        
+        Raises:
+            CircuitOpenError: Circuit이 열려 있음 (호출하지 않음)
+            LLMServiceError: API 호출 실패
+        """
+        self.circuit_breaker.before_call()
+        llm = self._get_chat_llm()
         try:
-            response = self.client.chat.completions.create(
-                model=self.chat_model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
+            # 동기 호출(hedge 포함)이므로 스레드에서 실행 - 응답 시간은 HedgedChatOpenAI가 기록
+            message = await asyncio.to_thread(
+                llm.invoke, messages, temperature=temperature, max_tokens=max_tokens
             )
-            return response.choices[0].message.content
-
+        except asyncio.CancelledError:
+            self.circuit_breaker.release()
+            raise
         except Exception as e:
-            print(f"OpenAI 채팅 응답 생성 오류: {e}")
-            return "죄송합니다. 응답을 생성하는 중 오류가 발생했습니다."
+            self.circuit_breaker.record_failure()
+            logger.error(f"❌ OpenAI 채팅 응답 생성 오류: {e}", exc_info=True)
+            raise LLMServiceError(str(e)) from e
+
+        self.circuit_breaker.record_success()
+        return message.content
 
     async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """텍스트 임베딩 생성"""
+        """텍스트 임베딩 생성 (비동기 클라이언트 - 이벤트 루프를 막지 않음)"""
         try:
-            response = self.client.embeddings.create(
+            response = await self.async_client.embeddings.create(
                 model=self.embedding_model, input=texts
             )
             return [data.embedding for data in response.data]
 
         except Exception as e:
-            print(f"OpenAI 임베딩 생성 오류: {e}")
+            logger.error(f"❌ OpenAI 임베딩 생성 오류: {e}", exc_info=True)
             return []
 
     async def generate_single_embedding(self, text: str) -> List[float]:
         """단일 텍스트 임베딩 생성"""
         try:
-            response = self.client.embeddings.create(
+            response = await self.async_client.embeddings.create(
                 model=self.embedding_model, input=[text]
             )
             return response.data[0].embedding
 
         except Exception as e:
-            print(f"OpenAI 단일 임베딩 생성 오류: {e}")
+            logger.error(f"❌ OpenAI 단일 임베딩 생성 오류: {e}", exc_info=True)
             return []
 
     def count_tokens(self, text: str) -> int:
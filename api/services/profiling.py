@@ -0,0 +1,258 @@
+"""
+운영 환경 프로파일링 (관리자 전용, 기본 비활성화)
+지연이 튈 때 시간이 LangChain Agent 루프 / pydantic 검증 / 날짜 정규식 / 동기 OpenAI 호출 중
+어디에 쓰이는지 확인하기 위한 도구입니다.
+
+- 요청 단위 프로파일: X-Profile 헤더로 트리거
+  - cprofile: 이벤트 루프 스레드의 결정적 프로파일 (.prof - snakeviz/flameprof 호환)
+  - sample: 모든 스레드 스택을 주기적으로 샘플링 (folded stacks - flamegraph.pl/speedscope 호환)
+- 이벤트 루프 블로킹 감지: 콜백 하나가 임계값보다 오래 루프를 점유하면 그 시점의 스택을 로그로 남김
+"""
+from collections import Counter, OrderedDict, deque
+from typing import Any, Dict, List, Optional
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import secrets
+import sys
+import threading
+import time
+import traceback
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _folded_stack(frame) -> str:
+    """프레임 → 'root;...;leaf' (folded stacks 형식)"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    샘플링 프로파일러 (별도 스레드에서 sys._current_frames()를 주기적으로 수집)
+
+    요청 처리 중 모든 스레드를 샘플링하므로 Agent 스레드 풀에서 실행되는
+    LangChain/OpenAI 동기 호출도 함께 잡힙니다. (스택 앞에 스레드 이름을 붙임)
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.samples[f"{names.get(thread_id, thread_id)};{_folded_stack(frame)}"] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """최근 프로파일 보관 (개수 제한, 오래된 것부터 삭제)"""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def add(self, mode: str, path: str, elapsed: float, data: bytes) -> str:
+        profile_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._profiles[profile_id] = {
+                "id": profile_id,
+                "mode": mode,
+                "path": path,
+                "elapsed_ms": round(elapsed * 1000, 1),
+                "created_at": time.time(),
+                "size": len(data),
+                "data": data,
+            }
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{k: v for k, v in p.items() if k != "data"} for p in reversed(self._profiles.values())]
+
+
+class LoopBlockDetector:
+    """
+    이벤트 루프 블로킹 감지기
+
+    루프에 주기적으로 heartbeat 콜백을 예약하고, 감시 스레드가 마지막 heartbeat 이후
+    임계값보다 오래 지났으면 루프 스레드의 현재 스택을 로그로 남깁니다.
+    (asyncio debug 모드의 slow_callback_duration과 달리 운영 중 상시 켜둘 수 있을 만큼 가벼움)
+    """
+
+    def __init__(self, threshold_ms: float, max_reports: int = 20):
+        self.threshold = threshold_ms / 1000
+        self.interval = min(self.threshold / 2, 0.1)
+        self.blocked_count = 0
+        self.reports: deque = deque(maxlen=max_reports)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        loop.call_soon(self._beat)
+        self._thread = threading.Thread(target=self._watch, name="loop-block-detector", daemon=True)
+        self._thread.start()
+        logger.info(f"🩺 이벤트 루프 블로킹 감지 시작 (임계값 {self.threshold * 1000:.0f}ms)")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        if not self._stop.is_set():
+            self._loop.call_later(self.interval, self._beat)
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            # 같은 정지 구간은 한 번만 보고
+            if stalled < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "(스택 없음)"
+            self.blocked_count += 1
+            self.reports.append({
+                "detected_at": time.time(),
+                "blocked_ms": round(stalled * 1000, 1),
+                "stack": stack,
+            })
+            logger.warning(f"🐢 이벤트 루프 블로킹 {stalled * 1000:.0f}ms 이상 감지:\n{stack}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "blocked_count": self.blocked_count,
+            "recent": list(self.reports),
+        }
+
+
+class Profiler:
+    """
+    프로파일링 설정 및 상태
+
+    - PROFILING_ENABLED: true일 때만 동작 (기본 false)
+    - PROFILING_ADMIN_TOKEN: X-Admin-Token 헤더와 일치해야 프로파일/조회 허용
+    - PROFILING_SAMPLE_INTERVAL_MS: 샘플링 주기 (기본 5ms)
+    - PROFILING_MAX_PROFILES: 보관 개수 (기본 20)
+    - LOOP_BLOCK_THRESHOLD_MS: 루프 블로킹 감지 임계값 (0이면 비활성화, 기본 100ms)
+    """
+
+    def __init__(self):
+        self.admin_token = os.getenv("PROFILING_ADMIN_TOKEN", "")
+        # 토큰 없이 켜면 누구나 프로파일을 걸 수 있으므로 토큰이 있어야 활성화
+        self.enabled = os.getenv("PROFILING_ENABLED", "false").lower() == "true" and bool(self.admin_token)
+        self.sample_interval_ms = float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", "5"))
+        self.store = ProfileStore(int(os.getenv("PROFILING_MAX_PROFILES", "20")))
+        threshold_ms = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+        self.loop_detector = LoopBlockDetector(threshold_ms) if self.enabled and threshold_ms > 0 else None
+        # 루프 스레드에는 프로파일 훅이 하나만 걸리므로 cProfile은 동시에 한 요청만
+        self._cprofile_lock = threading.Lock()
+
+    def is_admin(self, token: Optional[str]) -> bool:
+        return self.enabled and token is not None and secrets.compare_digest(token, self.admin_token)
+
+    def start_cprofile(self) -> Optional[cProfile.Profile]:
+        """cProfile 시작 (이미 다른 요청을 프로파일 중이면 None)"""
+        if not self._cprofile_lock.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish_cprofile(self, profile: cProfile.Profile, path: str, elapsed: float) -> str:
+        profile.disable()
+        self._cprofile_lock.release()
+        profile.create_stats()
+        return self.store.add("cprofile", path, elapsed, marshal.dumps(profile.stats))
+
+    def start_sampler(self) -> StackSampler:
+        sampler = StackSampler(self.sample_interval_ms)
+        sampler.start()
+        return sampler
+
+    def finish_sampler(self, sampler: StackSampler, path: str, elapsed: float) -> str:
+        sampler.stop()
+        return self.store.add("sample", path, elapsed, sampler.folded().encode("utf-8"))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "profiles": self.store.list(),
+            "loop_block": self.loop_detector.snapshot() if self.loop_detector else None,
+        }
+
+
+class _LoadedStats:
+    """pstats.Stats에 넘기기 위한 저장된 통계 래퍼 (create_stats 인터페이스만 제공)"""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def cprofile_text(data: bytes, limit: int = 50) -> str:
+    """저장된 cProfile 통계 → 누적 시간 상위 함수 텍스트 리포트"""
+    out = io.StringIO()
+    pstats.Stats(_LoadedStats(marshal.loads(data)), stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+# 전역 인스턴스 (Lazy Loading용)
+_profiler = None
+
+
+def get_profiler() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
@@ -0,0 +1,308 @@
+"""
+분석 작업 우선순위 스케줄러
+분석기 앞단에서 동시 실행 수를 제한하고, 대기 중인 작업을 트래픽 종류별 레인으로 나눠
+가중 공정 큐잉(WFQ)으로 내보냅니다. 대량 임포트가 쌓여 있어도 대화형 요청은 가중치만큼
+슬롯을 보장받고, 같은 레인 안에서는 긴급도가 높은 작업이 먼저 나갑니다.
+
+- 레인: interactive(화면에서 직접 요청) / webhook(외부 연동) / bulk(일괄 분석)
+- WFQ: 레인마다 가상 시각(pass)을 두고 가장 작은 레인부터 내보낸 뒤 1/가중치만큼 증가
+  (쉬던 레인은 현재 가상 시각으로 맞춰 밀린 몫을 한꺼번에 가져가지 못하게 함)
+- 긴급도: 키워드("긴급", "장애", "ASAP" 등) + 가까운 일시 표현을 날짜 문법으로 사전 검사 (LLM 호출 없음)
+- 슬롯은 이 프로세스의 실제 분석(Agent 실행)만 감쌈 (일괄 분석 워커는 별도 프로세스라 워커 크레딧으로 제한)
+- 레인별 대기 시간(p50/p95/p99/max)을 /api/stats로 내보내 SLO 추적
+  (스케줄러 밖의 대기열 - 일괄 분석 워커 큐 등 - 은 queues에 따로 기록)
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import re
+import threading
+
+from utils.date_parser import DateMention, ParseContext, contains_date_expression, find_date_mentions, get_parse_context
+
+logger = logging.getLogger(__name__)
+
+LANES = ("interactive", "webhook", "bulk")
+
+_DEFAULT_WEIGHTS = "interactive=8,webhook=3,bulk=1"
+
+# 긴급 키워드 (하나라도 있으면 가산)
+_URGENT_PATTERN = re.compile(
+    r"긴급|급히|급해|급합니다|급한|장애|즉시|지금\s*바로|당장|오늘\s*중|마감\s*임박|asap|urgent",
+    re.IGNORECASE
+)
+_KEYWORD_SCORE = 0.6
+# 가까운 일시 (가장 이른 후보 기준)
+_NEAR_TERM_SCORES = ((24 * 3600, 0.4), (72 * 3600, 0.2))
+
+# 레인별 대기 시간 표본 수 (백분위 계산용)
+_WAIT_SAMPLES = 1024
+
+
+class SchedulerQueueFullError(Exception):
+    """레인 대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+def estimate_urgency(
+    text: str,
+    context: Optional[ParseContext] = None,
+    mentions: Optional[List[DateMention]] = None
+) -> float:
+    """
+    분석 전 긴급도 사전 검사 (0~1)
+
+    Args:
+        text: 원문
+        context: 날짜 파싱 기준 (없으면 DEFAULT_TIMEZONE의 현재 시각)
+        mentions: 이미 찾은 날짜 표현 (있으면 다시 찾지 않고 후보 순위 계산과 공유)
+
+    Returns:
+        긴급도 (키워드 0.6 + 24시간 이내 일시 0.4 / 72시간 이내 0.2)
+    """
+    score = _KEYWORD_SCORE if _URGENT_PATTERN.search(text) else 0.0
+    # 날짜 힌트가 없으면 후보 추출 자체를 건너뜀
+    if mentions is None and contains_date_expression(text):
+        context = context or get_parse_context()
+        mentions = find_date_mentions(text, context)
+    if mentions:
+        context = context or get_parse_context()
+        upcoming = [((m.pm_value or m.value) - context.now).total_seconds() for m in mentions]
+        upcoming = [s for s in upcoming if s >= 0]
+        if upcoming:
+            soonest = min(upcoming)
+            score += next((bonus for limit, bonus in _NEAR_TERM_SCORES if soonest <= limit), 0.0)
+    return min(score, 1.0)
+
+
+def _parse_weights(value: str) -> Dict[str, float]:
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() in LANES and weight.strip():
+            weights[name.strip()] = max(float(weight), 0.01)
+    return {lane: weights.get(lane, 1.0) for lane in LANES}
+
+
+class LaneStats:
+    """레인별 대기 시간 통계 (수집기 스레드에서도 기록하므로 잠금 사용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits: deque = deque(maxlen=_WAIT_SAMPLES)
+        self.admitted = 0
+        self.rejected = 0
+        self.urgent = 0
+        self.max_wait = 0.0
+
+    def observe(self, wait: float, urgent: bool = False) -> None:
+        with self._lock:
+            self._waits.append(wait)
+            self.admitted += 1
+            self.urgent += urgent
+            self.max_wait = max(self.max_wait, wait)
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            data = {
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "urgent": self.urgent,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+            }
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            data[f"wait_{name}_ms"] = round(waits[min(int(len(waits) * q), len(waits) - 1)] * 1000, 1) if waits else None
+        return data
+
+
+class _Lane:
+    __slots__ = ("name", "weight", "heap", "pass_value", "stats")
+
+    def __init__(self, name: str, weight: float):
+        self.name = name
+        self.weight = weight
+        # (-긴급도, 순번, future, 대기 시작 시각)
+        self.heap: list = []
+        self.pass_value = 0.0
+        self.stats = LaneStats()
+
+
+class PriorityScheduler:
+    """
+    레인별 WFQ 스케줄러 (이벤트 루프 안에서만 호출)
+
+    - SCHEDULER_CONCURRENCY: 동시에 분석 중인 작업 수 (기본 AGENT_POOL_SIZE)
+    - SCHEDULER_WEIGHTS: 레인 가중치 (기본 interactive=8,webhook=3,bulk=1)
+    - SCHEDULER_QUEUE_LIMIT: 레인별 대기 가능한 작업 수 (초과 시 SchedulerQueueFullError)
+    - SCHEDULER_URGENT_THRESHOLD: 이 이상이면 긴급 작업으로 집계 (기본 0.6)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        weights: Optional[Dict[str, float]] = None,
+        queue_limit: int = 64,
+        urgent_threshold: float = 0.6
+    ):
+        self.concurrency = concurrency
+        self.queue_limit = queue_limit
+        self.urgent_threshold = urgent_threshold
+        weights = weights or _parse_weights(_DEFAULT_WEIGHTS)
+        self._lanes = {name: _Lane(name, weights[name]) for name in LANES}
+        self._free = concurrency
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        # 스케줄러 밖 대기열의 대기 시간 (이름 → 통계, 수집기 스레드에서 기록)
+        self._queues: Dict[str, LaneStats] = {}
+        self._queues_lock = threading.Lock()
+
+    def _backlogged(self):
+        return [lane for lane in self._lanes.values() if lane.heap]
+
+    def _dispatch(self) -> None:
+        """빈 슬롯이 있는 동안 가상 시각이 가장 작은 레인의 가장 긴급한 작업을 깨움"""
+        loop_time = None
+        while self._free > 0:
+            backlogged = self._backlogged()
+            if not backlogged:
+                return
+            lane = min(backlogged, key=lambda l: l.pass_value)
+            _, _, future, enqueued = heapq.heappop(lane.heap)
+            if future.done():
+                # 기다리다 취소된 작업
+                continue
+            self._virtual_time = lane.pass_value
+            lane.pass_value += 1.0 / lane.weight
+            self._free -= 1
+            loop_time = loop_time or asyncio.get_running_loop().time()
+            future.set_result(loop_time - enqueued)
+
+    async def _acquire(self, lane_name: str, urgency: float) -> None:
+        lane = self._lanes[lane_name]
+        urgent = urgency >= self.urgent_threshold
+
+        # 대기 중인 작업이 없으면 바로 실행
+        if self._free > 0 and not self._backlogged():
+            self._free -= 1
+            self._virtual_time = max(self._virtual_time, lane.pass_value)
+            lane.pass_value = self._virtual_time + 1.0 / lane.weight
+            lane.stats.observe(0.0, urgent)
+            return
+
+        if len(lane.heap) >= self.queue_limit:
+            lane.stats.reject()
+            raise SchedulerQueueFullError(f"{lane_name} 레인 대기열 포화 ({len(lane.heap)}/{self.queue_limit})")
+
+        if not lane.heap:
+            # 쉬던 레인이 밀린 몫을 한꺼번에 가져가지 않도록 현재 가상 시각으로 맞춤
+            lane.pass_value = max(lane.pass_value, self._virtual_time)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(lane.heap, (-urgency, next(self._seq), future, loop.time()))
+
+        try:
+            wait = await future
+        except asyncio.CancelledError:
+            # 슬롯을 받은 직후 취소되었다면 돌려줌 (아직 대기 중이었다면 _dispatch가 건너뜀)
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        lane.stats.observe(wait, urgent)
+
+    def _release(self) -> None:
+        self._free += 1
+        self._dispatch()
+
+    async def acquire(self, lane: str = "interactive", urgency: float = 0.0) -> None:
+        """
+        실행 슬롯 획득 (반납은 release - 다른 곳에서 끝나는 작업용, 보통은 slot 사용)
+
+        Args:
+            lane: interactive / webhook / bulk
+            urgency: estimate_urgency 결과 (같은 레인 안에서 높을수록 먼저)
+
+        Raises:
+            SchedulerQueueFullError: 레인 대기열 포화
+        """
+        if lane not in self._lanes:
+            raise ValueError(f"알 수 없는 레인: {lane}")
+        await self._acquire(lane, urgency)
+
+    def release(self) -> None:
+        """acquire로 받은 슬롯 반납 (이벤트 루프 스레드에서 호출)"""
+        self._release()
+
+    @asynccontextmanager
+    async def slot(self, lane: str = "interactive", urgency: float = 0.0) -> AsyncIterator[None]:
+        """
+        실행 슬롯 획득 (대기 후 블록 안의 분석을 실행하고 끝나면 반납)
+
+        Args:
+            lane: interactive / webhook / bulk
+            urgency: estimate_urgency 결과 (같은 레인 안에서 높을수록 먼저)
+
+        Raises:
+            SchedulerQueueFullError: 레인 대기열 포화
+        """
+        await self.acquire(lane, urgency)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def observe_wait(self, queue: str, wait: float, urgency: float = 0.0) -> None:
+        """
+        스케줄러 밖의 대기열(일괄 분석 워커 큐 등) 대기 시간 기록
+
+        레인 대기 시간과 섞이지 않도록 레인 이름은 받지 않음 (snapshot의 queues에 따로 표시)
+        """
+        if queue in self._lanes:
+            raise ValueError(f"레인 대기 시간은 스케줄러가 직접 기록합니다: {queue}")
+        with self._queues_lock:
+            stats = self._queues.setdefault(queue, LaneStats())
+        stats.observe(wait, urgency >= self.urgent_threshold)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """레인별 가중치/대기 수/대기 시간 지표"""
+        return {
+            "concurrency": self.concurrency,
+            "running": self.concurrency - self._free,
+            "queue_limit": self.queue_limit,
+            "lanes": {
+                lane.name: {
+                    "weight": lane.weight,
+                    "queued": sum(1 for item in lane.heap if not item[2].done()),
+                    **lane.stats.snapshot(),
+                }
+                for lane in self._lanes.values()
+            },
+            "queues": {name: stats.snapshot() for name, stats in list(self._queues.items())},
+        }
+
+
+# 전역 인스턴스 (Lazy Loading용)
+_scheduler = None
+
+
+def get_scheduler() -> PriorityScheduler:
+    """스케줄러 지연 로딩 (환경변수로 동시 실행 수/가중치/대기열 설정)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = PriorityScheduler(
+            concurrency=int(os.getenv("SCHEDULER_CONCURRENCY", os.getenv("AGENT_POOL_SIZE", "4"))),
+            weights=_parse_weights(os.getenv("SCHEDULER_WEIGHTS", _DEFAULT_WEIGHTS)),
+            queue_limit=int(os.getenv("SCHEDULER_QUEUE_LIMIT", "64")),
+            urgent_threshold=float(os.getenv("SCHEDULER_URGENT_THRESHOLD", "0.6")),
+        )
+        weights = ", ".join(f"{l.name}={l.weight:g}" for l in _scheduler._lanes.values())
+        logger.info(f"🚦 분석 스케줄러 생성: concurrency={_scheduler.concurrency}, weights={weights}")
+    return _scheduler
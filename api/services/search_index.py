@@ -0,0 +1,195 @@
+"""
+이벤트 전문 검색 인덱스 (In-process Inverted Index)
+한국어는 형태소 분석 없이도 부분 일치가 되도록 글자 bigram + unigram 단위로 색인하고,
+영문/숫자는 단어 단위로 색인합니다. BM25로 점수를 매깁니다.
+스냅샷에서 복원한 경우 mmap 역색인을 기본 계층으로 두고, 이후 변경만 메모리에 색인합니다.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import math
+import re
+import threading
+
+_WORD_PATTERN = re.compile(r'[가-힣]+|[a-z0-9]+')
+_HANGUL_PATTERN = re.compile(r'[가-힣]')
+
+# 색인 토큰 규칙 버전 (스냅샷 역색인이 현재 규칙으로 만들어졌는지 확인용)
+TOKENIZER_VERSION = 2
+
+# BM25 파라미터
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str, unigrams: bool = False) -> List[str]:
+    """
+    검색용 토큰 분리
+
+    - 한글 단어: 글자 bigram ("김철수" → "김철", "철수"), 한 글자 단어는 그대로
+    - 영문/숫자 단어: 소문자 단어 그대로
+
+    Args:
+        text: 원본 텍스트
+        unigrams: 한글 글자 unigram도 포함 (색인 시 사용 - 한 글자 질의 "김"도 일치하도록)
+
+    Returns:
+        토큰 리스트 (중복 포함)
+    """
+    tokens: List[str] = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if _HANGUL_PATTERN.match(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+            if unigrams:
+                tokens.extend(word)
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class SearchIndex:
+    """
+    증분 업데이트 가능한 역색인
+
+    문서 추가/삭제 비용은 해당 문서의 토큰 수에만 비례하며,
+    검색은 질의 토큰의 posting list만 확인합니다.
+    기본 계층(스냅샷)의 문서는 삭제/교체 시 제외 목록에만 추가합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_tokens: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        # 스냅샷 기본 계층 (MappedSnapshot) + 제외된 레코드 번호
+        self._base = None
+        self._base_removed: Set[int] = set()
+
+    def __len__(self) -> int:
+        base_docs = len(self._base) - len(self._base_removed) if self._base is not None else 0
+        return len(self._doc_tokens) + base_docs
+
+    @staticmethod
+    def term_counts(texts: Iterable[Optional[str]]) -> Counter:
+        """색인 대상 텍스트 → 토큰별 빈도 (스냅샷 생성에도 같은 기준 사용)"""
+        return Counter(tokenize(" ".join(t for t in texts if t), unigrams=True))
+
+    def attach_base(self, snapshot) -> None:
+        """스냅샷 역색인을 기본 계층으로 사용 (기존 메모리 색인은 유지)"""
+        with self._lock:
+            self._base = snapshot
+            self._base_removed = set()
+            self._total_length += snapshot.total_length
+
+    def add(self, doc_id: str, texts: Iterable[str]) -> None:
+        """문서 색인 (같은 id가 있으면 교체)"""
+        counts = self.term_counts(texts)
+        with self._lock:
+            self._remove_locked(doc_id)
+            for token, tf in counts.items():
+                self._postings.setdefault(token, {})[doc_id] = tf
+            length = sum(counts.values())
+            self._doc_tokens[doc_id] = counts
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+
+    def remove(self, doc_id: str) -> None:
+        """문서 색인 제거"""
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: str) -> None:
+        counts = self._doc_tokens.pop(doc_id, None)
+        if counts is None:
+            self._remove_base_locked(doc_id)
+            return
+        for token in counts:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[token]
+        self._total_length -= self._doc_lengths.pop(doc_id, 0)
+
+    def _remove_base_locked(self, doc_id: str) -> None:
+        if self._base is None:
+            return
+        rec = self._base.find(doc_id)
+        if rec is not None and rec not in self._base_removed:
+            self._base_removed.add(rec)
+            self._total_length -= self._base.doc_length(rec)
+
+    def _base_doc_freq_locked(self, span: Tuple[int, int]) -> int:
+        """기본 계층 문서 빈도 (제외된 레코드 빼고)"""
+        removed = sum(1 for rec in self._base_removed if self._base.posting_tf(span, rec) is not None)
+        return span[1] - removed
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[str, float]], int]:
+        """
+        검색 (모든 질의 토큰을 포함하는 문서만, BM25 점수 내림차순)
+
+        Args:
+            query: 검색어
+            limit: 페이지 크기
+            offset: 시작 위치
+
+        Returns:
+            ([(doc_id, score), ...], 전체 결과 수)
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return [], 0
+
+        with self._lock:
+            # 메모리 계층과 기본 계층은 문서가 겹치지 않음 (기본 계층 문서를 갱신하면 제외 목록에 들어감)
+            postings = [self._postings.get(token, {}) for token in query_tokens]
+            spans = [self._base.posting_span(token) if self._base is not None else (0, 0) for token in query_tokens]
+            doc_freqs = [
+                len(posting) + (self._base_doc_freq_locked(span) if span[1] else 0)
+                for posting, span in zip(postings, spans)
+            ]
+            if not all(doc_freqs):
+                return [], 0
+
+            # 가장 짧은 posting list부터 교집합
+            order = sorted(range(len(query_tokens)), key=doc_freqs.__getitem__)
+            candidates: Set[str] = set(postings[order[0]])
+            for i in order[1:]:
+                candidates.intersection_update(postings[i])
+
+            # 기본 계층: 가장 짧은 posting만 디코딩하고 나머지 토큰은 후보별 이진 탐색 (id는 남은 후보만 디코딩)
+            base_candidates: Dict[int, List[int]] = {}
+            if spans[order[0]][1]:
+                base_candidates = {rec: [tf] for rec, tf in self._base.postings(query_tokens[order[0]])}
+                for rec in self._base_removed.intersection(base_candidates):
+                    del base_candidates[rec]
+                for i in order[1:]:
+                    for rec, tfs in list(base_candidates.items()):
+                        tf = self._base.posting_tf(spans[i], rec)
+                        if tf is None:
+                            del base_candidates[rec]
+                        else:
+                            tfs.append(tf)
+
+            if not candidates and not base_candidates:
+                return [], 0
+
+            n_docs = len(self)
+            avg_length = self._total_length / n_docs if n_docs else 0.0
+            idfs = [math.log(1 + (n_docs - doc_freqs[i] + 0.5) / (doc_freqs[i] + 0.5)) for i in order]
+
+            def score(tfs: Iterable[int], length: int) -> float:
+                norm = _K1 * (1 - _B + _B * length / avg_length) if avg_length else _K1
+                return sum(idf * tf * (_K1 + 1) / (tf + norm) for idf, tf in zip(idfs, tfs))
+
+            scored = [
+                (doc_id, score((postings[i][doc_id] for i in order), self._doc_lengths[doc_id]))
+                for doc_id in candidates
+            ]
+            scored.extend(
+                (self._base.record_id(rec), score(tfs, self._base.doc_length(rec)))
+                for rec, tfs in base_candidates.items()
+            )
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[offset:offset + limit], len(scored)
@@ -0,0 +1,89 @@
+"""
+웜업(사전 초기화) 상태 관리
+배포 직후 첫 요청이 분석기/LLM 클라이언트/Agent 생성 비용을 떠안지 않도록
+시작 시점에 미리 만들어 두고, 준비 상태를 readiness 엔드포인트로 노출합니다.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """
+    웜업 진행 상태
+
+    - disabled: 웜업 비활성화 (지연 로딩 모드)
+    - pending → warming → warm / failed
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true"
+        self.blocking = os.getenv("WARMUP_BLOCKING", "false").lower() == "true"
+        self.state = "pending" if self.enabled else "disabled"
+        self.steps: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """트래픽을 받아도 되는 상태인지 (웜업 비활성화 시 항상 True)"""
+        return self.state in ("disabled", "warm")
+
+    def run(self, steps: List[Tuple[str, Callable[[], Any]]]) -> None:
+        """
+        웜업 단계 순차 실행 (단계별 소요 시간 기록)
+
+        Args:
+            steps: [(단계 이름, 실행 함수), ...]
+        """
+        with self._lock:
+            if self.state in ("warming", "warm"):
+                return
+            self.state = "warming"
+            self.started_at = time.time()
+
+        logger.info("🔥 웜업 시작")
+        for name, fn in steps:
+            started = time.monotonic()
+            try:
+                fn()
+            except Exception as e:
+                with self._lock:
+                    self.state = "failed"
+                    self.error = f"{name}: {e}"
+                    self.finished_at = time.time()
+                logger.error(f"❌ 웜업 실패 ({name}): {e}", exc_info=True)
+                return
+            self.steps[name] = round((time.monotonic() - started) * 1000, 1)
+            logger.info(f"🔥 웜업 단계 완료: {name} ({self.steps[name]}ms)")
+
+        with self._lock:
+            self.state = "warm"
+            self.finished_at = time.time()
+        logger.info(f"✅ 웜업 완료 ({round(self.finished_at - self.started_at, 2)}s)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "state": self.state,
+                "steps_ms": dict(self.steps),
+                "error": self.error,
+            }
+
+
+# 전역 상태 (Lazy Loading용)
+_warmup_state = None
+
+
+def get_warmup_state() -> WarmupState:
+    global _warmup_state
+    if _warmup_state is None:
+        _warmup_state = WarmupState()
+    return _warmup_state
@@ -0,0 +1,183 @@
+"""
+Write-behind 배치 저장 버퍼
+이벤트를 한 건씩 커밋하지 않고 N건 또는 M밀리초마다 모아서 한 트랜잭션으로 저장합니다.
+조회용 메모리 뷰는 요청 안에서 즉시 갱신되므로 생성한 요청은 자기 쓰기를 바로 읽을 수 있고,
+영속화만 뒤에서 배치로 처리됩니다.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBufferFullError(Exception):
+    """버퍼가 가득 차서 대기 시간 내에 공간이 나지 않음"""
+
+
+class WriteBehindBuffer:
+    """
+    배치 저장 버퍼 (전용 flusher 스레드)
+
+    - batch_size건이 쌓이거나 flush_interval_ms가 지나면 flush_fn(rows) 호출
+    - max_pending 초과 시 put()은 공간이 날 때까지 대기 (backpressure_timeout 초과 시 예외)
+    - close() 시 남은 행을 모두 저장
+    - 삭제/교체는 supersede로 같은 큐 뒤에 기록 (이전 행보다 먼저 저장되지 않고, 잠금을 I/O 동안 잡지 않음)
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Any]], None],
+        batch_size: int = 50,
+        flush_interval_ms: int = 200,
+        max_pending: int = 1000,
+        backpressure_timeout: float = 5.0
+    ):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self.backpressure_timeout = backpressure_timeout
+        self._cond = threading.Condition()
+        self._pending: List[Any] = []
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._flushed_rows = 0
+        self._flushed_batches = 0
+        self._failed_batches = 0
+        self._backpressure_waits = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def _wait_for_capacity(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: len(self._pending) < self.max_pending or self._closed,
+                timeout=timeout
+            )
+
+    async def put(self, row: Any) -> None:
+        """
+        행 추가 (버퍼가 가득 차면 공간이 날 때까지 대기)
+
+        Raises:
+            WriteBufferFullError: backpressure_timeout 내에 공간이 나지 않음
+        """
+        deadline = time.monotonic() + self.backpressure_timeout
+        waited = False
+        while True:
+            # 공간 확인과 추가를 한 번의 잠금 안에서 (동시에 깨어난 put들이 한도를 넘기지 않도록)
+            with self._cond:
+                if self._closed:
+                    raise WriteBufferFullError("버퍼가 종료되었습니다")
+                if len(self._pending) < self.max_pending:
+                    self._ensure_started()
+                    self._pending.append(row)
+                    if len(self._pending) >= self.batch_size:
+                        self._cond.notify_all()
+                    return
+                if not waited:
+                    self._backpressure_waits += 1
+                    waited = True
+
+            # 가득 찬 경우에만 별도 스레드에서 대기 (이벤트 루프 블로킹 방지)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not await asyncio.to_thread(self._wait_for_capacity, remaining):
+                raise WriteBufferFullError(f"쓰기 버퍼 포화 ({self.max_pending}건)")
+
+    def supersede(self, row_id: str, row: Any) -> int:
+        """
+        같은 id의 대기 중인 행을 새 행(갱신본 또는 삭제 표시)으로 대체 (이벤트 루프에서 바로 호출 가능)
+
+        대기 중인 이전 행은 버리고 새 행을 큐 끝에 추가합니다. 이미 저장 중인 배치에 든 이전 행은
+        그대로 저장되지만, 새 행은 그 배치가 끝난 뒤의 배치에서 저장되므로 항상 뒤에 기록됩니다.
+        I/O를 기다리지 않고, 버려진 자리를 채우는 것이므로 backpressure 대기도 하지 않습니다.
+
+        Returns:
+            버려진 이전 행 수
+        """
+        with self._cond:
+            if self._closed:
+                raise WriteBufferFullError("버퍼가 종료되었습니다")
+            self._ensure_started()
+            before = len(self._pending)
+            self._pending = [r for r in self._pending if getattr(r, "id", None) != row_id]
+            dropped = before - len(self._pending)
+            self._pending.append(row)
+            self._cond.notify_all()
+            return dropped
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.batch_size]
+                closed = self._closed
+
+            ok = self._flush_batch(batch) if batch else True
+
+            if not ok:
+                # 실패한 배치는 버퍼에 남겨두고 다음 주기에 재시도 (대기는 잠금 밖에서)
+                time.sleep(self.flush_interval)
+            elif not batch and closed:
+                return
+
+    def _flush_batch(self, batch: List[Any]) -> bool:
+        try:
+            self.flush_fn(batch)
+        except Exception as e:
+            with self._cond:
+                self._failed_batches += 1
+                closed = self._closed
+            logger.error(f"❌ 배치 저장 실패 ({len(batch)}건): {e}", exc_info=True)
+            if closed:
+                # 종료 중에는 무한 재시도하지 않음
+                self._remove_rows(batch)
+                logger.error(f"❌ 종료 중 저장 실패로 {len(batch)}건 유실")
+                return True
+            return False
+
+        self._remove_rows(batch)
+        with self._cond:
+            self._flushed_rows += len(batch)
+            self._flushed_batches += 1
+        return True
+
+    def _remove_rows(self, batch: List[Any]) -> None:
+        # flush 중 supersede로 빠진 행이 있을 수 있으므로 위치가 아닌 객체 기준으로 제거
+        with self._cond:
+            batch_ids = {id(row) for row in batch}
+            self._pending = [row for row in self._pending if id(row) not in batch_ids]
+            self._cond.notify_all()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """남은 행을 모두 저장하고 flusher 종료"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        logger.info(f"💾 쓰기 버퍼 종료 (누적 {self._flushed_rows}건 / {self._flushed_batches}배치)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "max_pending": self.max_pending,
+                "batch_size": self.batch_size,
+                "flush_interval_ms": int(self.flush_interval * 1000),
+                "flushed_rows": self._flushed_rows,
+                "flushed_batches": self._flushed_batches,
+                "failed_batches": self._failed_batches,
+                "backpressure_waits": self._backpressure_waits,
+            }
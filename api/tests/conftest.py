@@ -0,0 +1,33 @@
+"""테스트 공용 설정 (api/를 import 경로에 추가 + 가짜 OpenAI 서버)"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from tests.fake_openai import FakeOpenAI  # noqa: E402
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """가짜 OpenAI 서버 + 전역 LLM 객체 초기화 (테스트마다 새 breaker/Agent)"""
+    import agents.event_agent as event_agent
+    import services.circuit_breaker as circuit_breaker
+    import services.example_bank as example_bank
+    import services.openai_service as openai_service
+
+    server = FakeOpenAI().start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("LLM_MAX_RETRIES", "0")
+    monkeypatch.setattr(circuit_breaker, "_llm_circuit_breaker", None)
+    monkeypatch.setattr(event_agent, "_llm", None)
+    monkeypatch.setattr(event_agent, "_openai_service", None)
+    monkeypatch.setattr(event_agent, "_base_agents", {})
+    monkeypatch.setattr(example_bank, "_example_bank", None)
+    monkeypatch.setattr(openai_service, "_hedge_stats", openai_service.HedgeStats())
+    try:
+        yield server
+    finally:
+        server.stop()
@@ -0,0 +1,100 @@
+"""
+테스트용 가짜 OpenAI 서버 (지연/오류 주입)
+
+OPENAI_BASE_URL을 이 서버로 지정하면 SDK/LangChain 클라이언트가 그대로 붙습니다.
+요청마다 script 앞에서부터 동작(지연, 상태 코드, 응답 내용)을 하나씩 꺼내 쓰고,
+비어 있으면 default 동작을 사용합니다. 임베딩 요청은 embedding_delay만큼 늦게 응답합니다.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import threading
+import time
+
+DEFAULT_CONTENT = 'Final Answer: {"customer_name": "김철수", "datetime": null, "description": "미팅"}'
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.default: Dict[str, Any] = {"delay": 0.0, "status": 200, "content": DEFAULT_CONTENT}
+        self.script: List[Dict[str, Any]] = []
+        self.embedding_delay = 0.0
+        self.chat_requests = 0
+        self.embedding_requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self) -> "FakeOpenAI":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_behavior(self) -> Dict[str, Any]:
+        with self._lock:
+            self.chat_requests += 1
+            behavior = self.script.pop(0) if self.script else {}
+        return {**self.default, **behavior}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path.endswith("/embeddings"):
+                    with fake._lock:
+                        fake.embedding_requests += 1
+                    time.sleep(fake.embedding_delay)
+                    self._send(200, _embedding_response(request))
+                    return
+
+                behavior = fake._next_behavior()
+                time.sleep(behavior["delay"])
+                if behavior["status"] != 200:
+                    self._send(behavior["status"], {"error": {"message": "injected failure", "type": "server_error"}})
+                    return
+                self._send(200, _chat_response(request, behavior["content"]))
+
+        return Handler
+
+
+def _chat_response(request: Dict[str, Any], content: str) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "fake"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def _embedding_response(request: Dict[str, Any]) -> Dict[str, Any]:
+    inputs: Optional[Any] = request.get("input")
+    texts = inputs if isinstance(inputs, list) else [inputs]
+    data = []
+    for i, text in enumerate(texts):
+        digest = hashlib.sha256(str(text).encode("utf-8")).digest()
+        data.append({"object": "embedding", "index": i, "embedding": [b / 255 for b in digest[:8]]})
+    return {"object": "list", "data": data, "model": request.get("model", "fake"), "usage": {"prompt_tokens": 1, "total_tokens": 1}}
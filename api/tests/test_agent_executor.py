@@ -0,0 +1,68 @@
+"""Agent 전용 실행 풀 (대기열 포화 → 503, deadline 초과 시 협조적 취소)"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+import services.agent_executor as agent_executor
+from models.schemas import EventType
+from services.agent_executor import AgentExecutorPool, AgentQueueFullError, AgentTimeoutError
+
+
+def test_submit_beyond_queue_limit_is_rejected():
+    pool = AgentExecutorPool(max_workers=1, queue_limit=1, default_timeout=5)
+    gate = threading.Event()
+
+    async def run():
+        running = [asyncio.create_task(pool.submit(lambda cancel: gate.wait(5))) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(AgentQueueFullError):
+            await pool.submit(lambda cancel: None)
+        gate.set()
+        await asyncio.gather(*running)
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
+    snapshot = pool.snapshot()
+    assert (snapshot["rejected"], snapshot["completed"]) == (1, 2)
+
+
+def test_deadline_signals_cancellation_to_running_job():
+    pool = AgentExecutorPool(max_workers=1, queue_limit=0)
+    cancelled = threading.Event()
+
+    def job(cancel: threading.Event):
+        # 취소 신호를 받으면 바로 종료하는 협조적 작업
+        if cancel.wait(5):
+            cancelled.set()
+
+    with pytest.raises(AgentTimeoutError):
+        asyncio.run(pool.submit(job, timeout=0.1))
+    assert cancelled.wait(1)
+    pool.shutdown()
+    assert pool.snapshot()["timeouts"] == 1
+
+
+def test_agent_queue_full_maps_to_503(fake_openai, monkeypatch):
+    from agents.event_agent import EventAgent
+
+    monkeypatch.setenv("FEW_SHOT_K", "0")
+    monkeypatch.setattr(agent_executor, "_agent_pool", AgentExecutorPool(max_workers=1, queue_limit=0, default_timeout=10))
+    fake_openai.default = {**fake_openai.default, "delay": 0.5}
+    agent = EventAgent()
+
+    async def run():
+        first = asyncio.create_task(agent.analyze("김철수 고객님 미팅 요청", EventType.WORK))
+        await asyncio.sleep(0.2)
+        with pytest.raises(HTTPException) as exc:
+            await agent.analyze("이영희 고객님 미팅 요청", EventType.WORK)
+        await first
+        return exc.value
+
+    error = asyncio.run(run())
+    agent_executor._agent_pool.shutdown()
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "5"
@@ -0,0 +1,18 @@
+"""CompactEvent (메모리 측정 / dict 왕복)"""
+from benchmarks.event_memory import _compact, _dict_row, _pydantic, measure
+from models.compact_event import CompactEvent
+
+
+def test_compact_event_uses_less_memory_than_dict_rows():
+    dict_bytes = measure(_dict_row, 2000)
+    compact_bytes = measure(_compact, 2000)
+    event_bytes = measure(_pydantic, 2000)
+    assert compact_bytes < dict_bytes / 2
+    assert event_bytes > dict_bytes
+
+
+def test_dict_round_trip():
+    row = _dict_row(7)
+    event = CompactEvent.from_dict(row)
+    assert event.to_dict()["start_time"] == row["start_time"]
+    assert CompactEvent.from_dict(event.to_dict()).to_dict() == event.to_dict()
@@ -0,0 +1,45 @@
+"""날짜/시각 표현 추출과 후보 순위"""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from services.candidate_ranker import rank_candidates
+from utils.date_parser import find_date_mentions, get_parse_context, parse_time
+
+SEOUL = ZoneInfo("Asia/Seoul")
+CONTEXT = get_parse_context(datetime(2026, 10, 19, 10, 0, tzinfo=SEOUL), "Asia/Seoul")
+
+
+def test_weekday_annotation_is_part_of_the_date():
+    for text in ("10월 22일(목) 오후 3시 미팅", "10월 22일 (목요일) 오후 3시 미팅", "10월 22일 목요일 오후 3시 미팅"):
+        mentions = find_date_mentions(text, CONTEXT)
+        assert len(mentions) == 1, text
+        assert mentions[0].kind == "month_day"
+        assert mentions[0].value == datetime(2026, 10, 22, 15, 0, tzinfo=SEOUL)
+        assert mentions[0].text.endswith("오후 3시")
+
+
+def test_time_of_day_words():
+    assert parse_time("새벽 3시") == (3, 0)
+    assert parse_time("아침 8시 반") == (8, 30)
+    assert parse_time("점심 1시") == (13, 0)
+    assert parse_time("저녁 7시") == (19, 0)
+    assert parse_time("밤 9시") == (21, 0)
+    assert parse_time("밤 1시") == (1, 0)
+    # 시간대 표현이 없으면 적힌 그대로
+    assert parse_time("3시") == (3, 0)
+
+
+def test_ambiguous_hour_prefers_afternoon_only_in_ranking():
+    mentions = find_date_mentions("목요일 3시에 뵙겠습니다", CONTEXT)
+    assert mentions[0].value.hour == 3 and mentions[0].pm_value.hour == 15
+
+    assert rank_candidates(mentions)[0].datetime == datetime(2026, 10, 22, 15, 0, tzinfo=SEOUL)
+    # LLM이 오전으로 읽었으면 그 해석과 일치하는 후보
+    early = rank_candidates(mentions, llm_datetime=datetime(2026, 10, 22, 3, 0, tzinfo=SEOUL))
+    assert (early[0].datetime.hour, early[0].source) == (3, "both")
+
+
+def test_explicit_early_morning_is_not_shifted():
+    mentions = find_date_mentions("내일 새벽 3시 서버 점검", CONTEXT)
+    assert mentions[0].pm_value is None
+    assert rank_candidates(mentions)[0].datetime == datetime(2026, 10, 20, 3, 0, tzinfo=SEOUL)
@@ -0,0 +1,58 @@
+"""대시보드 증분 집계 (다음 예정 이벤트 heap)"""
+from datetime import datetime, timedelta, timezone
+
+from models.compact_event import CompactEvent
+from services.database import DatabaseService
+from services.event_aggregates import EventAggregates
+
+NOW = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _event(event_id: str, hours: float, rrule=None) -> CompactEvent:
+    return CompactEvent(id=event_id, start_ts=int(NOW + hours * 3600), rrule=rrule)
+
+
+def test_reschedule_then_delete_does_not_resurrect_the_event():
+    aggregates = EventAggregates()
+    original = _event("a", 1)
+    aggregates.add(original)
+    aggregates.add(_event("b", 5))
+
+    # 재분석으로 시각이 바뀌면 이전 시각의 heap 항목은 무효
+    moved = _event("a", 10)
+    aggregates.remove(original)
+    aggregates.add(moved)
+    assert aggregates.next_upcoming_id(NOW) == "b"
+
+    aggregates.remove(moved)
+    assert aggregates.next_upcoming_id(NOW) == "b"
+    assert aggregates.next_upcoming_id(NOW + 6 * 3600) is None
+    assert aggregates.total == 1
+
+
+def test_recurring_event_is_ordered_by_its_next_occurrence():
+    aggregates = EventAggregates()
+    # 첫 발생은 일주일 전이지만 매일 반복 → 다음 발생은 오늘 10:00
+    aggregates.add(_event("daily", 1 - 7 * 24, rrule="FREQ=DAILY"))
+    aggregates.add(_event("single", 3))
+
+    assert aggregates.next_upcoming(NOW) == (NOW + 3600, "daily")
+    # 지나면 다음 날 발생으로 다시 정렬
+    assert aggregates.next_upcoming(NOW + 2 * 3600) == (NOW + 3 * 3600, "single")
+    assert aggregates.next_upcoming(NOW + 4 * 3600) == (NOW + 25 * 3600, "daily")
+
+
+def test_summary_reports_next_occurrence_of_recurring_snapshot_record(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_SNAPSHOT_PATH", str(tmp_path / "events.snap"))
+    db = DatabaseService()
+    for event in list(db.iter_events()):
+        db.delete_event(event.id)
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=30, hours=-1)
+    created = db.create_event({"summary": "데일리 스크럼", "start_time": start.isoformat(), "recurrence": "FREQ=DAILY"})
+    db.save_snapshot()
+
+    _, upcoming = DatabaseService().get_summary()
+
+    event, occurrence = upcoming
+    assert event.id == created.id
+    assert timedelta(0) < occurrence - datetime.now(timezone.utc) <= timedelta(days=1)
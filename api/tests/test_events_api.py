@@ -0,0 +1,42 @@
+"""POST /api/events 요청 검증 (JSON / multipart)"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers.events import router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+def _text_errors(response):
+    return [e for e in response.json()["detail"] if e["loc"] == ["body", "text"]]
+
+
+@pytest.mark.parametrize("data", [{"mode": "work"}, {"mode": "work", "text": "  "}])
+def test_form_without_text_or_attachments_is_rejected(client, data):
+    # attachments가 아닌 빈 파일 필드는 multipart로 보내기 위한 것
+    response = client.post("/api/events", data=data, files=[("unused", ("", b""))])
+    assert response.status_code == 422
+    assert _text_errors(response)[0]["type"] == "missing"
+
+
+def test_json_without_text_is_rejected_the_same_way(client):
+    response = client.post("/api/events", json={"mode": "work"})
+    assert response.status_code == 422
+    assert _text_errors(response)[0]["type"] == "missing"
+
+
+def test_attachment_without_text_is_accepted(client, fake_openai, monkeypatch):
+    monkeypatch.setenv("FEW_SHOT_K", "0")
+    response = client.post(
+        "/api/events",
+        data={"mode": "work"},
+        files=[("attachments", ("notice.txt", "제출 마감: 2026-10-30 18:00".encode("utf-8"), "text/plain"))],
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["event"]["extracted_fields"]["attachments"][0]["filename"] == "notice.txt"
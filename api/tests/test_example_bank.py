@@ -0,0 +1,107 @@
+"""few-shot 예시 은행 (확정 예시 추가 / 예시 검색 시간 제한)"""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+
+from models.schemas import EventType
+from services.example_bank import _SEED_EXAMPLES, ExampleBank, get_example_bank
+from services.openai_service import OpenAIService
+
+_TEXT = "김철수 고객님, 2026-10-22 15:00 미팅 확인 부탁드립니다."
+_CONFIRMED = 'Final Answer: {"customer_name": "김철수", "datetime": "2026-10-22 15:00", "description": "미팅 확인"}'
+
+
+def test_slow_embedding_skips_shots_within_timeout(fake_openai, monkeypatch):
+    monkeypatch.setenv("FEW_SHOT_TIMEOUT_SECONDS", "0.2")
+    fake_openai.embedding_delay = 1.0
+    bank = get_example_bank(OpenAIService())
+
+    started = time.monotonic()
+    shots = asyncio.run(bank.retrieve(_TEXT, EventType.WORK))
+
+    assert shots == []
+    assert time.monotonic() - started < 0.8
+    assert bank.snapshot()["retrieve_timeouts"] == 1
+
+
+def test_agent_deadline_bounds_example_retrieval(fake_openai, monkeypatch):
+    from services.email_analyzer import EmailAnalyzer
+
+    monkeypatch.setenv("FEW_SHOT_TIMEOUT_SECONDS", "0.3")
+    fake_openai.embedding_delay = 2.0
+    analyzer = EmailAnalyzer()
+
+    started = time.monotonic()
+    event = asyncio.run(analyzer.analyze("김철수 클라이언트 미팅 요청", EventType.WORK))
+
+    # 임베딩이 느려도 예시 없이 LLM 호출로 진행
+    assert time.monotonic() - started < 1.5
+    assert event.customer_name == "김철수"
+    assert fake_openai.chat_requests == 1
+
+
+def test_confirmed_extraction_is_added_once_and_retrieved(fake_openai):
+    from services.email_analyzer import EmailAnalyzer
+
+    fake_openai.default = {**fake_openai.default, "content": _CONFIRMED}
+    analyzer = EmailAnalyzer()
+    bank = get_example_bank(analyzer.openai_service)
+
+    async def run():
+        first = await analyzer.analyze(_TEXT, EventType.WORK)
+        # 같은 메시지를 다시 분석해도 예시는 한 번만 추가
+        await analyzer.analyze(_TEXT, EventType.WORK)
+        return first, await bank.retrieve(_TEXT, EventType.WORK)
+
+    event, shots = asyncio.run(run())
+
+    assert event.candidates[0].source == "both" and not event.needs_review
+    assert bank.snapshot()["added"] == 1
+    assert shots[0]["output"] == {"customer_name": "김철수", "datetime": "2026-10-22 15:00", "description": "미팅 확인"}
+
+
+def test_low_confidence_extraction_is_not_added(fake_openai):
+    from services.email_analyzer import EmailAnalyzer
+
+    # LLM만 일시를 냈고 원문 문법과 일치하지 않음 → 확정 예시로 쓰지 않음
+    fake_openai.default = {**fake_openai.default, "content": _CONFIRMED}
+    analyzer = EmailAnalyzer()
+    asyncio.run(analyzer.analyze("김철수 고객님 미팅 확인 부탁드립니다.", EventType.WORK))
+
+    assert get_example_bank(analyzer.openai_service).snapshot()["added"] == 0
+
+
+def test_seed_shots_use_the_prompt_datetime_format_with_reference():
+    for example in _SEED_EXAMPLES:
+        datetime.strptime(example["output"]["datetime"], "%Y-%m-%d %H:%M")
+        assert example["reference"]
+
+    block = ExampleBank.format_shots(_SEED_EXAMPLES[:1])
+    assert block.startswith("참고 예시:\n\n기준 시각: 2026-10-19 10:00 (월요일, Asia/Seoul)\n입력: ")
+    assert '"datetime": "2026-10-27 14:00"' in block
+
+
+def test_confirmed_example_is_written_off_the_event_loop(fake_openai, tmp_path, monkeypatch):
+    from services.email_analyzer import EmailAnalyzer
+
+    path = tmp_path / "examples.jsonl"
+    monkeypatch.setenv("EXAMPLE_BANK_PATH", str(path))
+    fake_openai.default = {**fake_openai.default, "content": _CONFIRMED}
+    analyzer = EmailAnalyzer()
+    bank = get_example_bank(analyzer.openai_service)
+    writers = []
+    add_example = bank.add_example
+
+    def recording_add_example(*args, **kwargs):
+        writers.append(threading.current_thread())
+        return add_example(*args, **kwargs)
+
+    monkeypatch.setattr(bank, "add_example", recording_add_example)
+    asyncio.run(analyzer.analyze(_TEXT, EventType.WORK))
+
+    assert writers and writers[0] is not threading.main_thread()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["output"]["datetime"] == "2026-10-22 15:00"
+    assert saved["reference"].endswith("요일, Asia/Seoul)")
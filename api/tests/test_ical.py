@@ -0,0 +1,54 @@
+"""iCalendar 피드 (반복 일정 TZID/VTIMEZONE, UNTIL 형식)"""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from models.compact_event import CompactEvent
+from utils.ical import iter_calendar
+
+LA = ZoneInfo("America/Los_Angeles")
+
+
+def _ts(*args, tz=LA) -> int:
+    return int(datetime(*args, tzinfo=tz).timestamp())
+
+
+def _unfold(feed: str) -> list:
+    return feed.replace("\r\n ", "").split("\r\n")
+
+
+def test_recurring_event_uses_tzid_and_utc_until():
+    weekly = CompactEvent(
+        id="weekly",
+        summary="스터디",
+        start_ts=_ts(2026, 10, 20, 14, 0),
+        end_ts=_ts(2026, 10, 20, 15, 0),
+        rrule="FREQ=WEEKLY;BYDAY=TU;UNTIL=20261215T235959",
+        timezone="America/Los_Angeles",
+    )
+    other = CompactEvent(id="other", start_ts=_ts(2026, 11, 3, 9, 0), rrule="FREQ=DAILY", timezone="America/Los_Angeles")
+    single = CompactEvent(id="single", start_ts=_ts(2026, 10, 22, 15, 0), timezone="America/Los_Angeles")
+
+    lines = _unfold("".join(iter_calendar([weekly, other, single])))
+
+    assert "DTSTART;TZID=America/Los_Angeles:20261020T140000" in lines
+    assert "DTEND;TZID=America/Los_Angeles:20261020T150000" in lines
+    # TZID 시작 시각이면 UNTIL은 UTC (floating UNTIL은 이벤트 타임존 기준으로 변환)
+    assert "RRULE:FREQ=WEEKLY;BYDAY=TU;UNTIL=20261216T075959Z" in lines
+    # 단건 일정은 UTC 그대로
+    assert "DTSTART:20261022T220000Z" in lines
+    # 참조하는 TZID마다 VTIMEZONE 한 번, 첫 사용 VEVENT보다 앞에
+    assert lines.count("TZID:America/Los_Angeles") == 1
+    assert lines.index("TZID:America/Los_Angeles") < lines.index("UID:weekly@show-me-the-data")
+    vtimezone = lines[lines.index("TZID:America/Los_Angeles"):lines.index("END:VTIMEZONE")]
+    assert "DTSTART:20261101T020000" in vtimezone
+    assert vtimezone[vtimezone.index("DTSTART:20261101T020000") + 1:][:2] == ["TZOFFSETFROM:-0700", "TZOFFSETTO:-0800"]
+
+
+def test_recurring_event_without_timezone_uses_default():
+    seoul = ZoneInfo("Asia/Seoul")
+    event = CompactEvent(id="daily", start_ts=_ts(2026, 10, 20, 9, 0, tz=seoul), rrule="FREQ=DAILY")
+
+    lines = _unfold("".join(iter_calendar([event])))
+
+    assert "DTSTART;TZID=Asia/Seoul:20261020T090000" in lines
+    assert "TZOFFSETTO:+0900" in lines
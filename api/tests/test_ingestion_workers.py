@@ -0,0 +1,110 @@
+"""멀티 프로세스 일괄 분석 워커 (샤딩, 워커 크레딧, 워커 종료 복구)"""
+import asyncio
+import time
+
+import pytest
+
+import services.scheduler as scheduler_module
+from services.ingestion_workers import IngestionWorkerPool
+from services.scheduler import get_scheduler
+
+
+@pytest.fixture
+def worker_env(fake_openai, monkeypatch):
+    monkeypatch.setenv("FEW_SHOT_K", "0")
+    monkeypatch.setattr(scheduler_module, "_scheduler", None)
+    return fake_openai
+
+
+async def _wait_finished(pool: IngestionWorkerPool, job_id: str, timeout: float = 60) -> dict:
+    deadline = time.monotonic() + timeout
+    while not pool.get_job(job_id)["finished"]:
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.05)
+    return pool.get_job(job_id)
+
+
+def _messages(count: int, user_id: str = "u1"):
+    return [{"text": f"김철수 고객님 자료 정리 {i}", "mode": "work", "user_id": user_id} for i in range(count)]
+
+
+def test_bulk_dispatch_uses_worker_credits_not_scheduler_slots(worker_env):
+    pool = IngestionWorkerPool(1, credits_per_worker=1)
+
+    async def main():
+        job_id = pool.submit(_messages(3))
+        # 크레딧이 하나뿐이므로 첫 메시지만 워커로 가고 나머지는 디스패처에서 대기
+        await asyncio.sleep(0.1)
+        assert pool.snapshot()["waiting_dispatch"] == 2
+        return await _wait_finished(pool, job_id)
+
+    try:
+        job = asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert job["done"] == 3, job["errors"]
+    snapshot = get_scheduler().snapshot()
+    # 메인 프로세스의 분석 슬롯(대화형 요청용)은 쓰지 않음
+    assert snapshot["lanes"]["bulk"]["admitted"] == 0
+    assert snapshot["running"] == 0
+    assert snapshot["queues"]["bulk_workers"]["admitted"] == 3
+
+
+def test_dead_worker_credits_are_reclaimed_and_worker_restarts(worker_env):
+    worker_env.default = {**worker_env.default, "delay": 1.0}
+    pool = IngestionWorkerPool(1, credits_per_worker=2)
+
+    async def main():
+        job_id = pool.submit(_messages(3))
+        await asyncio.sleep(0.5)
+        assert pool.snapshot()["in_flight"] == 2
+        pool._processes[0].kill()
+        first = await _wait_finished(pool, job_id)
+        worker_env.default = {**worker_env.default, "delay": 0.0}
+        second = await _wait_finished(pool, pool.submit(_messages(1)))
+        return first, second
+
+    try:
+        first, second = asyncio.run(main())
+        snapshot = pool.snapshot()
+    finally:
+        pool.shutdown()
+
+    # 죽은 워커에 맡긴 2건은 실패, 대기 중이던 1건과 이후 작업은 재시작된 워커에서 처리
+    assert (first["done"], first["failed"]) == (1, 2)
+    assert all("워커 프로세스 종료" in e for e in first["errors"].values())
+    assert second["done"] == 1
+    assert snapshot["workers"][0]["restarts"] == 1
+    assert snapshot["in_flight"] == 0
+
+
+def test_messages_are_sharded_by_crc32_of_user_id_in_order(worker_env):
+    import zlib
+
+    users = [f"user-{n}" for n in range(6)]
+    messages = [
+        {"text": f"{u} 고객님 자료 정리 {i}", "mode": "work", "user_id": u, "event_id": f"{u}#{i}"}
+        for i in range(3) for u in users
+    ]
+    expected_shard = {u: zlib.crc32(u.encode("utf-8")) % 2 for u in users}
+    pool = IngestionWorkerPool(2)
+    seen = []
+
+    async def main():
+        return await _wait_finished(pool, pool.submit(messages, on_result=lambda r: seen.append(r["id"])))
+
+    try:
+        job = asyncio.run(main())
+        snapshot = pool.snapshot()
+    finally:
+        pool.shutdown()
+
+    assert job["done"] == len(messages), job["errors"]
+    # 샤드는 crc32(user_id) % N (프로세스/인스턴스가 바뀌어도 동일)
+    assert {u: pool.shard_for(u) for u in users} == expected_shard
+    for worker in snapshot["workers"]:
+        assert worker["completed"] == 3 * sum(1 for s in expected_shard.values() if s == worker["worker_id"])
+    # 같은 사용자의 메시지는 같은 워커 FIFO 큐에서 제출 순서대로 처리
+    for u in users:
+        assert [e for e in seen if e.startswith(f"{u}#")] == [f"{u}#{i}" for i in range(3)]
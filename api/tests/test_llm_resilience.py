@@ -0,0 +1,131 @@
+"""LLM circuit breaker / hedging (가짜 OpenAI 서버로 지연·오류 주입)"""
+import asyncio
+import time
+
+import pytest
+
+from models.schemas import EventType
+from services.circuit_breaker import get_llm_circuit_breaker
+from services.openai_service import HedgedChatOpenAI, LLMServiceError, OpenAIService, get_hedge_stats
+
+
+def _hedged_llm(**kwargs) -> HedgedChatOpenAI:
+    return HedgedChatOpenAI(model="gpt-4o-mini", max_retries=0, **kwargs)
+
+
+def _warm_latency(seconds: float) -> None:
+    breaker = get_llm_circuit_breaker()
+    for _ in range(breaker.latency.min_samples):
+        breaker.latency.record(seconds)
+
+
+def test_hedge_wins_when_first_attempt_exceeds_p95(fake_openai):
+    _warm_latency(0.05)
+    fake_openai.script = [
+        {"delay": 2.0, "content": "slow"},
+        {"delay": 0.0, "content": "fast"},
+    ]
+    llm = _hedged_llm(hedge_enabled=True, hedge_min_delay=0.1)
+
+    started = time.monotonic()
+    answer = llm.invoke("안녕하세요").content
+    elapsed = time.monotonic() - started
+
+    assert answer == "fast"
+    assert elapsed < 1.5
+    assert fake_openai.chat_requests == 2
+    assert get_hedge_stats().snapshot() == {"calls": 1, "hedged": 1, "hedge_wins": 1}
+
+
+def test_no_hedge_below_p95_or_without_samples(fake_openai):
+    llm = _hedged_llm(hedge_enabled=True, hedge_min_delay=0.1)
+    # p95 표본이 없으면 hedging하지 않음 (지연이 있어도 한 번만 요청)
+    fake_openai.script = [{"delay": 0.3, "content": "only"}]
+    assert llm.invoke("안녕하세요").content == "only"
+    assert fake_openai.chat_requests == 1
+
+    _warm_latency(0.5)
+    assert llm.invoke("안녕하세요").content.startswith("Final Answer")
+    assert fake_openai.chat_requests == 2
+    assert get_hedge_stats().snapshot()["hedged"] == 0
+
+
+def test_hedging_disabled_records_latency_only(fake_openai):
+    fake_openai.script = [{"delay": 0.2, "content": "slow"}]
+    _warm_latency(0.01)
+    llm = _hedged_llm(hedge_enabled=False)
+    assert llm.invoke("안녕하세요").content == "slow"
+    assert fake_openai.chat_requests == 1
+    assert get_llm_circuit_breaker().latency.percentile(1.0) >= 0.2
+
+
+def test_breaker_opens_and_falls_back_to_rule_based(fake_openai, monkeypatch):
+    from services.email_analyzer import EmailAnalyzer
+
+    monkeypatch.setenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "2")
+    monkeypatch.setenv("FEW_SHOT_K", "0")
+    fake_openai.default = {**fake_openai.default, "status": 500}
+    analyzer = EmailAnalyzer()
+    text = "김철수 고객님, 2026-10-22 15:00 미팅 확인 부탁드립니다."
+
+    async def run():
+        return [await analyzer.analyze(text, EventType.WORK) for _ in range(3)]
+
+    failed_1, failed_2, fallback = asyncio.run(run())
+
+    assert "error" in failed_1.extracted_fields and "error" in failed_2.extracted_fields
+    assert get_llm_circuit_breaker().state == "open"
+    # open 이후 요청은 LLM을 호출하지 않고 규칙 기반 추출로 대체
+    assert fake_openai.chat_requests == 2
+    assert fallback.extracted_fields["fallback"] == "rule_based"
+    assert fallback.customer_name == "김철수"
+    assert fallback.datetime is not None and fallback.datetime.hour == 15
+
+
+def test_rule_based_fallback_reads_time_of_day_per_mention(fake_openai):
+    from datetime import datetime
+    from services.email_analyzer import EmailAnalyzer
+    from utils.date_parser import find_date_mentions, get_parse_context
+
+    analyzer = EmailAnalyzer()
+    context = get_parse_context(datetime(2026, 10, 19, 10, 0), "Asia/Seoul")
+
+    def fallback(text):
+        return analyzer._extract_rule_based(text, find_date_mentions(text, context))["datetime"]
+
+    assert fallback("이영희님, 10월 22일(목) 저녁 7시에 뵙겠습니다.") == "2026-10-22 19:00"
+    assert fallback("10월 23일 아침 8시 회의, 회신은 오후에 드릴게요.") == "2026-10-23 08:00"
+    assert fallback("내일 오전 10시 미팅입니다. 오후 일정은 비워 두세요.") == "2026-10-20 10:00"
+    assert fallback("10/24 발표 자료 공유") == "2026-10-24"
+
+
+def test_agent_path_uses_fake_provider(fake_openai, monkeypatch):
+    from services.email_analyzer import EmailAnalyzer
+
+    monkeypatch.setenv("FEW_SHOT_K", "0")
+    event = asyncio.run(EmailAnalyzer().analyze("김철수 클라이언트 미팅 요청", EventType.WORK))
+
+    assert event.customer_name == "김철수"
+    assert fake_openai.chat_requests == 1
+    assert get_llm_circuit_breaker().state == "closed"
+
+
+def test_direct_chat_response_shares_hedge_and_breaker(fake_openai, monkeypatch):
+    monkeypatch.setenv("LLM_HEDGE_ENABLED", "true")
+    monkeypatch.setenv("LLM_HEDGE_MIN_DELAY_SECONDS", "0.1")
+    monkeypatch.setenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "1")
+    _warm_latency(0.05)
+    fake_openai.script = [
+        {"delay": 2.0, "content": "slow"},
+        {"delay": 0.0, "content": "fast"},
+        {"status": 500},
+    ]
+    service = OpenAIService()
+    messages = [{"role": "user", "content": "안녕하세요"}]
+
+    assert asyncio.run(service.generate_chat_response(messages)) == "fast"
+    assert get_hedge_stats().snapshot()["hedge_wins"] == 1
+
+    with pytest.raises(LLMServiceError):
+        asyncio.run(service.generate_chat_response(messages))
+    assert get_llm_circuit_breaker().state == "open"
@@ -0,0 +1,53 @@
+"""관리자 프로파일링 (토큰 검증, cProfile 동시 실행 거절)"""
+import pytest
+from fastapi.testclient import TestClient
+
+import services.profiling as profiling
+from services.profiling import Profiler
+
+TOKEN = "admin-secret"
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setenv("PROFILING_ENABLED", "true")
+    monkeypatch.setenv("PROFILING_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setenv("LOOP_BLOCK_THRESHOLD_MS", "0")
+    instance = Profiler()
+    monkeypatch.setattr(profiling, "_profiler", instance)
+    return instance
+
+
+def test_cprofile_refuses_a_second_concurrent_profile(profiler):
+    first = profiler.start_cprofile()
+    assert first is not None
+    assert profiler.start_cprofile() is None
+
+    profiler.finish_cprofile(first, "/a", 0.01)
+    second = profiler.start_cprofile()
+    assert second is not None
+    profiler.finish_cprofile(second, "/b", 0.01)
+    assert [p["path"] for p in profiler.store.list()] == ["/b", "/a"]
+
+
+def test_middleware_profiles_only_admin_requests_and_skips_while_busy(profiler):
+    from index import app
+
+    client = TestClient(app)
+    headers = {"X-Profile": "cprofile", "X-Admin-Token": TOKEN}
+
+    assert "X-Profile-Id" not in client.get("/api/health", headers={**headers, "X-Admin-Token": "wrong"}).headers
+
+    profile_id = client.get("/api/health", headers=headers).headers["X-Profile-Id"]
+    report = client.get(f"/api/admin/profiles/{profile_id}?format=text", headers={"X-Admin-Token": TOKEN})
+    assert report.status_code == 200, report.text
+
+    # 다른 요청이 cProfile 중이면 이 요청은 프로파일 없이 처리
+    busy = profiler.start_cprofile()
+    try:
+        response = client.get("/api/health", headers=headers)
+    finally:
+        profiler.finish_cprofile(busy, "/busy", 0.0)
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert len(profiler.store.list()) == 2
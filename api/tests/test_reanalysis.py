@@ -0,0 +1,74 @@
+"""저신뢰 이벤트 재분석 결과 반영 / 요청 타임존 보관"""
+from models.compact_event import CompactEvent
+from services import event_snapshot
+from services.database import DatabaseService
+from services.event_snapshot import MappedSnapshot, write_snapshot
+
+
+def _low_confidence_event(db: DatabaseService) -> CompactEvent:
+    return db.create_event({
+        "summary": "홍길동 미팅",
+        "original_text": "홍길동님 목요일쯤 미팅 가능할까요?",
+        "start_time": "2026-10-19T10:00:00-07:00",
+        "end_time": "2026-10-19T10:30:00-07:00",
+        "confidence": 0.3,
+        "timezone": "America/Los_Angeles",
+    })
+
+
+def test_reanalysis_result_replaces_event_with_same_id():
+    db = DatabaseService()
+    event = _low_confidence_event(db)
+
+    applied = db.apply_reanalysis({
+        "id": event.id,
+        "datetime": "2026-10-22T15:00:00-07:00",
+        "confidence": 0.85,
+        "extracted_fields": {},
+    })
+
+    updated = db.get_event(event.id)
+    assert applied
+    assert updated.to_dict()["start_time"] == "2026-10-22T22:00:00+00:00"
+    assert updated.end_ts - updated.start_ts == 1800
+    assert updated.confidence == 0.85 and updated.timezone == "America/Los_Angeles"
+    assert sum(1 for e in db.iter_events() if e.id == event.id) == 1
+
+
+def test_failed_reanalysis_keeps_event():
+    db = DatabaseService()
+    event = _low_confidence_event(db)
+
+    assert not db.apply_reanalysis({"id": event.id, "datetime": None, "confidence": 0.0, "extracted_fields": {"error": "x"}})
+    assert db.get_event(event.id).confidence == 0.3
+
+
+def test_timezone_survives_snapshot_and_changelog(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_SNAPSHOT_PATH", str(tmp_path / "events.snap"))
+    db = DatabaseService()
+    saved = _low_confidence_event(db)
+    db.save_snapshot()
+    logged = _low_confidence_event(db)
+
+    restored = DatabaseService()
+    assert restored.get_event(saved.id).timezone == "America/Los_Angeles"
+    assert restored.get_event(logged.id).timezone == "America/Los_Angeles"
+
+
+def test_version_1_snapshot_is_still_readable(tmp_path, monkeypatch):
+    path = str(tmp_path / "events.snap")
+    db = DatabaseService()
+    event = _low_confidence_event(db)
+
+    # timezone 필드가 없던 이전 형식
+    with monkeypatch.context() as m:
+        m.setattr(event_snapshot, "FORMAT_VERSION", 1)
+        m.setattr(event_snapshot, "_STRING_FIELDS", event_snapshot._VERSION_FIELDS[1])
+        m.setattr(event_snapshot, "_RECORD", event_snapshot._record_struct(len(event_snapshot._VERSION_FIELDS[1])))
+        write_snapshot(path, db.iter_events(), db._index_texts)
+
+    snapshot = MappedSnapshot(path)
+    restored = snapshot.get(event.id)
+    assert snapshot.version == 1
+    assert (restored.summary, restored.confidence, restored.timezone) == ("홍길동 미팅", 0.3, None)
+    snapshot.close()
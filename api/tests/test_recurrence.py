@@ -0,0 +1,87 @@
+"""반복 일정 감지/전개"""
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from models.schemas import RecurrenceRule
+from utils.recurrence import detect_recurrence, expand_occurrences, first_occurrence
+
+SEOUL = ZoneInfo("Asia/Seoul")
+MONDAY = datetime(2026, 10, 19, 10, 0, tzinfo=SEOUL)
+
+
+def test_count_requires_explicit_expression():
+    assert detect_recurrence("매일 9시 3회의실에서 스크럼").count is None
+    assert detect_recurrence("매월 5일 제12회 정기회의").count is None
+    assert detect_recurrence("매주 화요일 오후 2시 스터디 총 5회").count == 5
+    assert detect_recurrence("매주 목요일 10회 반복").count == 10
+
+
+def test_biweekly_first_occurrence_is_the_next_matching_day():
+    rule = detect_recurrence("격주 화요일 오후 2시 스탠드업")
+    assert (rule.freq, rule.interval, rule.by_weekday) == ("WEEKLY", 2, [1])
+
+    start = first_occurrence(rule, "격주 화요일 오후 2시 스탠드업", MONDAY)
+    assert start == datetime(2026, 10, 20, 14, 0, tzinfo=SEOUL)
+
+    window = list(expand_occurrences(rule, start, MONDAY, MONDAY + timedelta(days=35)))
+    assert [o.day for o in window] == [20, 3, 17]
+
+    # 오늘 시각이 이미 지났으면 다음 주가 첫 발생 (그 주부터 격주)
+    late = datetime(2026, 10, 20, 16, 0, tzinfo=SEOUL)
+    assert first_occurrence(rule, "격주 화요일 오후 2시", late) == datetime(2026, 10, 27, 14, 0, tzinfo=SEOUL)
+
+
+def test_weekly_interval_anchors_at_first_matching_day_after_dtstart():
+    rule = RecurrenceRule(freq="WEEKLY", interval=2, by_weekday=[1])
+    sunday = datetime(2026, 10, 18, 14, 0, tzinfo=SEOUL)
+    occurrences = list(expand_occurrences(rule, sunday, sunday, sunday + timedelta(days=31)))
+    assert [o.date().isoformat() for o in occurrences] == ["2026-10-20", "2026-11-03", "2026-11-17"]
+
+
+def test_monthly_count_skips_missing_days():
+    rule = RecurrenceRule(freq="MONTHLY", by_monthday=31, count=3)
+    start = datetime(2026, 1, 31, 9, 0, tzinfo=SEOUL)
+    occurrences = list(expand_occurrences(rule, start, start, start + timedelta(days=400)))
+    assert [o.date().isoformat() for o in occurrences] == ["2026-01-31", "2026-03-31", "2026-05-31"]
+
+    # 기간이 중간부터 시작해도 COUNT는 처음부터 센 발생 기준
+    later = list(expand_occurrences(rule, start, datetime(2026, 4, 1, tzinfo=SEOUL), start + timedelta(days=400)))
+    assert [o.date().isoformat() for o in later] == ["2026-05-31"]
+
+
+def test_weekly_count_with_window_skip():
+    rule = RecurrenceRule(freq="WEEKLY", by_weekday=[0, 3], count=5)
+    start = datetime(2026, 10, 19, 9, 0, tzinfo=SEOUL)
+    all_dates = list(expand_occurrences(rule, start, start, start + timedelta(days=60)))
+    assert len(all_dates) == 5
+    tail = list(expand_occurrences(rule, start, start + timedelta(days=7), start + timedelta(days=60)))
+    assert tail == all_dates[2:]
+
+
+def test_occurrences_expand_in_the_event_timezone():
+    from services.database import DatabaseService
+
+    la = ZoneInfo("America/Los_Angeles")
+    text = "매주 화요일 오후 2시 스터디"
+    rule = detect_recurrence(text)
+    start = first_occurrence(rule, text, datetime(2026, 10, 19, 10, 0, tzinfo=la))
+    assert start == datetime(2026, 10, 20, 14, 0, tzinfo=la)
+
+    db = DatabaseService()
+    event = db.create_event({
+        "summary": "스터디",
+        "start_time": start.isoformat(),
+        "recurrence": rule.to_rrule(),
+        "timezone": "America/Los_Angeles",
+    })
+    window_start = datetime(2026, 10, 19, tzinfo=la)
+    occurrences = db.get_occurrences(
+        window_start, window_start + timedelta(days=22), 10, predicate=lambda e: e.id == event.id
+    )
+
+    # 화요일 14:00 (PDT → PST 전환 후에도 벽시계 시각 유지)
+    assert [o.isoformat() for _, o in occurrences] == [
+        "2026-10-20T14:00:00-07:00",
+        "2026-10-27T14:00:00-07:00",
+        "2026-11-03T14:00:00-08:00",
+    ]
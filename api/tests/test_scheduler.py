@@ -0,0 +1,51 @@
+"""분석 스케줄러 (레인/긴급도 우선순위)"""
+import asyncio
+
+import pytest
+
+import services.scheduler as scheduler_module
+from models.schemas import EventType
+from services.scheduler import PriorityScheduler, get_scheduler
+
+
+@pytest.fixture
+def single_slot(monkeypatch):
+    monkeypatch.setenv("SCHEDULER_CONCURRENCY", "1")
+    monkeypatch.setattr(scheduler_module, "_scheduler", None)
+
+
+def test_urgent_interactive_analysis_overtakes_queued_bulk(fake_openai, single_slot, monkeypatch):
+    from services.email_analyzer import EmailAnalyzer
+
+    monkeypatch.setenv("FEW_SHOT_K", "0")
+    fake_openai.default = {**fake_openai.default, "delay": 0.2}
+    analyzer = EmailAnalyzer()
+    finished = []
+
+    async def run(name: str, text: str, lane: str):
+        await analyzer.analyze(text, EventType.WORK, lane=lane)
+        finished.append(name)
+
+    async def main():
+        bulk = [asyncio.create_task(run(f"bulk-{i}", f"김철수 고객님 자료 정리 {i}", "bulk")) for i in range(3)]
+        await asyncio.sleep(0.1)  # bulk-0 실행 중, 나머지는 슬롯 대기
+        urgent = asyncio.create_task(run("urgent", "긴급 장애 대응 회의 요청드립니다", "interactive"))
+        await asyncio.gather(*bulk, urgent)
+
+    asyncio.run(main())
+
+    assert finished[:2] == ["bulk-0", "urgent"]
+    lanes = get_scheduler().snapshot()["lanes"]
+    assert lanes["bulk"]["admitted"] == 3
+    assert (lanes["interactive"]["admitted"], lanes["interactive"]["urgent"]) == (1, 1)
+
+
+def test_worker_queue_wait_is_not_mixed_into_lanes():
+    scheduler = PriorityScheduler(concurrency=1)
+    scheduler.observe_wait("bulk_workers", 2.0)
+
+    snapshot = scheduler.snapshot()
+    assert snapshot["lanes"]["bulk"]["admitted"] == 0
+    assert snapshot["queues"]["bulk_workers"]["max_wait_ms"] == 2000.0
+    with pytest.raises(ValueError):
+        scheduler.observe_wait("bulk", 1.0)
@@ -0,0 +1,54 @@
+"""전문 검색 색인 (한글 bigram/unigram, 스냅샷 기본 계층)"""
+from collections import Counter
+
+from services.database import DatabaseService
+from services.event_snapshot import MappedSnapshot, write_snapshot
+from services.search_index import TOKENIZER_VERSION, SearchIndex, tokenize
+
+
+def test_query_tokens_stay_bigrams():
+    assert tokenize("김철수 미팅") == ["김철", "철수", "미팅"]
+    assert tokenize("김") == ["김"]
+    assert set(tokenize("김철수", unigrams=True)) == {"김철", "철수", "김", "철", "수"}
+
+
+def test_single_hangul_character_matches_words():
+    index = SearchIndex()
+    index.add("a", ["김철수 클라이언트 미팅"])
+    index.add("b", ["이영희 면접"])
+
+    assert [doc for doc, _ in index.search("김")[0]] == ["a"]
+    assert [doc for doc, _ in index.search("수")[0]] == ["a"]
+    assert [doc for doc, _ in index.search("김철수")[0]] == ["a"]
+    assert index.search("박")[1] == 0
+
+
+def test_single_character_query_on_snapshot_layer(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVENT_SNAPSHOT_PATH", str(tmp_path / "events.snap"))
+    db = DatabaseService()
+    created = db.create_event({"summary": "홍길동 주간 회의", "start_time": "2026-10-22T15:00:00+09:00"})
+    db.save_snapshot()
+
+    restored = DatabaseService()
+    events, total = restored.search_events("홍")
+    assert total == 1 and events[0].id == created.id
+
+
+def test_stale_snapshot_index_is_rebuilt(tmp_path, monkeypatch):
+    path = str(tmp_path / "events.snap")
+    monkeypatch.setenv("EVENT_SNAPSHOT_PATH", path)
+    db = DatabaseService()
+    created = db.create_event({"summary": "홍길동 주간 회의", "start_time": "2026-10-22T15:00:00+09:00"})
+
+    # 이전 토큰 규칙(unigram 없음, tokenizer 버전 없음)으로 만든 스냅샷
+    with monkeypatch.context() as m:
+        m.setattr(SearchIndex, "term_counts", staticmethod(lambda texts: Counter(tokenize(" ".join(t for t in texts if t)))))
+        write_snapshot(path, db.iter_events(), db._index_texts, meta={"timezone": "Asia/Seoul"})
+    old = MappedSnapshot(path)
+    assert old.postings("홍") == []
+    old.close()
+    db._changelog.reset()
+
+    restored = DatabaseService()
+    assert [e.id for e in restored.search_events("홍")[0]] == [created.id]
+    assert MappedSnapshot(path).meta["tokenizer"] == TOKENIZER_VERSION
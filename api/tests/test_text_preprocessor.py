@@ -0,0 +1,41 @@
+"""이메일 전처리 (인용/서명/고지 제거, 날짜 문장 우선 보존)"""
+from utils.text_preprocessor import preprocess_email
+
+
+def test_quoted_reply_signature_and_disclaimer_are_removed():
+    text = (
+        "<p>김철수 클라이언트입니다.<br>다음 주 화요일 오후 2시에 미팅 가능할까요?</p>\n"
+        "<p>본 메일은 수신인 외에는 열람할 수 없습니다.</p>\n"
+        "감사합니다.\n"
+        "홍길동 드림\n"
+        "\n"
+        "-----Original Message-----\n"
+        "From: 이영희\n"
+        "지난주 금요일 3시 회의 건입니다."
+    )
+
+    result = preprocess_email(text)
+
+    assert "다음 주 화요일 오후 2시" in result.text
+    assert "<p>" not in result.text
+    assert "수신인" not in result.text
+    assert "홍길동 드림" not in result.text
+    assert "지난주 금요일" not in result.text
+    assert result.cleaned_tokens < result.original_tokens
+
+
+def test_length_cap_keeps_date_sentences():
+    filler = " ".join(f"참고 문장 {i}번입니다." for i in range(100))
+    text = f"안녕하세요. {filler} 회의는 10월 22일 15시로 확정되었습니다."
+
+    result = preprocess_email(text, max_chars=200)
+
+    assert len(result.text) <= 200
+    assert result.text.startswith("안녕하세요.")
+    assert "10월 22일 15시" in result.text
+
+
+def test_base64_only_message_falls_back_to_original():
+    blob = "QUJD" * 30
+
+    assert preprocess_email(blob).text == blob
@@ -0,0 +1,69 @@
+"""시작 시 웜업 (한 번만 실행, 준비 상태 → /api/ready)"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import services.warmup as warmup
+from services.warmup import WarmupState
+
+
+@pytest.fixture
+def warmup_enabled(monkeypatch):
+    monkeypatch.setenv("WARMUP_ON_STARTUP", "true")
+    state = WarmupState()
+    monkeypatch.setattr(warmup, "_warmup_state", state)
+    return state
+
+
+def test_concurrent_and_repeated_runs_execute_steps_once(warmup_enabled):
+    calls = []
+    started, gate = threading.Event(), threading.Event()
+
+    def slow_step():
+        calls.append("slow")
+        started.set()
+        gate.wait(5)
+
+    steps = [("slow", slow_step), ("fast", lambda: calls.append("fast"))]
+    first = threading.Thread(target=warmup_enabled.run, args=(steps,))
+    first.start()
+    assert started.wait(5)
+    # 웜업 중에 다시 호출해도 (다른 스레드/재시작 훅) 단계는 다시 실행되지 않음
+    warmup_enabled.run(steps)
+    assert warmup_enabled.state == "warming" and not warmup_enabled.ready
+    gate.set()
+    first.join(5)
+    warmup_enabled.run(steps)
+
+    assert calls == ["slow", "fast"]
+    assert warmup_enabled.state == "warm" and set(warmup_enabled.steps) == {"slow", "fast"}
+
+
+def test_ready_endpoint_follows_warmup_state(warmup_enabled, fake_openai, monkeypatch):
+    import agents.event_agent as event_agent
+    from index import _warmup_steps, app
+
+    client = TestClient(app)
+    assert client.get("/api/ready").status_code == 503
+
+    warmup_enabled.run(_warmup_steps())
+    agents = dict(event_agent._base_agents)
+    warmup_enabled.run(_warmup_steps())
+
+    response = client.get("/api/ready")
+    assert response.status_code == 200 and response.json()["state"] == "warm"
+    # 두 번째 실행은 싱글톤을 다시 만들지 않음
+    assert agents and event_agent._base_agents == agents
+    assert all(event_agent._base_agents[mode] is agent for mode, agent in agents.items())
+
+
+def test_failed_step_keeps_instance_out_of_rotation(warmup_enabled):
+    def broken():
+        raise RuntimeError("boom")
+
+    warmup_enabled.run([("ok", lambda: None), ("broken", broken), ("never", lambda: pytest.fail("실행되면 안 됨"))])
+
+    snapshot = warmup_enabled.snapshot()
+    assert (snapshot["ready"], snapshot["state"]) == (False, "failed")
+    assert snapshot["error"] == "broken: boom"
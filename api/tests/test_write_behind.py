@@ -0,0 +1,94 @@
+"""Write-behind 버퍼 (backpressure)"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.write_behind import WriteBehindBuffer, WriteBufferFullError
+
+
+def test_concurrent_puts_never_exceed_max_pending():
+    gate = threading.Event()
+    observed = []
+
+    def flush(rows):
+        observed.append(len(buffer._pending))
+        gate.wait(5)
+
+    buffer = WriteBehindBuffer(flush, batch_size=2, flush_interval_ms=10, max_pending=2, backpressure_timeout=5)
+
+    async def run():
+        await buffer.put(0)
+        await buffer.put(1)
+        # 버퍼가 가득 찬 상태에서 put 여러 개가 동시에 대기 → 공간이 나면 한꺼번에 깨어남
+        waiters = [asyncio.create_task(buffer.put(i)) for i in range(2, 10)]
+        await asyncio.sleep(0.2)
+        assert len(buffer._pending) == 2
+        gate.set()
+        await asyncio.gather(*waiters)
+
+    asyncio.run(run())
+    buffer.close()
+    assert max(observed) <= 2
+    assert buffer.snapshot()["flushed_rows"] == 10
+
+
+def test_put_times_out_when_full():
+    gate = threading.Event()
+    buffer = WriteBehindBuffer(lambda rows: gate.wait(5), batch_size=10, flush_interval_ms=10, max_pending=1, backpressure_timeout=0.2)
+
+    async def run():
+        await buffer.put(0)
+        with pytest.raises(WriteBufferFullError):
+            await buffer.put(1)
+
+    asyncio.run(run())
+    gate.set()
+    buffer.close()
+    assert buffer.snapshot()["backpressure_waits"] == 1
+
+
+def test_delete_during_flush_is_logged_after_the_flush_without_blocking(tmp_path, monkeypatch):
+    from services.database import DatabaseService
+
+    monkeypatch.setenv("EVENT_SNAPSHOT_PATH", str(tmp_path / "events.snap"))
+    monkeypatch.setenv("WRITE_FLUSH_INTERVAL_MS", "10")
+    db = DatabaseService()
+    started, gate = threading.Event(), threading.Event()
+    persist = db.write_buffer.flush_fn
+
+    def slow_flush(rows):
+        # 배치를 고른 뒤 변경 로그에 쓰기 전에 삭제가 끼어드는 상황
+        started.set()
+        gate.wait(5)
+        persist(rows)
+
+    db.write_buffer.flush_fn = slow_flush
+    event = asyncio.run(db.create_event_buffered({"summary": "삭제될 일정", "start_time": "2026-10-20T10:00:00+09:00"}))
+    assert started.wait(5)
+    # 저장이 끝나지 않은 상태에서도 삭제는 바로 반환 (이벤트 루프가 flush/fsync를 기다리지 않음)
+    began = time.monotonic()
+    assert db.delete_event(event.id)
+    assert time.monotonic() - began < 0.1
+    assert db.get_event(event.id) is None
+    gate.set()
+    db.write_buffer.close()
+
+    # 변경 로그를 재생해도 삭제한 일정이 되살아나지 않아야 함
+    assert DatabaseService().get_event(event.id) is None
+
+
+def test_reanalysis_replaces_pending_row(tmp_path, monkeypatch):
+    from services.database import DatabaseService
+
+    monkeypatch.setenv("EVENT_SNAPSHOT_PATH", str(tmp_path / "events.snap"))
+    monkeypatch.setenv("WRITE_FLUSH_INTERVAL_MS", "1000")
+    db = DatabaseService()
+    event = asyncio.run(db.create_event_buffered({"summary": "재분석될 일정", "start_time": "2026-10-20T10:00:00+09:00"}))
+    assert db.apply_reanalysis({"id": event.id, "datetime": "2026-10-22T15:00:00+09:00", "confidence": 0.9, "extracted_fields": {}})
+
+    # 대기 중이던 이전 버전은 버려지고 갱신본만 남음
+    assert [row.confidence for row in db.write_buffer._pending] == [0.9]
+    db.write_buffer.close()
+    assert DatabaseService().get_event(event.id).confidence == 0.9
@@ -0,0 +1,113 @@
+"""
+첨부파일 텍스트 추출 유틸리티
+PDF/텍스트 첨부를 페이지 단위 generator로 내보냅니다.
+호출하는 쪽에서 필요한 만큼만 읽고 멈출 수 있으므로 큰 문서도 앞부분만 처리할 수 있습니다.
+
+- PDF: pypdf (페이지 객체와 텍스트는 요청한 페이지만 파싱)
+- 텍스트: 폼피드(\\f)가 있으면 그 단위로, 없으면 일정 줄 수 단위로 페이지 분할
+"""
+from typing import Iterator, Optional
+import codecs
+import io
+import os
+
+# 텍스트 첨부의 페이지당 줄 수 (폼피드가 없을 때)
+_TEXT_PAGE_LINES = 60
+
+# 텍스트 첨부 인코딩 후보 (국내 메일 첨부는 CP949가 흔함)
+_TEXT_ENCODINGS = ("utf-8-sig", "cp949")
+
+_PDF_TYPES = {"application/pdf", "application/x-pdf"}
+_TEXT_EXTENSIONS = {".txt", ".md", ".csv", ".tsv", ".eml", ".log"}
+
+
+class AttachmentError(Exception):
+    """지원하지 않거나 읽을 수 없는 첨부파일"""
+
+
+def attachment_kind(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """
+    첨부 종류 판별
+
+    Returns:
+        "pdf" / "text" (지원하지 않으면 None)
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if extension == ".pdf" or content_type in _PDF_TYPES:
+        return "pdf"
+    if extension in _TEXT_EXTENSIONS or content_type.startswith("text/"):
+        return "text"
+    return None
+
+
+def _iter_pdf_pages(data: bytes) -> Iterator[str]:
+    # PDF 첨부가 있을 때만 로딩 (콜드 스타트에 포함되지 않도록)
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PdfReadError
+    except ImportError:
+        raise AttachmentError("PDF 처리 모듈(pypdf)이 설치되어 있지 않습니다.")
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        if reader.is_encrypted:
+            # 열기 암호 없이 권한만 걸린 PDF는 빈 암호로 열림
+            reader.decrypt("")
+        pages = reader.pages
+        total = len(pages)
+    except (PdfReadError, ValueError, NotImplementedError) as e:
+        raise AttachmentError(f"PDF를 읽을 수 없습니다: {e}")
+
+    for index in range(total):
+        try:
+            yield pages[index].extract_text() or ""
+        except Exception:
+            # 깨진 페이지 하나 때문에 문서 전체를 버리지 않음
+            yield ""
+
+
+def _decode(data: bytes) -> str:
+    for encoding in _TEXT_ENCODINGS:
+        try:
+            return codecs.decode(data, encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("utf-8", errors="replace")
+
+
+def _iter_text_pages(data: bytes) -> Iterator[str]:
+    text = _decode(data)
+    if "\f" in text:
+        yield from text.split("\f")
+        return
+
+    lines = []
+    for line in io.StringIO(text):
+        lines.append(line)
+        if len(lines) >= _TEXT_PAGE_LINES:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def iter_pages(data: bytes, kind: str) -> Iterator[str]:
+    """
+    첨부파일 페이지 텍스트 스트림
+
+    Args:
+        data: 파일 내용
+        kind: attachment_kind 결과 ("pdf" / "text")
+
+    Yields:
+        페이지별 텍스트 (1페이지부터 순서대로, 텍스트가 없는 페이지는 빈 문자열)
+
+    Raises:
+        AttachmentError: 지원하지 않거나 읽을 수 없는 파일
+    """
+    if kind == "pdf":
+        return _iter_pdf_pages(data)
+    if kind == "text":
+        return _iter_text_pages(data)
+    raise AttachmentError(f"지원하지 않는 첨부 형식: {kind}")
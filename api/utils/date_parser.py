@@ -2,73 +2,369 @@
 날짜 파싱 유틸리티
 FSF 프로젝트의 calendar_tool.py에서 parse_date 함수 복사
 """
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import Dict, Optional
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import os
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 사용자 타임존이 주어지지 않았을 때의 기준 타임존 (서버 로컬 시각에 의존하지 않음)
+DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "Asia/Seoul")
 
-def parse_date(date_str: str) -> Optional[str]:
+_WEEKDAY_CHARS = "월화수목금토일"
+
+# 상대 날짜 표현 → 기준일로부터의 일수
+_RELATIVE_DAYS = {
+    "오늘": 0, "today": 0,
+    "내일": 1, "tomorrow": 1,
+    "모레": 2,
+    "글피": 3,
+    "어제": -1, "yesterday": -1,
+    "그제": -2, "그저께": -2,
+}
+# 주 표현 → 기준 주(이번 주 월요일)로부터의 주 수
+_RELATIVE_WEEKS = {"지난": -1, "저번": -1, "이번": 0, "금": 0, "다음": 1, "담": 1, "다다음": 2}
+
+_ISO_DATE_PATTERN = re.compile(r'(\d{4})[-./](\d{1,2})[-./](\d{1,2})')
+_MONTH_DAY_PATTERN = re.compile(r'(\d{1,2})월\s*(\d{1,2})일')
+_SLASH_DATE_PATTERN = re.compile(r'(\d{1,2})/(\d{1,2})')
+_WEEKDAY_PATTERN = re.compile(r'(?:(지난|저번|이번|금|다다음|다음|담)\s*주\s*)?([월화수목금토일])요일')
+_WEEK_PATTERN = re.compile(r'(지난|저번|이번|다다음|다음|담)\s*주')
+_RELATIVE_DAY_PATTERN = re.compile('|'.join(sorted(_RELATIVE_DAYS, key=len, reverse=True)))
+
+
+@lru_cache(maxsize=64)
+def get_timezone(name: Optional[str] = None) -> tzinfo:
+    """
+    IANA 타임존 조회 (None이면 DEFAULT_TIMEZONE)
+
+    Raises:
+        ValueError: 알 수 없는 타임존
+    """
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"알 수 없는 타임존: {name}") from e
+
+
+@lru_cache(maxsize=256)
+def _anchor_dates(today: date) -> Dict[str, date]:
+    """기준일별 상대 날짜 앵커 (같은 날짜의 요청/배치는 모두 같은 결과를 공유)"""
+    monday = today - timedelta(days=today.weekday())
+    anchors = {word: today + timedelta(days=days) for word, days in _RELATIVE_DAYS.items()}
+    anchors.update({f"{word}주": monday + timedelta(weeks=weeks) for word, weeks in _RELATIVE_WEEKS.items()})
+    return anchors
+
+
+class ParseContext:
+    """
+    날짜 파싱 기준 (메시지 발신 시각 + 사용자 타임존)
+
+    "내일", "모레", "다음 주 목요일" 같은 상대 표현은 서버 시계가 아니라 이 기준으로 해석합니다.
+    앵커 날짜는 기준일마다 한 번만 계산되어 같은 요청/배치의 모든 표현에 재사용됩니다.
+    """
+
+    __slots__ = ("tz", "now", "today", "anchors")
+
+    def __init__(self, now: datetime):
+        self.tz = now.tzinfo
+        self.now = now
+        self.today = now.date()
+        self.anchors = _anchor_dates(self.today)
+
+    def localize(self, value: datetime) -> datetime:
+        """naive 시각은 컨텍스트 타임존의 벽시계 시각으로, aware 시각은 컨텍스트 타임존으로 변환"""
+        if value.tzinfo is None:
+            return value.replace(tzinfo=self.tz)
+        return value.astimezone(self.tz)
+
+    def reference(self) -> str:
+        """프롬프트용 기준 시각 표기 (예: "2026-10-19 10:00 (월요일, Asia/Seoul)")"""
+        return f"{self.now:%Y-%m-%d %H:%M} ({_WEEKDAY_CHARS[self.today.weekday()]}요일, {self.tz})"
+
+    def at(self, day: date, hour: int = 0, minute: int = 0) -> datetime:
+        """날짜 + 시각 → 컨텍스트 타임존의 aware datetime"""
+        return datetime(day.year, day.month, day.day, hour, minute, tzinfo=self.tz)
+
+    def weekday(self, weekday: int, week: Optional[str] = None) -> date:
+        """
+        요일 → 날짜
+
+        Args:
+            weekday: 0=월 ~ 6=일
+            week: "이번"/"다음"/"다다음"/"지난" (없으면 오늘 이후 가장 가까운 해당 요일)
+        """
+        if week is None:
+            return self.today + timedelta(days=(weekday - self.today.weekday()) % 7)
+        return self.anchors[f"{week}주"] + timedelta(days=weekday)
+
+
+def get_parse_context(sent_at: Optional[datetime] = None, tz_name: Optional[str] = None) -> ParseContext:
+    """
+    파싱 컨텍스트 생성 (요청/배치마다 한 번 만들어 재사용)
+
+    Args:
+        sent_at: 메시지 발신 시각 (없으면 현재 시각, naive면 tz_name 기준 벽시계 시각)
+        tz_name: 사용자 IANA 타임존 (없으면 DEFAULT_TIMEZONE)
+
+    Raises:
+        ValueError: 알 수 없는 타임존
+    """
+    tz = get_timezone(tz_name)
+    if sent_at is None:
+        now = datetime.now(tz)
+    elif sent_at.tzinfo is None:
+        now = sent_at.replace(tzinfo=tz)
+    else:
+        now = sent_at.astimezone(tz)
+    return ParseContext(now)
+
+
+def parse_date(date_str: str, context: Optional[ParseContext] = None) -> Optional[str]:
     """
     날짜 문자열을 파싱하여 YYYY-MM-DD 형식으로 반환
     
     Args:
-        date_str: 날짜 문자열 (예: "오늘", "내일", "2025-12-25", "12월 25일")
+        date_str: 날짜 문자열 (예: "오늘", "모레", "다음 주 목요일", "2025-12-25", "12월 25일")
+        context: 파싱 기준 (없으면 DEFAULT_TIMEZONE의 현재 시각)
     
     Returns:
         YYYY-MM-DD 형식의 날짜 문자열 또는 None
     """
     try:
         date_str = date_str.strip().lower()
-        today = datetime.now()
+        context = context or get_parse_context()
+        year = context.today.year
         
-        # "오늘" 처리
-        if date_str in ["오늘", "today"]:
-            return today.strftime("%Y-%m-%d")
+        # 절대 날짜 ("2025-12-25", "2025.12.25")
+        iso_match = _ISO_DATE_PATTERN.search(date_str)
+        if iso_match:
+            return date(*map(int, iso_match.groups())).isoformat()
         
-        # "내일" 처리
-        if date_str in ["내일", "tomorrow"]:
-            tomorrow = today + timedelta(days=1)
-            return tomorrow.strftime("%Y-%m-%d")
-        
-        # "어제" 처리
-        if date_str in ["어제", "yesterday"]:
-            yesterday = today - timedelta(days=1)
-            return yesterday.strftime("%Y-%m-%d")
+        # "12월 25일" / "12/25" 형식 (올해로 가정)
+        month_day_match = _MONTH_DAY_PATTERN.search(date_str) or _SLASH_DATE_PATTERN.search(date_str)
+        if month_day_match:
+            return date(year, int(month_day_match.group(1)), int(month_day_match.group(2))).isoformat()
         
-        # 이미 YYYY-MM-DD 형식인 경우
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-            return date_str
+        # "다음 주 목요일", "금요일"
+        weekday_match = _WEEKDAY_PATTERN.search(date_str)
+        if weekday_match:
+            week, day_char = weekday_match.groups()
+            return context.weekday(_WEEKDAY_CHARS.index(day_char), week).isoformat()
         
-        # "12월 25일" 형식 처리
-        month_day_match = re.search(r'(\d{1,2})월\s*(\d{1,2})일', date_str)
-        if month_day_match:
-            month = int(month_day_match.group(1))
-            day = int(month_day_match.group(2))
-            # 올해로 가정 (다음 해인 경우는 고려하지 않음)
-            year = today.year
-            try:
-                parsed_date = datetime(year, month, day)
-                return parsed_date.strftime("%Y-%m-%d")
-            except ValueError:
-                return None
+        # "다음 주" (해당 주 월요일)
+        week_match = _WEEK_PATTERN.search(date_str)
+        if week_match:
+            return context.anchors[f"{week_match.group(1)}주"].isoformat()
         
-        # "12/25" 형식 처리
-        slash_match = re.search(r'(\d{1,2})/(\d{1,2})', date_str)
-        if slash_match:
-            month = int(slash_match.group(1))
-            day = int(slash_match.group(2))
-            year = today.year
-            try:
-                parsed_date = datetime(year, month, day)
-                return parsed_date.strftime("%Y-%m-%d")
-            except ValueError:
-                return None
+        # "오늘", "내일", "모레", "어제" ...
+        relative_match = _RELATIVE_DAY_PATTERN.search(date_str)
+        if relative_match:
+            return context.anchors[relative_match.group(0)].isoformat()
         
         return None
         
+    except ValueError:
+        # 존재하지 않는 날짜 (예: 2월 30일)
+        return None
     except Exception as e:
         logger.error(f"❌ 날짜 파싱 오류: {e}")
         return None
+
+
+# 날짜/시간 언급 감지용 패턴 (문장 선별, 우선순위 판단 등에서 재사용)
+DATE_HINT_PATTERN = re.compile(
+    r'\d{4}[-./]\d{1,2}[-./]\d{1,2}'
+    r'|\d{1,2}월\s*\d{1,2}일'
+    r'|\d{1,2}/\d{1,2}'
+    r'|\d{1,2}:\d{2}'
+    r'|\d{1,2}시'
+    r'|오늘|내일|모레|글피|어제|그제|이번\s*주|다음\s*주|다다음\s*주'
+    r'|[월화수목금토일]요일'
+    r'|오전|오후|마감|까지'
+    r'|today|tomorrow|tonight|deadline',
+    re.IGNORECASE
+)
+
+
+def contains_date_expression(text: str) -> bool:
+    """
+    텍스트에 날짜/시간 표현이 포함되어 있는지 확인 (가벼운 사전 검사용)
+    
+    Args:
+        text: 검사할 텍스트
+    
+    Returns:
+        날짜/시간 표현 포함 여부
+    """
+    return bool(DATE_HINT_PATTERN.search(text))
+
+
+# 시각 표현 패턴 ("오후 2시", "새벽 3시", "14시 30분", "14:30")
+_TIME_PATTERN = re.compile(
+    r'(오전|오후|새벽|아침|낮|점심|저녁|밤)?\s*(\d{1,2})\s*(?:시(?!간)\s*(?:(\d{1,2})\s*분|반)?|:(\d{2}))'
+)
+# 시간대 표현 → 12시간제 시각의 오후 여부 (오전/새벽/아침의 12시는 0시)
+_AM_WORDS = ("오전", "새벽", "아침")
+
+
+def parse_time(text: str) -> Optional[tuple]:
+    """
+    텍스트에서 첫 번째 시각 표현을 (hour, minute)으로 반환
+
+    오전/오후/새벽/저녁 등 시간대 표현이 없으면 적힌 그대로 해석합니다. ("3시" → 3:00)
+
+    Args:
+        text: 시각이 포함된 텍스트 (예: "오후 2시", "새벽 3시", "14:30", "3시 반")
+
+    Returns:
+        (hour, minute) 튜플 또는 None
+    """
+    match = _TIME_PATTERN.search(text)
+    return _time_from_match(match) if match else None
+
+
+def _time_from_match(match: "re.Match") -> Optional[tuple]:
+    meridiem, hour, minute, colon_minute = match.groups()
+    hour = int(hour)
+    if colon_minute is not None:
+        minute = int(colon_minute)
+    elif minute is not None:
+        minute = int(minute)
+    else:
+        minute = 30 if match.group(0).endswith("반") else 0
+    if meridiem in _AM_WORDS:
+        if hour == 12:
+            hour = 0
+    elif meridiem in ("오후", "저녁") and hour < 12:
+        hour += 12
+    elif meridiem in ("낮", "점심") and 1 <= hour <= 5:
+        hour += 12
+    elif meridiem == "밤" and 6 <= hour <= 11:
+        # "밤 1시"는 새벽 1시, "밤 9시"는 21시
+        hour += 12
+    if hour > 23 or minute > 59:
+        return None
+    return (hour, minute)
+
+
+def _is_ambiguous_time(match: "re.Match") -> bool:
+    """시간대 표현 없는 1~7시 ("3시") - 오전/오후를 정하지 않고 후보 순위에서 판단"""
+    meridiem, hour, _, colon_minute = match.groups()
+    return meridiem is None and colon_minute is None and 1 <= int(hour) <= 7
+
+
+# 후보 추출용 날짜 표현 (긴 표현 우선 - "다음 주 목요일"이 "목요일"보다 먼저 매칭)
+_MENTION_PATTERN = re.compile(
+    r'(?P<absolute>\d{4}[-./]\d{1,2}[-./]\d{1,2})'
+    r'|(?P<month_day>\d{1,2}월\s*\d{1,2}일|(?<![\d/])\d{1,2}/\d{1,2}(?![\d/]))'
+    r'|(?P<weekday>(?:(?:지난|저번|이번|금|다다음|다음|담)\s*주\s*)?[월화수목금토일]요일)'
+    r'|(?P<relative>' + '|'.join(sorted(_RELATIVE_DAYS, key=len, reverse=True)) + r')',
+    re.IGNORECASE
+)
+# 날짜 뒤에 붙는 요일 표기 ("10월 22일(목)", "2026-10-22 목요일") - 날짜 표현에 포함
+_WEEKDAY_SUFFIX_PATTERN = re.compile(r'\s*(?:\(\s*[월화수목금토일](?:요일)?\s*\)|[월화수목금토일]요일)')
+# 날짜 표현과 시각 사이에 허용하는 연결어 ("목요일 3시", "내일, 오후 2시", "금요일의 10시")
+_TIME_GAP_PATTERN = re.compile(r'[\s,]*(?:에|의)?\s*')
+
+
+class DateMention:
+    """텍스트 안의 날짜/시각 표현 하나 (원문 위치 포함)"""
+
+    __slots__ = ("start", "end", "text", "kind", "value", "has_time", "pm_value")
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        text: str,
+        kind: str,
+        value: datetime,
+        has_time: bool,
+        pm_value: Optional[datetime] = None
+    ):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.kind = kind  # absolute / month_day / weekday / relative / time_only
+        self.value = value  # 적힌 그대로의 일시 ("3시" → 3:00)
+        self.has_time = has_time
+        self.pm_value = pm_value  # 시간대 없는 1~7시의 오후 해석 (후보 순위에서 선택)
+
+
+def _next_at(context: ParseContext, hour: int, minute: int) -> datetime:
+    """기준 시각 이후 가장 가까운 hour:minute"""
+    value = context.at(context.today, hour, minute)
+    if value < context.now:
+        value += timedelta(days=1)
+    return value
+
+
+def find_date_mentions(text: str, context: Optional[ParseContext] = None) -> list:
+    """
+    텍스트에서 날짜(+시각) 표현을 모두 찾아 원문 순서대로 반환
+
+    "목요일 3시 또는 금요일 10시"처럼 여러 후보를 제안하는 메시지에서 각각을 따로 추출합니다.
+    날짜 없이 시각만 있는 표현은 기준 시각 이후 가장 가까운 해당 시각으로 해석합니다.
+    날짜 뒤의 요일 표기("10월 22일(목) 오후 3시")는 같은 표현으로 묶습니다.
+
+    Args:
+        text: 원본 텍스트
+        context: 파싱 기준 (없으면 DEFAULT_TIMEZONE의 현재 시각)
+
+    Returns:
+        DateMention 목록
+    """
+    context = context or get_parse_context()
+    mentions = []
+    covered = []
+    last_end = 0
+
+    for match in _MENTION_PATTERN.finditer(text):
+        # "10월 22일 목요일"의 요일처럼 앞 표현에 포함된 부분은 따로 세지 않음
+        if match.start() < last_end:
+            continue
+        date_str = parse_date(match.group(0), context)
+        if not date_str:
+            continue
+        day = date.fromisoformat(date_str)
+        end = match.end()
+        if match.lastgroup in ("absolute", "month_day"):
+            suffix = _WEEKDAY_SUFFIX_PATTERN.match(text, end)
+            if suffix:
+                end = suffix.end()
+        hour_minute = None
+        pm_value = None
+        gap = _TIME_GAP_PATTERN.match(text, end)
+        time_match = _TIME_PATTERN.match(text, gap.end())
+        if time_match:
+            hour_minute = _time_from_match(time_match)
+            if hour_minute:
+                end = time_match.start() + len(time_match.group(0).rstrip())
+                if _is_ambiguous_time(time_match):
+                    pm_value = context.at(day, hour_minute[0] + 12, hour_minute[1])
+        mentions.append(DateMention(
+            match.start(), end, text[match.start():end], match.lastgroup,
+            context.at(day, *(hour_minute or (0, 0))), hour_minute is not None, pm_value
+        ))
+        covered.append((match.start(), end))
+        last_end = end
+
+    for match in _TIME_PATTERN.finditer(text):
+        if any(start <= match.start() < end for start, end in covered):
+            continue
+        hour_minute = _time_from_match(match)
+        if not hour_minute:
+            continue
+        value = _next_at(context, *hour_minute)
+        pm_value = _next_at(context, hour_minute[0] + 12, hour_minute[1]) if _is_ambiguous_time(match) else None
+        start = match.start() + len(match.group(0)) - len(match.group(0).lstrip())
+        end = match.start() + len(match.group(0).rstrip())
+        mentions.append(DateMention(start, end, text[start:end], "time_only", value, True, pm_value))
+
+    mentions.sort(key=lambda m: m.start)
+    return mentions
@@ -0,0 +1,230 @@
+"""
+iCalendar(.ics) 직렬화 유틸리티
+Google Calendar/Outlook 구독용 피드를 VEVENT 단위로 생성합니다. (RFC 5545)
+전체 캘린더 문자열을 만들지 않고 generator로 조각을 내보내므로
+이벤트 수와 관계없이 메모리 사용량이 일정합니다.
+반복 일정은 이벤트 타임존의 벽시계 시각(TZID)으로 내보내고, 처음 쓰는 TZID마다
+VTIMEZONE을 그 앞에 한 번 붙입니다. (구성 요소 순서는 RFC 5545에서 자유)
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from models.compact_event import CompactEvent
+from utils.date_parser import get_timezone
+
+PRODID = "-//Show Me The Data//AI Calendar//KO"
+
+_STATUS_MAP = {
+    "confirmed": "CONFIRMED",
+    "tentative": "TENTATIVE",
+    "cancelled": "CANCELLED",
+}
+
+# 한 번에 내보낼 VEVENT 수 (너무 잘게 쪼개면 청크 오버헤드가 커짐)
+_EVENTS_PER_CHUNK = 32
+
+# VTIMEZONE에 넣을 전환 시각 범위 (올해 기준 앞뒤 연도 수)
+_VTIMEZONE_YEARS_BEFORE = 2
+_VTIMEZONE_YEARS_AFTER = 10
+
+
+def _escape(value: str) -> str:
+    """TEXT 값 이스케이프 (\\ ; , 줄바꿈)"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """75 octet 단위 줄 접기 (UTF-8 멀티바이트 문자는 쪼개지 않음)"""
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+    parts = []
+    current, size, limit = [], 0, 75
+    for ch in line:
+        width = len(ch.encode("utf-8"))
+        if size + width > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, 74  # 이어지는 줄은 선행 공백 1 octet
+        current.append(ch)
+        size += width
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _utc(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _local(ts: int, tz) -> str:
+    return datetime.fromtimestamp(ts, tz).strftime("%Y%m%dT%H%M%S")
+
+
+def _offset(delta: timedelta) -> str:
+    minutes = int(delta.total_seconds()) // 60
+    sign = "+" if minutes >= 0 else "-"
+    return f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+
+def _transitions(tzid: str, start: datetime, end: datetime) -> List[Tuple[datetime, timedelta, timedelta, bool]]:
+    """[start, end) 안의 UTC 오프셋 전환 (전환 시각 UTC, 이전 오프셋, 이후 오프셋, 서머타임 여부)"""
+    tz = get_timezone(tzid)
+    found = []
+    day = start
+    previous = day.astimezone(tz).utcoffset()
+    while day < end:
+        following = day + timedelta(days=1)
+        offset = following.astimezone(tz).utcoffset()
+        if offset != previous:
+            # 하루 안에서 이분 탐색으로 전환 초 찾기
+            lo, hi = day, following
+            while hi - lo > timedelta(seconds=1):
+                mid = lo + (hi - lo) / 2
+                if mid.astimezone(tz).utcoffset() == previous:
+                    lo = mid
+                else:
+                    hi = mid
+            found.append((hi, previous, offset, bool(hi.astimezone(tz).dst())))
+            previous = offset
+        day = following
+    return found
+
+
+@lru_cache(maxsize=64)
+def format_vtimezone(tzid: str, year: Optional[int] = None) -> str:
+    """
+    IANA 타임존 → VTIMEZONE 블록 (범위 안의 전환을 각각 STANDARD/DAYLIGHT로)
+
+    Args:
+        tzid: IANA 타임존 이름
+        year: 기준 연도 (없으면 올해 - 앞뒤 범위의 전환만 포함)
+    """
+    year = year or datetime.now(timezone.utc).year
+    start = datetime(year - _VTIMEZONE_YEARS_BEFORE, 1, 1, tzinfo=timezone.utc)
+    end = datetime(year + _VTIMEZONE_YEARS_AFTER + 1, 1, 1, tzinfo=timezone.utc)
+    tz = get_timezone(tzid)
+    initial = start.astimezone(tz)
+    # 범위 시작의 오프셋을 첫 구간으로 (전환이 없는 타임존은 이것 하나)
+    observances = [(start, initial.utcoffset(), initial.utcoffset(), bool(initial.dst()))]
+    observances += _transitions(tzid, start, end)
+
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tzid}"]
+    for at, before, after, dst in observances:
+        kind = "DAYLIGHT" if dst else "STANDARD"
+        lines += [
+            f"BEGIN:{kind}",
+            # 전환 시각은 전환 직전 오프셋의 벽시계 시각으로
+            f"DTSTART:{(at + before).replace(tzinfo=None).strftime('%Y%m%dT%H%M%S')}",
+            f"TZOFFSETFROM:{_offset(before)}",
+            f"TZOFFSETTO:{_offset(after)}",
+            f"END:{kind}",
+        ]
+    lines.append("END:VTIMEZONE")
+    return "".join(_fold(line) for line in lines)
+
+
+def _tzid(event: CompactEvent) -> str:
+    """반복 일정을 전개할 타임존 이름 (이벤트 타임존, 없거나 알 수 없으면 DEFAULT_TIMEZONE)"""
+    return event.local_start.tzinfo.key
+
+
+def _rrule(event: CompactEvent, tz) -> str:
+    """RRULE (DTSTART에 TZID가 있으므로 UNTIL은 UTC로 - RFC 5545 3.3.10)"""
+    rule = event.recurrence
+    if rule.until is not None and rule.until.tzinfo is None:
+        rule = rule.model_copy(update={"until": rule.until.replace(tzinfo=tz)})
+    return rule.to_rrule()
+
+
+def format_vevent(event: CompactEvent, dtstamp: str) -> Optional[str]:
+    """
+    이벤트 하나를 VEVENT 블록으로 변환
+
+    Args:
+        event: 이벤트 레코드
+        dtstamp: 피드 생성 시각 (UTC, 모든 VEVENT에 공통)
+
+    Returns:
+        VEVENT 문자열 (시작 시각이 없는 이벤트는 None)
+    """
+    if event.start_ts is None:
+        return None
+
+    end_ts = event.end_ts if event.end_ts is not None else event.start_ts + 3600
+    if event.rrule:
+        # 반복 규칙의 요일/시각은 이벤트 타임존 벽시계 기준이므로 UTC로 바꾸면 날짜/DST가 어긋남 → TZID 시각
+        tz = event.local_start.tzinfo
+        dtstart = f"DTSTART;TZID={_tzid(event)}:{_local(event.start_ts, tz)}"
+        dtend = f"DTEND;TZID={_tzid(event)}:{_local(end_ts, tz)}"
+    else:
+        dtstart, dtend = f"DTSTART:{_utc(event.start_ts)}", f"DTEND:{_utc(end_ts)}"
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.id}@show-me-the-data",
+        f"DTSTAMP:{dtstamp}",
+        dtstart,
+        dtend,
+    ]
+    if event.rrule:
+        lines.append(f"RRULE:{_rrule(event, tz)}")
+    if event.created_ts is not None:
+        lines.append(f"CREATED:{_utc(event.created_ts)}")
+    if event.summary:
+        lines.append(f"SUMMARY:{_escape(event.summary)}")
+    if event.description:
+        lines.append(f"DESCRIPTION:{_escape(event.description)}")
+    if event.location:
+        lines.append(f"LOCATION:{_escape(event.location)}")
+    lines.append(f"CATEGORIES:{event.event_type.value.upper()}")
+    if event.status in _STATUS_MAP:
+        lines.append(f"STATUS:{_STATUS_MAP[event.status]}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def iter_calendar(events: Iterable[CompactEvent], name: str = "AI Calendar") -> Iterator[str]:
+    """
+    VCALENDAR 스트림 생성 (헤더 → VEVENT 묶음 → 푸터)
+
+    Args:
+        events: 이벤트 이터러블 (커서 - 미리 목록으로 만들 필요 없음)
+        name: 캘린더 표시 이름
+
+    Yields:
+        .ics 조각 문자열
+    """
+    now = datetime.now(timezone.utc)
+    dtstamp = now.strftime("%Y%m%dT%H%M%SZ")
+    yield "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ))
+
+    chunk = []
+    tzids = set()
+    for event in events:
+        vevent = format_vevent(event, dtstamp)
+        if vevent is None:
+            continue
+        # 반복 일정이 참조하는 TZID마다 VTIMEZONE 한 번
+        if event.rrule and _tzid(event) not in tzids:
+            tzids.add(_tzid(event))
+            chunk.append(format_vtimezone(_tzid(event), now.year))
+        chunk.append(vevent)
+        if len(chunk) >= _EVENTS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+    yield "END:VCALENDAR\r\n"
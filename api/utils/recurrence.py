@@ -0,0 +1,198 @@
+"""
+반복 일정 유틸리티
+"매주 화요일 오후 2시 스탠드업" 같은 반복 표현을 RecurrenceRule로 감지하고,
+조회 기간 안의 발생 시각만 generator로 지연 전개합니다.
+(발생 건을 저장소에 만들지 않으므로 저장/조회 비용이 반복 기간과 무관)
+"""
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Tuple
+import calendar
+import re
+
+from models.schemas import RecurrenceRule
+from utils.date_parser import parse_time
+
+_WEEKDAY_CHARS = "월화수목금토일"
+
+_DAILY_PATTERN = re.compile(r'매일|날마다')
+_WEEKDAYS_ONLY_PATTERN = re.compile(r'평일마다|매\s*평일|주중\s*매일')
+# 요일 토큰: "화요일" 또는 목록 안의 한 글자 요일 ("화, 목요일")
+_DAY_TOKEN = r'[월화수목금토일](?:요일|(?=\s*[,·/]))'
+_WEEKLY_PATTERN = re.compile(r'(매주|격주|매\s*(\d)\s*주마다|(\d)\s*주마다)\s*((?:' + _DAY_TOKEN + r'\s*[,·/와과및]?\s*)+)')
+_WEEKLY_SUFFIX_PATTERN = re.compile(r'((?:[월화수목금토일]요일\s*[,·/]?\s*)+)마다')
+_MONTHLY_PATTERN = re.compile(r'(?:매월|매달|매\s*달)\s*(\d{1,2})\s*일')
+# 반복 횟수는 명시적인 표현만 ("총 5회", "10회 반복") - "3회의실", "제12회 정기회의"는 제외
+_COUNT_PATTERN = re.compile(
+    r'(?<!제)(?:총\s*(\d{1,3})\s*(?:회|번)(?!의)|(?<![제\d])(\d{1,3})\s*(?:회|번)\s*반복)'
+)
+
+
+def _weekdays(text: str) -> list:
+    return sorted({_WEEKDAY_CHARS.index(c) for c in text.replace("요일", "") if c in _WEEKDAY_CHARS})
+
+
+def detect_recurrence(text: str) -> Optional[RecurrenceRule]:
+    """
+    텍스트에서 반복 표현 감지
+
+    지원: 매일, 평일마다, 매주/격주/N주마다 X요일, X요일마다, 매월/매달 N일, (총 N회 / N회 반복)
+
+    Args:
+        text: 원본 텍스트
+
+    Returns:
+        RecurrenceRule 또는 None
+    """
+    count_match = _COUNT_PATTERN.search(text)
+    count = int(count_match.group(1) or count_match.group(2)) if count_match else None
+
+    weekly = _WEEKLY_PATTERN.search(text)
+    if weekly:
+        prefix, n1, n2, days = weekly.groups()
+        interval = 2 if prefix == "격주" else int(n1 or n2 or 1)
+        return RecurrenceRule(freq="WEEKLY", interval=interval, by_weekday=_weekdays(days), count=count)
+
+    suffix = _WEEKLY_SUFFIX_PATTERN.search(text)
+    if suffix:
+        return RecurrenceRule(freq="WEEKLY", by_weekday=_weekdays(suffix.group(1)), count=count)
+
+    if _WEEKDAYS_ONLY_PATTERN.search(text):
+        return RecurrenceRule(freq="WEEKLY", by_weekday=[0, 1, 2, 3, 4], count=count)
+
+    monthly = _MONTHLY_PATTERN.search(text)
+    if monthly:
+        return RecurrenceRule(freq="MONTHLY", by_monthday=int(monthly.group(1)), count=count)
+
+    if _DAILY_PATTERN.search(text):
+        return RecurrenceRule(freq="DAILY", count=count)
+
+    return None
+
+
+def first_occurrence(
+    rule: RecurrenceRule,
+    text: str,
+    now: datetime,
+    time_of_day: Optional[Tuple[int, int]] = None
+) -> datetime:
+    """
+    반복 시작 시각 계산 (텍스트의 시각 + now 이후 첫 발생일)
+
+    Args:
+        rule: 반복 규칙
+        text: 시각 표현이 포함된 원본 텍스트
+        now: 기준 시각
+        time_of_day: 이미 정한 (hour, minute) (후보 순위에서 고른 해석, 없으면 텍스트의 시각 그대로)
+
+    Returns:
+        첫 발생 시각
+    """
+    hour, minute = time_of_day or parse_time(text) or (9, 0)
+    anchor = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    # 간격(격주 등)은 첫 발생 주부터 세므로 첫 발생은 간격 없이 now 이후 가장 가까운 날짜
+    base = anchor - timedelta(days=1)
+    every = rule.model_copy(update={"count": None, "until": None, "interval": 1})
+    for occurrence in expand_occurrences(every, base, now, now + timedelta(days=400)):
+        return occurrence
+    return anchor
+
+
+def _add_months(start: datetime, months: int, day: int) -> Optional[datetime]:
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    month += 1
+    if day > calendar.monthrange(year, month)[1]:
+        return None  # 해당 월에 없는 날짜 (예: 2월 30일)는 건너뜀
+    return start.replace(year=year, month=month, day=day)
+
+
+def expand_occurrences(
+    rule: RecurrenceRule,
+    dtstart: datetime,
+    window_start: datetime,
+    window_end: datetime
+) -> Iterator[datetime]:
+    """
+    기간 [window_start, window_end) 안의 발생 시각을 순서대로 생성 (지연 전개)
+
+    dtstart부터 하나씩 세지 않고 조회 기간의 시작 주기로 바로 건너뛰므로
+    비용은 기간 안의 발생 수에만 비례합니다.
+
+    Args:
+        rule: 반복 규칙
+        dtstart: 첫 발생 시각 (반복 기준점)
+        window_start: 조회 시작 (포함)
+        window_end: 조회 끝 (미포함)
+
+    Yields:
+        발생 시각
+    """
+    # 기간 경계는 dtstart의 타임존 벽시계 기준으로 맞춤 (반복은 벽시계 시각 기준으로 전개)
+    if dtstart.tzinfo is not None:
+        window_start = window_start.astimezone(dtstart.tzinfo)
+        window_end = window_end.astimezone(dtstart.tzinfo)
+    if rule.until is not None:
+        until = rule.until
+        if until.tzinfo is None and dtstart.tzinfo is not None:
+            until = until.replace(tzinfo=dtstart.tzinfo)
+        window_end = min(window_end, until + timedelta(seconds=1))
+    if window_end <= dtstart:
+        return
+    window_start = max(window_start, dtstart)
+
+    if rule.freq == "DAILY":
+        step = timedelta(days=rule.interval)
+        index = max(0, -(-(window_start - dtstart) // step))
+        occurrence = dtstart + step * index
+        while occurrence < window_end and (rule.count is None or index < rule.count):
+            yield occurrence
+            index += 1
+            occurrence += step
+
+    elif rule.freq == "WEEKLY":
+        days = rule.by_weekday or [dtstart.weekday()]
+        # 간격은 dtstart 이후 첫 발생(BYDAY 일치)이 있는 주부터 셈
+        first = dtstart + timedelta(days=min((d - dtstart.weekday()) % 7 for d in days))
+        week0 = first - timedelta(days=first.weekday())
+        period = timedelta(weeks=rule.interval)
+        first_period = [d for d in days if week0 + timedelta(days=d) >= dtstart]
+        p = max(0, (window_start - week0) // period)
+        # COUNT 판정을 위해 건너뛴 주기의 발생 수를 계산
+        index = 0 if p == 0 else len(first_period) + (p - 1) * len(days)
+        while True:
+            period_start = week0 + period * p
+            if period_start >= window_end:
+                return
+            for d in (first_period if p == 0 else days):
+                if rule.count is not None and index >= rule.count:
+                    return
+                occurrence = period_start + timedelta(days=d)
+                index += 1
+                if occurrence >= window_end:
+                    return
+                if occurrence >= window_start:
+                    yield occurrence
+            p += 1
+
+    elif rule.freq == "MONTHLY":
+        day = rule.by_monthday or dtstart.day
+        first = dtstart.replace(day=1)
+        if rule.count is None:
+            months_to_window = (window_start.year - first.year) * 12 + window_start.month - first.month
+            m = max(0, months_to_window // rule.interval - 1)
+        else:
+            # COUNT는 실제 발생만 세므로 (없는 날짜로 건너뛴 달 제외) 처음부터 셈 - 최대 COUNT건 + 건너뛴 달
+            m = 0
+        index = 0
+        while True:
+            if rule.count is not None and index >= rule.count:
+                return
+            month_start = _add_months(first, m * rule.interval, 1)
+            if month_start >= window_end:
+                return
+            occurrence = _add_months(first, m * rule.interval, day)
+            if occurrence is not None and occurrence >= dtstart:
+                index += 1
+                if window_start <= occurrence < window_end:
+                    yield occurrence
+            m += 1
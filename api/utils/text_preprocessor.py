@@ -0,0 +1,182 @@
+"""
+이메일/메시지 전처리 유틸리티
+LLM에 보내기 전에 HTML, 인용된 이전 메일, 서명, 법적 고지, base64 덩어리 등
+분석과 무관한 노이즈를 제거하여 토큰 비용과 지연 시간을 줄입니다.
+"""
+from typing import List
+import html
+import os
+import re
+import logging
+
+from utils.date_parser import contains_date_expression
+
+logger = logging.getLogger(__name__)
+
+# 전처리 후 최대 길이 (문자 수)
+DEFAULT_MAX_CHARS = int(os.getenv("PREPROCESS_MAX_CHARS", "2000"))
+
+_HTML_TAG_PATTERN = re.compile(r'<\s*/?\s*[a-zA-Z][^>]*>')
+_HTML_DROP_BLOCK_PATTERN = re.compile(r'<(script|style|head)[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_HTML_BREAK_PATTERN = re.compile(r'<\s*(br|/p|/div|/li|/tr|/h[1-6])\s*/?\s*>', re.IGNORECASE)
+_HTML_COMMENT_PATTERN = re.compile(r'<!--.*?-->', re.DOTALL)
+
+# base64 첨부/인라인 이미지 (data URI 또는 공백 없는 긴 base64 줄)
+_DATA_URI_PATTERN = re.compile(r'data:[\w/+.-]+;base64,[A-Za-z0-9+/=\s]+')
+_BASE64_LINE_PATTERN = re.compile(r'^[A-Za-z0-9+/]{60,}={0,2}$')
+
+# 이 줄부터 아래는 이전 메일 인용으로 간주
+_REPLY_HEADER_PATTERNS = [
+    re.compile(r'^-{2,}\s*(original message|원본 메시지|forwarded message|전달된 메시지)\s*-{2,}', re.IGNORECASE),
+    re.compile(r'^on .+wrote:$', re.IGNORECASE),
+    re.compile(r'.+(님이|이\(가\))\s*작성:?$'),
+    re.compile(r'^(from|보낸\s*사람)\s*:', re.IGNORECASE),
+]
+
+# 이 줄부터 아래는 서명으로 간주
+_SIGNATURE_PATTERNS = [
+    re.compile(r'^--\s*$'),
+    re.compile(r'^(sent from my|iphone에서 보냄|galaxy에서 보냄|android에서 보냄)', re.IGNORECASE),
+    re.compile(r'^(감사합니다|best regards|regards|thanks)[.!,]?\s*$', re.IGNORECASE),
+]
+
+# 법적 고지/면책 문구가 포함된 문단은 제거
+_DISCLAIMER_PATTERN = re.compile(
+    r'본\s*(메일|이메일)은|수신인\s*외|무단\s*(전재|배포|복제)|법적\s*책임'
+    r'|confidential|intended (solely|only) for|disclaimer|if you (have )?received this',
+    re.IGNORECASE
+)
+
+_SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?。])\s+|\n+')
+
+
+class PreprocessResult:
+    """전처리 결과"""
+
+    def __init__(self, text: str, original_tokens: int, cleaned_tokens: int):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.cleaned_tokens = cleaned_tokens
+
+    @property
+    def tokens_removed(self) -> int:
+        return max(self.original_tokens - self.cleaned_tokens, 0)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 계산 (대략적 - OpenAIService.count_tokens와 동일한 기준)"""
+    return len(text) // 4
+
+
+def html_to_text(text: str) -> str:
+    """HTML 본문을 일반 텍스트로 변환 (HTML이 아니면 그대로 반환)"""
+    if not _HTML_TAG_PATTERN.search(text):
+        return text
+    text = _HTML_COMMENT_PATTERN.sub("", text)
+    text = _HTML_DROP_BLOCK_PATTERN.sub("", text)
+    text = _HTML_BREAK_PATTERN.sub("\n", text)
+    text = _HTML_TAG_PATTERN.sub("", text)
+    return html.unescape(text)
+
+
+def _strip_blobs(text: str) -> str:
+    """data URI 및 base64 줄 제거"""
+    text = _DATA_URI_PATTERN.sub("", text)
+    return "\n".join(
+        line for line in text.split("\n")
+        if not _BASE64_LINE_PATTERN.match(line.strip())
+    )
+
+
+def _strip_quoted_and_signature(text: str) -> str:
+    """인용된 이전 메일, 서명 이후 내용 제거"""
+    kept: List[str] = []
+    for line in text.split("\n"):
+        stripped = line.strip()
+        # "> ..." 인용 줄은 건너뜀
+        if stripped.startswith(">"):
+            continue
+        # 답장 헤더/서명 구분자가 나오면 그 아래는 모두 버림 (첫 줄은 예외)
+        if kept and any(p.match(stripped) for p in _REPLY_HEADER_PATTERNS + _SIGNATURE_PATTERNS):
+            break
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def _strip_disclaimers(text: str) -> str:
+    """면책/법적 고지 문단 제거"""
+    paragraphs = re.split(r'\n\s*\n', text)
+    return "\n\n".join(p for p in paragraphs if not _DISCLAIMER_PATTERN.search(p))
+
+
+def _normalize_whitespace(text: str) -> str:
+    """공백/빈 줄 정리"""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\u00a0", " ")
+    text = re.sub(r'[ \t]+', " ", text)
+    text = re.sub(r' *\n *', "\n", text)
+    text = re.sub(r'\n{3,}', "\n\n", text)
+    return text.strip()
+
+
+def _cap_length(text: str, max_chars: int) -> str:
+    """
+    최대 길이 제한 - 날짜/시간이 포함된 문장은 우선 보존
+
+    첫 문장(인사/요지)과 날짜 문장을 먼저 선택하고, 남는 예산만큼 나머지 문장을
+    원래 순서대로 채웁니다.
+    """
+    if len(text) <= max_chars:
+        return text
+
+    sentences = [s.strip() for s in _SENTENCE_SPLIT_PATTERN.split(text) if s and s.strip()]
+    priority = [i for i, s in enumerate(sentences) if i == 0 or contains_date_expression(s)]
+    priority_set = set(priority)
+    others = [i for i in range(len(sentences)) if i not in priority_set]
+
+    selected = set()
+    budget = max_chars
+    for i in priority + others:
+        cost = len(sentences[i]) + 1
+        if cost <= budget:
+            selected.add(i)
+            budget -= cost
+
+    if not selected:
+        return text[:max_chars]
+    return "\n".join(sentences[i] for i in sorted(selected))
+
+
+def preprocess_email(text: str, max_chars: int = DEFAULT_MAX_CHARS) -> PreprocessResult:
+    """
+    이메일/메시지 본문 전처리 파이프라인
+
+    HTML → 텍스트, base64 제거, 인용/서명 제거, 면책 문구 제거,
+    공백 정리, 길이 제한(날짜 문장 우선) 순서로 적용합니다.
+
+    Args:
+        text: 원본 텍스트
+        max_chars: 최대 문자 수
+
+    Returns:
+        PreprocessResult (정제된 텍스트 및 토큰 수)
+    """
+    original_tokens = estimate_tokens(text)
+    try:
+        cleaned = html_to_text(text)
+        cleaned = _strip_blobs(cleaned)
+        cleaned = _normalize_whitespace(cleaned)
+        cleaned = _strip_quoted_and_signature(cleaned)
+        cleaned = _strip_disclaimers(cleaned)
+        cleaned = _normalize_whitespace(cleaned)
+        cleaned = _cap_length(cleaned, max_chars)
+        # 모두 제거되어 버린 경우 원문 유지 (분석 불가 상태 방지)
+        if not cleaned:
+            cleaned = text.strip()[:max_chars]
+    except Exception as e:
+        logger.error(f"❌ 전처리 오류: {e}", exc_info=True)
+        cleaned = text
+
+    result = PreprocessResult(cleaned, original_tokens, estimate_tokens(cleaned))
+    if result.tokens_removed:
+        logger.info(f"✂️ 전처리: {result.original_tokens} → {result.cleaned_tokens} tokens ({result.tokens_removed} 제거)")
+    return result